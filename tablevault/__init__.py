@@ -1,4 +1,4 @@
-from tablevault.tablevault import Vault
+from tablevault.tablevault import Vault, VaultWorker
 from tablevault.utils.errors import (
     TableVaultError,
     ValidationError,
@@ -11,6 +11,7 @@ from tablevault.utils.errors import (
 
 __all__ = [
     "Vault",
+    "VaultWorker",
     "TableVaultError",
     "ValidationError",
     "NotFoundError",
@@ -0,0 +1,216 @@
+import csv
+import json
+import os
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from arango.database import StandardDatabase
+from tablevault.database import item_collection, record_schema
+from tablevault.database.log_helper import utils
+from tablevault.utils.errors import NotFoundError, ValidationError
+from tablevault.utils.optional import import_optional
+
+SOURCE_FORMATS = ("csv", "jsonl", "parquet")
+_EXTENSIONS = {
+    ".csv": "csv",
+    ".jsonl": "jsonl",
+    ".ndjson": "jsonl",
+    ".parquet": "parquet",
+    ".pq": "parquet",
+}
+
+
+def _source_format(source: str, format: Optional[str], operation: str) -> str:
+    if format is None:
+        format = _EXTENSIONS.get(os.path.splitext(source)[1].lower())
+    if format not in SOURCE_FORMATS:
+        raise ValidationError(
+            f"Cannot import '{source}': format must be one of {list(SOURCE_FORMATS)}.",
+            operation=operation,
+            key=source,
+        )
+    return format
+
+
+def iter_source_chunks(
+    source: str, format: str, chunk_size: int
+) -> Iterator[List[Dict[str, Any]]]:
+    """Read ``source`` as lists of at most ``chunk_size`` row dicts."""
+    if format == "parquet":
+        pq = import_optional("pyarrow.parquet", "arrow")
+        for batch in pq.ParquetFile(source).iter_batches(batch_size=chunk_size):
+            yield batch.to_pylist()
+        return
+    with open(source, newline="" if format == "csv" else None) as f:
+        if format == "csv":
+            rows: Iterator[Dict[str, Any]] = csv.DictReader(f)
+        else:
+            rows = (json.loads(line) for line in f if line.strip())
+        chunk: List[Dict[str, Any]] = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+
+def _skip_rows(
+    chunks: Iterator[List[Dict[str, Any]]], n_rows: int
+) -> Iterator[List[Dict[str, Any]]]:
+    for chunk in chunks:
+        if n_rows >= len(chunk):
+            n_rows -= len(chunk)
+            continue
+        yield chunk[n_rows:]
+        n_rows = 0
+
+
+def _resume_offset(db: StandardDatabase, name: str, source: str, resume: bool) -> int:
+    progress = db.collection("import_progress").get(name)
+    if not resume or progress is None or progress["source"] != source:
+        return 0
+    if utils.get_timestamp_info(db, progress["timestamp"]) is not None:
+        # still owned by a running (or not yet cleaned up) import
+        return 0
+    return progress["rows_done"]
+
+
+def import_items(
+    db: StandardDatabase,
+    name: str,
+    dtype: str,
+    source: str,
+    to_items: Callable[[List[Dict[str, Any]]], List[Tuple[Dict[str, Any], int]]],
+    process_name: str,
+    process_index: int,
+    input_items: Optional[Dict[str, List[int]]],
+    format: Optional[str],
+    chunk_size: int,
+    resume: bool,
+    operation: str,
+) -> int:
+    format = _source_format(source, format, operation)
+    if not os.path.exists(source):
+        raise NotFoundError(
+            f"Import source '{source}' does not exist.",
+            operation=operation,
+            key=source,
+        )
+    source = os.path.abspath(source)
+    rows_done = _resume_offset(db, name, source, resume)
+    n_rows = 0
+
+    def _chunks() -> Iterator[List[Tuple[Dict[str, Any], int]]]:
+        nonlocal n_rows
+        for rows in _skip_rows(iter_source_chunks(source, format, chunk_size), rows_done):
+            n_rows += len(rows)
+            yield to_items(rows)
+
+    timestamp, itm = utils.get_new_timestamp(db, [], name)
+    item_list = db.collection(f"{dtype}_list").get(name)
+    data = [
+        "import_items",
+        name,
+        dtype,
+        sorted(input_items or {}),
+        process_name,
+        process_index,
+        item_list["n_items"],
+        item_list["length"],
+        source,
+        rows_done,
+    ]
+    utils.update_timestamp_info(db, timestamp, data)
+    item_collection.import_items(
+        db,
+        timestamp,
+        name,
+        _chunks(),
+        process_name,
+        process_index,
+        input_items,
+        dtype,
+        item_list["n_items"],
+        item_list["length"],
+        itm["_rev"],
+        source,
+        rows_done,
+    )
+    return n_rows
+
+
+def import_records(
+    db: StandardDatabase,
+    name: str,
+    source: str,
+    process_name: str,
+    process_index: int,
+    input_items: Optional[Dict[str, List[int]]] = None,
+    format: Optional[str] = None,
+    chunk_size: int = 10000,
+    resume: bool = True,
+) -> int:
+    record_list = db.collection("record_list").get(name)
+    parse_text = _source_format(source, format, "import_records") == "csv"
+
+    def _to_items(rows: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], int]]:
+        record_schema.validate_records(
+            name, record_list, rows, "import_records", parse_text
+        )
+        return [(record_schema.record_item(record_list, row), 1) for row in rows]
+
+    return import_items(
+        db,
+        name,
+        "record",
+        source,
+        _to_items,
+        process_name,
+        process_index,
+        input_items,
+        format,
+        chunk_size,
+        resume,
+        "import_records",
+    )
+
+
+def import_documents(
+    db: StandardDatabase,
+    name: str,
+    source: str,
+    process_name: str,
+    process_index: int,
+    text_column: str = "text",
+    input_items: Optional[Dict[str, List[int]]] = None,
+    format: Optional[str] = None,
+    chunk_size: int = 10000,
+    resume: bool = True,
+) -> int:
+    def _to_items(rows: List[Dict[str, Any]]) -> List[Tuple[Dict[str, Any], int]]:
+        try:
+            texts = [str(row[text_column]) for row in rows]
+        except KeyError:
+            raise ValidationError(
+                f"Import source rows have no '{text_column}' column.",
+                operation="import_documents",
+                collection="document_list",
+                key=name,
+            ) from None
+        return [({"text": text}, len(text)) for text in texts]
+
+    return import_items(
+        db,
+        name,
+        "document",
+        source,
+        _to_items,
+        process_name,
+        process_index,
+        input_items,
+        format,
+        chunk_size,
+        resume,
+        "import_documents",
+    )
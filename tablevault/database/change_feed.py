@@ -0,0 +1,126 @@
+import time
+from typing import Any, Dict, Iterator, List, Optional
+
+from arango.database import StandardDatabase
+from tablevault.database import snapshot
+from tablevault.database.query_item_simple import _iter_cursor_batches
+from tablevault.utils.errors import ValidationError
+
+LIST_COLLECTIONS: List[str] = [
+    "process_list",
+    "file_list",
+    "document_list",
+    "record_list",
+    "embedding_list",
+]
+
+
+def _changes_aql(collections: List[str]) -> str:
+    parts = []
+    for i, list_col in enumerate(collections):
+        item_col = list_col.split("_")[0]
+        parts.append(
+            f"""
+      (FOR d IN @@list{i}
+        FILTER d.timestamp > @since AND d.timestamp <= @until
+        RETURN {{ timestamp: d.timestamp, operation: "create", collection: "{list_col}",
+                 name: d.name, index: null, start_position: null, end_position: null }}),
+      (FOR d IN @@item{i}
+        FILTER d.timestamp > @since AND d.timestamp <= @until
+        RETURN {{ timestamp: d.timestamp, operation: "append", collection: "{list_col}",
+                 name: d.name, index: d.index, start_position: d.start_position,
+                 end_position: d.end_position }})"""
+        )
+    return f"""
+    LET events = FLATTEN([{",".join(parts)},
+      (FOR d IN description
+        FILTER d.timestamp > @since AND d.timestamp <= @until
+        FILTER d.collection IN @collections
+        RETURN {{ timestamp: d.timestamp, operation: "description", collection: d.collection,
+                 name: d.item_name, index: null, start_position: null, end_position: null,
+                 description: d.name }}),
+      (FOR e IN deleted_process_parent_edge
+        FILTER e.timestamp > @since AND e.timestamp <= @until
+        LET id = PARSE_IDENTIFIER(e._from)
+        FILTER id.collection IN @collections
+        RETURN {{ timestamp: e.timestamp, operation: "delete", collection: id.collection,
+                 name: id.key, index: null, start_position: null, end_position: null }})
+    ])
+    FOR ev IN events
+      SORT ev.timestamp ASC, ev.index ASC
+      RETURN ev
+    """
+
+
+def iter_changes(
+    db: StandardDatabase,
+    since: int,
+    until: int,
+    collections: List[str],
+    batch_size: int = 1000,
+) -> Iterator[Dict[str, Any]]:
+    bind_vars: Dict[str, Any] = {
+        "since": since,
+        "until": until,
+        "collections": collections,
+    }
+    for i, list_col in enumerate(collections):
+        bind_vars[f"@list{i}"] = list_col
+        bind_vars[f"@item{i}"] = list_col.split("_")[0]
+    cursor = db.aql.execute(
+        _changes_aql(collections), bind_vars=bind_vars, batch_size=batch_size
+    )
+    for rows in _iter_cursor_batches(cursor):
+        yield from rows
+
+
+class ChangeFeed:
+    """
+    Iterator over committed changes in timestamp order.
+
+    ``checkpoint`` is the highest timestamp whose events have all been yielded; passing it
+    back as ``since`` resumes without gaps or repeats.
+    """
+
+    def __init__(
+        self,
+        db: StandardDatabase,
+        since: int = 0,
+        collections: Optional[List[str]] = None,
+        follow: bool = False,
+        poll_interval: float = 1.0,
+        window: int = 1000,
+        batch_size: int = 1000,
+    ) -> None:
+        collections = list(collections) if collections else list(LIST_COLLECTIONS)
+        unknown = [c for c in collections if c not in LIST_COLLECTIONS]
+        if unknown:
+            raise ValidationError(
+                f"Unknown collections {unknown}; expected a subset of {LIST_COLLECTIONS}.",
+                operation="changes",
+            )
+        self.db = db
+        self.checkpoint = since
+        self.collections = collections
+        self.follow = follow
+        self.poll_interval = poll_interval
+        self.window = window
+        self.batch_size = batch_size
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        while True:
+            bound = snapshot.current_timestamp(self.db)
+            while self.checkpoint < bound:
+                until = min(self.checkpoint + self.window, bound)
+                pending = None
+                for event in iter_changes(
+                    self.db, self.checkpoint, until, self.collections, self.batch_size
+                ):
+                    if pending is not None and event["timestamp"] != pending:
+                        self.checkpoint = pending
+                    pending = event["timestamp"]
+                    yield event
+                self.checkpoint = until
+            if not self.follow:
+                return
+            time.sleep(self.poll_interval)
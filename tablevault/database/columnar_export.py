@@ -0,0 +1,265 @@
+import json
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from arango.database import StandardDatabase
+from tablevault.database import snapshot
+from tablevault.database.query_item_simple import (
+    _get_list_collection,
+    _item_cursor,
+    _iter_cursor_batches,
+)
+from tablevault.utils.errors import ValidationError
+from tablevault.utils.optional import import_optional
+
+EXPORT_FORMATS = ("parquet", "arrow")
+_EXPORT_COLLECTIONS = ("record_list", "embedding_list", "document_list", "file_list")
+_POSITION_COLUMNS = ("index", "start_position", "end_position")
+
+
+def _position_arrays(pa: Any, rows: List[List[Any]]) -> List[Any]:
+    return [pa.array([r[i] for r in rows], type=pa.int64()) for i in range(3)]
+
+
+class _BatchEncoder:
+    """
+    Turns cursor rows ``[index, start_position, end_position, value]`` into record batches.
+
+    Record columns use the list's declared ``column_types``; for untyped lists they are
+    inferred from every value in the exported range before the first batch (see
+    ``infer_record_types``), so every batch (and every Parquet row group) shares one schema.
+    """
+
+    def __init__(
+        self, db: StandardDatabase, name: str, coll_name: str, operation: str
+    ) -> None:
+        self.pa = import_optional("pyarrow", "arrow")
+        self.name = name
+        self.operation = operation
+        self.coll_name = coll_name
+        self.schema = None
+        self.columns: List[str] = []
+        self.json_columns: Set[str] = set()
+        self.value_type = None
+        if coll_name == "record_list":
+            record_list = db.collection("record_list").get(name)
+            self.columns = list(record_list["column_names"])
+            column_types = record_list.get("column_types")
+            if column_types:
+                self.json_columns = {c for c, t in column_types.items() if t == "json"}
+                self.schema = self.pa.schema(
+                    [self.pa.field(c, self.pa.int64()) for c in _POSITION_COLUMNS]
+                    + [
+                        self.pa.field(c, self._arrow_type(column_types[c]))
+                        for c in self.columns
+                    ]
+                )
+        elif coll_name == "embedding_list":
+            n_dim = db.collection("embedding_list").get(name)["n_dim"]
+            self.value_type = self.pa.list_(self.pa.float32(), n_dim)
+        else:
+            self.value_type = self.pa.string()
+
+    def _arrow_type(self, type_name: str) -> Any:
+        # "json" columns hold arbitrary values and are stored as JSON text
+        return {
+            "string": self.pa.string(),
+            "int": self.pa.int64(),
+            "float": self.pa.float64(),
+            "bool": self.pa.bool_(),
+            "json": self.pa.string(),
+            "null": self.pa.null(),
+        }[type_name]
+
+    def infer_record_types(
+        self,
+        db: StandardDatabase,
+        start_position: Optional[int],
+        end_position: Optional[int],
+        as_of: Optional[int],
+    ) -> None:
+        """
+        Fix the schema of an untyped record list from the types seen across the whole range.
+
+        The type scan runs on the server and returns one row per (column, type). Ints widen
+        to float; columns with nested values or with mixed kinds are exported as JSON text,
+        like declared ``json`` columns. Columns that are null throughout get the null type.
+        """
+        if self.coll_name != "record_list" or self.schema is not None:
+            return
+        aql = r"""
+        FOR v, e IN 1..1 OUTBOUND @targetId parent_edge
+          FILTER (@qEnd == null OR e.start_position < @qEnd)
+            AND (@qStart == null OR e.end_position > @qStart)
+          FILTER __VISIBLE(v)__
+          FOR col IN @columns
+            LET x = v.data[col]
+            FILTER x != null
+            COLLECT column = col, kind = (
+              IS_NUMBER(x)
+                ? (x == FLOOR(x) AND ABS(x) < 9223372036854775807 ? "int" : "float")
+                : TYPENAME(x)
+            )
+            RETURN [column, kind]
+        """
+        bind_vars = {
+            "targetId": f"record_list/{self.name}",
+            "qStart": start_position,
+            "qEnd": end_position,
+            "columns": self.columns,
+        }
+        snapshot.bind_as_of(db, as_of, bind_vars)
+        kinds: Dict[str, Set[str]] = {c: set() for c in self.columns}
+        for column, kind in db.aql.execute(snapshot.apply(aql), bind_vars=bind_vars):
+            kinds[column].add(kind)
+        column_types = {}
+        for column, seen in kinds.items():
+            if not seen:
+                column_types[column] = "null"
+            elif seen <= {"int"}:
+                column_types[column] = "int"
+            elif seen <= {"int", "float"}:
+                column_types[column] = "float"
+            elif len(seen) == 1 and next(iter(seen)) in ("string", "bool"):
+                column_types[column] = next(iter(seen))
+            else:
+                column_types[column] = "json"
+        self.json_columns = {c for c, t in column_types.items() if t == "json"}
+        self.schema = self.pa.schema(
+            [self.pa.field(c, self.pa.int64()) for c in _POSITION_COLUMNS]
+            + [self.pa.field(c, self._arrow_type(column_types[c])) for c in self.columns]
+        )
+
+    def _value_arrays(self, rows: List[List[Any]]) -> List[Any]:
+        pa = self.pa
+        if self.coll_name != "record_list":
+            return [pa.array([r[3] for r in rows], type=self.value_type)]
+        arrays = []
+        for i, col in enumerate(self.columns):
+            values = [r[3].get(col) if r[3] is not None else None for r in rows]
+            if col in self.json_columns:
+                values = [json.dumps(v) if v is not None else None for v in values]
+            if self.schema is None:
+                arrays.append(pa.array(values))
+                continue
+            arrow_type = self.schema.field(i + 3).type
+            if pa.types.is_integer(arrow_type):
+                # integral JSON numbers may arrive as floats (e.g. 3.0)
+                values = [int(v) if isinstance(v, float) else v for v in values]
+            try:
+                arrays.append(pa.array(values, type=arrow_type))
+            except (pa.ArrowInvalid, pa.ArrowTypeError) as exc:
+                raise ValidationError(
+                    f"Column '{col}' does not match the schema of earlier rows: {exc}",
+                    operation=self.operation,
+                    collection=self.coll_name,
+                    key=self.name,
+                ) from exc
+        return arrays
+
+    def encode(self, rows: List[List[Any]]) -> Any:
+        arrays = _position_arrays(self.pa, rows) + self._value_arrays(rows)
+        if self.schema is None:
+            names = list(_POSITION_COLUMNS) + (
+                self.columns if self.coll_name == "record_list" else ["value"]
+            )
+            if self.coll_name == "embedding_list":
+                names[-1] = "embedding"
+            self.schema = self.pa.schema(
+                [self.pa.field(n, a.type) for n, a in zip(names, arrays)]
+            )
+        return self.pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+    def empty_schema(self) -> Any:
+        if self.schema is None:
+            self.encode([])
+        return self.schema
+
+
+def _open_export(
+    db: StandardDatabase,
+    name: str,
+    start_position: Optional[int],
+    end_position: Optional[int],
+    batch_size: int,
+    as_of: Optional[int],
+    operation: str,
+) -> Tuple[_BatchEncoder, Any]:
+    coll_name = _get_list_collection(db, name, operation)
+    if coll_name not in _EXPORT_COLLECTIONS:
+        raise ValidationError(
+            f"Columnar export supports {list(_EXPORT_COLLECTIONS)}; '{name}' is a '{coll_name}'.",
+            operation=operation,
+            collection=coll_name,
+            key=name,
+        )
+    encoder = _BatchEncoder(db, name, coll_name, operation)
+    encoder.infer_record_types(db, start_position, end_position, as_of)
+    cursor = _item_cursor(
+        db,
+        name,
+        coll_name,
+        start_position,
+        end_position,
+        batch_size,
+        as_of=as_of,
+        positions=True,
+    )
+    return encoder, cursor
+
+
+def to_arrow(
+    db: StandardDatabase,
+    name: str,
+    start_position: Optional[int] = None,
+    end_position: Optional[int] = None,
+    batch_size: int = 10000,
+    as_of: Optional[int] = None,
+) -> Any:
+    encoder, cursor = _open_export(
+        db, name, start_position, end_position, batch_size, as_of, "to_arrow"
+    )
+    batches = [encoder.encode(rows) for rows in _iter_cursor_batches(cursor)]
+    return encoder.pa.Table.from_batches(batches, schema=encoder.empty_schema())
+
+
+def export_list(
+    db: StandardDatabase,
+    name: str,
+    path: str,
+    format: str = "parquet",
+    start_position: Optional[int] = None,
+    end_position: Optional[int] = None,
+    batch_size: int = 10000,
+    as_of: Optional[int] = None,
+) -> int:
+    if format not in EXPORT_FORMATS:
+        raise ValidationError(
+            f"Unknown export format '{format}'; expected one of {list(EXPORT_FORMATS)}.",
+            operation="export_list",
+            key=name,
+        )
+    encoder, cursor = _open_export(
+        db, name, start_position, end_position, batch_size, as_of, "export_list"
+    )
+    writer = None
+    n_rows = 0
+    try:
+        for rows in _iter_cursor_batches(cursor):
+            batch = encoder.encode(rows)
+            if writer is None:
+                writer = _open_writer(encoder.pa, path, format, batch.schema)
+            writer.write_batch(batch)
+            n_rows += batch.num_rows
+        if writer is None:
+            writer = _open_writer(encoder.pa, path, format, encoder.empty_schema())
+    finally:
+        if writer is not None:
+            writer.close()
+    return n_rows
+
+
+def _open_writer(pa: Any, path: str, format: str, schema: Any) -> Any:
+    if format == "parquet":
+        pq = import_optional("pyarrow.parquet", "arrow")
+        return pq.ParquetWriter(path, schema)
+    return pa.ipc.new_file(path, schema)
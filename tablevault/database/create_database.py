@@ -3,8 +3,10 @@
 from typing import Any, Dict, List, Optional
 
 from arango import ArangoClient
+from arango.http import DefaultHTTPClient, DeflateRequestCompression
 from arango.database import StandardDatabase
 from tablevault.database.database_views import create_tablevault_query_views
+from tablevault.utils.errors import NotFoundError
 
 ALL_ITEM_COLLECTIONS: List[str] = [
     "process",
@@ -33,9 +35,17 @@ VIEW_COLLECTIONS: List[str] = ["process", "embedding", "document", "record", "de
 def create_collection_safe(
     db: StandardDatabase, name: str, schema: Optional[Dict[str, Any]] = None, edge: bool = False
 ) -> None:
-    """Helper to create collection only if it doesn't exist."""
+    """Helper to create collection only if it doesn't exist; an outdated schema is replaced."""
     if not db.has_collection(name):
         db.create_collection(name=name, schema=schema, edge=edge)
+        return
+    if schema is None:
+        return
+    collection = db.collection(name)
+    current = collection.properties().get("schema") or {}
+    if current.get("rule") != schema["rule"] or current.get("level") != schema["level"]:
+        # existing documents are not revalidated; only later writes see the new rule
+        collection.configure(schema=schema)
 
 
 def get_arango_db(
@@ -46,8 +56,40 @@ def get_arango_db(
     arango_root_username: str,
     arango_root_password: str,
     new_arango_db: bool = True,
+    pool_size: int = 32,
+    request_timeout: Optional[float] = 60,
+    retry_attempts: int = 3,
+    compression_threshold: Optional[int] = None,
 ) -> StandardDatabase:
-    client = ArangoClient(hosts=arango_url)
+    """
+    Connect to ``database_name`` (recreating it when ``new_arango_db``).
+
+    Requests go through one pooled, keep-alive HTTP session: ``pool_size`` connections are
+    kept per host, so up to that many threads can talk to the server without waiting on the
+    pool. Idempotent requests failing on connection errors are retried ``retry_attempts``
+    times with backoff. Request bodies larger than ``compression_threshold`` bytes are sent
+    deflate-compressed, and responses are then requested compressed too.
+    """
+    http_client = DefaultHTTPClient(
+        request_timeout=request_timeout,
+        retry_attempts=retry_attempts,
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+    )
+    compression: Dict[str, Any] = {}
+    if compression_threshold is not None:
+        compression = {
+            "request_compression": DeflateRequestCompression(
+                threshold=compression_threshold
+            ),
+            "response_compression": "deflate",
+        }
+    client = ArangoClient(
+        hosts=arango_url,
+        http_client=http_client,
+        request_timeout=request_timeout,
+        **compression,
+    )
     sys_db = client.db(
         "_system", username=arango_root_username, password=arango_root_password
     )
@@ -69,6 +111,28 @@ def get_arango_db(
     return db
 
 
+def ensure_tablevault_db(db: StandardDatabase) -> None:
+    """
+    Create the collections, indexes and views an existing vault is missing.
+
+    Vaults created by an older version lack collections added since (e.g. ``lineage_closure``,
+    ``code_blob``) and have older collection schemas (e.g. ``process`` requiring inline ``text``).
+    Rerunning ``create_tablevault_db`` on an existing vault only adds or upgrades: collections
+    and edge definitions are created when missing, adding an index that exists returns it,
+    outdated schemas and view properties are replaced with the current ones, and the metadata
+    document is kept. Existing data is not touched.
+    """
+    doc = db.collection("metadata").get("global") if db.has_collection("metadata") else None
+    if doc is None:
+        raise NotFoundError(
+            "Database is not a TableVault vault; open it with new_arango_db=True to create one.",
+            operation="ensure_tablevault_db",
+            collection="metadata",
+            key="global",
+        )
+    create_tablevault_db(db, doc["log_file"], doc["description_embedding_size"])
+
+
 def create_tablevault_db(
     db: StandardDatabase, log_file: str, description_embedding_size: int
 ) -> None:
@@ -87,7 +151,8 @@ def create_tablevault_db(
         "log_file": log_file,
     }
     col = db.collection("metadata")
-    col.insert(doc)
+    if not col.has("global"):
+        col.insert(doc)
 
     create_collection_safe(
         db,
@@ -160,8 +225,10 @@ def create_tablevault_db(
                     "start_position": {"type": "number"},
                     "end_position": {"type": "number"},
                     "text": {"type": "string"},
+                    "code_hash": {"type": "string"},
                     "status": {"type": "string"},
                     "error": {"type": "string"},
+                    "telemetry": {"type": "object"},
                 },
                 "required": [
                     "name",
@@ -171,7 +238,6 @@ def create_tablevault_db(
                     "timestamp",
                     "start_position",
                     "end_position",
-                    "text",
                     "status",
                     "error",
                 ],
@@ -255,6 +321,8 @@ def create_tablevault_db(
                     "length": {"type": "number"},
                     "n_dim": {"type": "number"},
                     "deleted": {"type": "number"},
+                    "storage": {"type": "string", "enum": ["float", "int8", "binary"]},
+                    "keep_full_precision": {"type": "boolean"},
                 },
                 "required": [
                     "name",
@@ -285,9 +353,18 @@ def create_tablevault_db(
                     "timestamp": {"type": "number"},
                     "start_position": {"type": "number"},
                     "end_position": {"type": "number"},
+                    "embedding_scale": {"type": "number"},
                 },
                 "patternProperties": {
-                    "^embedding_\d+$": {"type": "array", "items": {"type": "number"}}
+                    "^embedding_\d+$": {"type": "array", "items": {"type": "number"}},
+                    "^embedding_int8_\d+$": {
+                        "type": "array",
+                        "items": {"type": "integer", "minimum": -127, "maximum": 127},
+                    },
+                    "^embedding_binary_\d+$": {
+                        "type": "array",
+                        "items": {"type": "integer", "minimum": 0},
+                    },
                 },
                 "required": [
                     "name",
@@ -376,6 +453,17 @@ def create_tablevault_db(
                     "n_items": {"type": "number"},
                     "length": {"type": "number"},
                     "column_names": {"type": "array", "items": {"type": "string"}},
+                    "indexed_columns": {"type": "array", "items": {"type": "string"}},
+                    "column_types": {
+                        "type": ["object", "null"],
+                        "additionalProperties": {
+                            "enum": ["string", "int", "float", "bool", "json"]
+                        },
+                    },
+                    "text_columns": {
+                        "type": ["array", "null"],
+                        "items": {"type": "string"},
+                    },
                     "deleted": {"type": "number"},
                 },
                 "required": [
@@ -420,8 +508,6 @@ def create_tablevault_db(
                     "start_position",
                     "end_position",
                     "data",
-                    "data_text",
-                    "column_names",
                 ],
                 "additionalProperties": False,
             },
@@ -472,6 +558,7 @@ def create_tablevault_db(
                     "timestamp": {"type": "number"},
                     "start_position": {"type": "number"},
                     "end_position": {"type": "number"},
+                    "bin": {"type": "number"},
                 },
                 "required": ["timestamp", "start_position", "end_position"],
                 "additionalProperties": False,
@@ -490,6 +577,7 @@ def create_tablevault_db(
                     "timestamp": {"type": "number"},
                     "start_position": {"type": "number"},
                     "end_position": {"type": "number"},
+                    "bin": {"type": "number"},
                 },
                 "required": ["timestamp", "start_position", "end_position"],
                 "additionalProperties": False,
@@ -523,6 +611,7 @@ def create_tablevault_db(
                 "properties": {
                     "timestamp": {"type": "number"},
                     "index": {"type": "number"},
+                    "worker_id": {"type": "string"},
                 },
                 "required": ["timestamp", "index"],
                 "additionalProperties": False,
@@ -548,6 +637,180 @@ def create_tablevault_db(
         },
     )
 
+    create_collection_safe(
+        db,
+        "lineage_closure",
+        {
+            "rule": {
+                "properties": {
+                    "name": {"type": "string"},
+                    "index": {"type": "number"},
+                    "start_position": {"type": "number"},
+                    "end_position": {"type": "number"},
+                    "ancestor": {"type": "string"},
+                    "ancestor_collection": {"type": "string"},
+                    "ancestor_start": {"type": "number"},
+                    "ancestor_end": {"type": "number"},
+                    "depth": {"type": "number"},
+                    "timestamp": {"type": "number"},
+                },
+                "required": [
+                    "name",
+                    "index",
+                    "start_position",
+                    "end_position",
+                    "ancestor",
+                    "ancestor_collection",
+                    "ancestor_start",
+                    "ancestor_end",
+                    "depth",
+                    "timestamp",
+                ],
+                "additionalProperties": False,
+            },
+            "level": "strict",
+        },
+    )
+
+    create_collection_safe(
+        db,
+        "import_progress",
+        {
+            "rule": {
+                "properties": {
+                    "name": {"type": "string"},
+                    "source": {"type": "string"},
+                    "dtype": {"type": "string"},
+                    "timestamp": {"type": "number"},
+                    "rows_done": {"type": "number"},
+                    "n_items": {"type": "number"},
+                    "length": {"type": "number"},
+                },
+                "required": [
+                    "name",
+                    "source",
+                    "dtype",
+                    "timestamp",
+                    "rows_done",
+                    "n_items",
+                    "length",
+                ],
+                "additionalProperties": False,
+            },
+            "level": "strict",
+        },
+    )
+
+    create_collection_safe(
+        db,
+        "code_blob",
+        {
+            "rule": {
+                "properties": {
+                    "text": {"type": "string"},
+                    "length": {"type": "number"},
+                },
+                "required": ["text", "length"],
+                "additionalProperties": False,
+            },
+            "level": "strict",
+        },
+    )  # process code keyed by its sha256, see process_collection.store_code
+
+    create_collection_safe(
+        db,
+        "memo",
+        {
+            "rule": {
+                "properties": {
+                    "code_hash": {"type": "string"},
+                    "inputs": {"type": "object"},
+                    "outputs": {"type": "object"},
+                    "value": {},
+                    "process_name": {"type": "string"},
+                    "process_index": {"type": "number"},
+                    "created": {"type": "number"},
+                },
+                "required": [
+                    "code_hash",
+                    "inputs",
+                    "outputs",
+                    "value",
+                    "process_name",
+                    "process_index",
+                    "created",
+                ],
+                "additionalProperties": False,
+            },
+            "level": "strict",
+        },
+    )  # keyed by code, input fingerprint and arguments, see memo
+
+    create_collection_safe(
+        db,
+        "work_queue",
+        {
+            "rule": {
+                "properties": {
+                    "name": {"type": "string"},
+                    "source": {"type": "string"},
+                    "dtype": {"type": "string"},
+                    "chunk_size": {"type": "number"},
+                    "next_index": {"type": "number"},
+                    "process_name": {"type": "string"},
+                    "process_index": {"type": "number"},
+                },
+                "required": [
+                    "name",
+                    "source",
+                    "dtype",
+                    "chunk_size",
+                    "next_index",
+                    "process_name",
+                    "process_index",
+                ],
+                "additionalProperties": False,
+            },
+            "level": "strict",
+        },
+    )
+
+    create_collection_safe(
+        db,
+        "work_lease",
+        {
+            "rule": {
+                "properties": {
+                    "queue": {"type": "string"},
+                    "start_index": {"type": "number"},
+                    "end_index": {"type": "number"},
+                    "status": {"type": "string"},
+                    "worker_id": {"type": "string"},
+                    "process_name": {"type": "string"},
+                    "process_index": {"type": "number"},
+                    "pid": {"type": "number"},
+                    "host": {"type": "string"},
+                    "expires": {"type": "number"},
+                    "attempts": {"type": "number"},
+                    "completed": {"type": "number"},
+                },
+                "required": [
+                    "queue",
+                    "start_index",
+                    "end_index",
+                    "status",
+                    "worker_id",
+                    "pid",
+                    "host",
+                    "expires",
+                    "attempts",
+                ],
+                "additionalProperties": False,
+            },
+            "level": "strict",
+        },
+    )
+
     def add_edge_def(edge_col: str, from_cols: List[str], to_cols: List[str]) -> None:
         if graph.has_edge_definition(edge_col):
             pass
@@ -573,4 +836,68 @@ def create_tablevault_db(
     add_edge_def(
         "parent_edge", DESCRIPTION_COLLECTIONS, VIEW_COLLECTIONS
     )  # item_list -> item (checked)
+    db.collection("embedding").add_index(
+        {
+            "type": "persistent",
+            "name": "embedding_name_timestamp_idx",
+            "fields": ["name", "timestamp"],
+        }
+    )  # incremental sync for local vector caches
+    for edge_col in ("parent_edge", "dependency_edge"):
+        db.collection(edge_col).add_index(
+            {
+                "type": "persistent",
+                "name": f"{edge_col}_from_bin_idx",
+                "fields": ["_from", "bin"],
+            }
+        )  # range-restricted lineage queries, see interval_index
+    for col in (
+        VIEW_COLLECTIONS
+        + DESCRIPTION_COLLECTIONS
+        + ["file", "parent_edge", "dependency_edge", "deleted_process_parent_edge"]
+    ):
+        db.collection(col).add_index(
+            {
+                "type": "persistent",
+                "name": f"{col}_timestamp_idx",
+                "fields": ["timestamp"],
+            }
+        )  # as-of reads and the change feed
+    db.collection("record").add_index(
+        {
+            "type": "persistent",
+            "name": "record_name_position_idx",
+            "fields": ["name", "start_position"],
+        }
+    )  # structured record queries, see query_record_data
+    db.collection("process").add_index(
+        {
+            "type": "persistent",
+            "name": "process_code_hash_idx",
+            "fields": ["code_hash"],
+            "sparse": True,
+        }
+    )  # code_blob search hits -> process cells
+    db.collection("work_lease").add_index(
+        {
+            "type": "persistent",
+            "name": "work_lease_queue_status_idx",
+            "fields": ["queue", "status", "expires"],
+        }
+    )  # reassignment of expired leases, see work_queue
+    closure = db.collection("lineage_closure")
+    closure.add_index(
+        {
+            "type": "persistent",
+            "name": "lineage_closure_name_idx",
+            "fields": ["name", "start_position", "end_position"],
+        }
+    )  # upstream lookups and inheritance on append
+    closure.add_index(
+        {
+            "type": "persistent",
+            "name": "lineage_closure_ancestor_idx",
+            "fields": ["ancestor", "ancestor_start", "ancestor_end"],
+        }
+    )  # downstream lookups
     create_tablevault_query_views(db, description_embedding_size)
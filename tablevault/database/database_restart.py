@@ -1,10 +1,71 @@
-from typing import List, Optional
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from arango.database import StandardDatabase
 
 from tablevault.database.log_helper import operation_management, utils
 from tablevault.database import process_collection, item_collection
 import time
+import warnings
+
+# description operations lock the described item, op_info[2]; the others lock op_info[1]
+_DESCRIBED_ITEM_OPS = ("add_description", "add_description_inner")
+
+
+def _group_key(op_info: List[Any]) -> str:
+    if op_info[0] in _DESCRIBED_ITEM_OPS:
+        return str(op_info[2])
+    return str(op_info[1]) if len(op_info) > 1 else ""
+
+
+def _restart_one(
+    db: StandardDatabase, ts: int, op_info: List[Any], commits: Dict[int, str]
+) -> None:
+    reverse_fn = operation_management.FUNCTION_REVERSE_MAP.get(op_info[0])
+    if reverse_fn is not None:
+        reverse_fn(db, ts, op_info, commits)
+    elif op_info[0] == "delete_item_list":
+        op_name = op_info[1]
+        op_coll_name = op_info[2]
+        op_process_name = op_info[3]
+        op_process_index = op_info[4]
+        item_collection.delete_item_list_inner(
+            db, ts, op_name, op_coll_name, op_process_name, op_process_index
+        )
+        commits[ts] = "restart"
+    elif op_info[0] == "process_add_code_end":
+        op_name = op_info[1]
+        op_index = op_info[2]
+        op_error = op_info[3]
+        op_telemetry = op_info[4] if len(op_info) > 4 else None
+        process_collection.process_add_code_end(
+            db, op_name, op_index, op_error, ts, op_telemetry
+        )
+    elif op_info[0] == "process_resume_request":
+        op_name = op_info[1]
+        op_process_name = op_info[2]
+        process_collection.process_resume_request(
+            db, op_name, op_process_name, timestamp=ts
+        )
+    elif op_info[0] == "process_stop_pause_request":
+        commits[ts] = "restart"
+
+
+def _restart_group(
+    db: StandardDatabase, ops: List[Tuple[int, List[Any]]]
+) -> Tuple[int, int]:
+    """Restart the operations on one item in timestamp order; commit them in one write."""
+    commits: Dict[int, str] = {}
+    failed = 0
+    for ts, op_info in ops:
+        try:
+            _restart_one(db, ts, op_info, commits)
+        except Exception as e:
+            warnings.warn(f"Cleanup failed for timestamp {ts}: {e}")
+            failed += 1
+    utils.commit_timestamps(db, commits)
+    return len(ops) - failed, failed
 
 
 def function_restart(
@@ -12,56 +73,53 @@ def function_restart(
     interval: int,
     process_name: str,
     selected_timestamps: Optional[List[int]] = None,
-) -> None:
-    # only consider values where interval is greater than n
-    # for each function condition -> write out the right function interval
-    timestamps = utils.get_timestamp_info(db)
+    parallelism: int = 8,
+    progress: Optional[Callable[[int, int], None]] = None,
+) -> Dict[str, Any]:
+    """
+    Reverse or finish every operation whose last update is more than ``interval`` seconds old.
+
+    Operations are grouped by the item they lock. A group runs serially in timestamp order,
+    so later operations on a list see the state left by earlier ones; different groups run
+    concurrently on ``parallelism`` threads. ``progress(done, total)`` is called after each
+    group. Returns counts and timing of the run.
+    """
+    start = time.perf_counter()
+    stale = utils.get_stale_timestamps(db, time.time() - interval, selected_timestamps)
     timestamp, _ = utils.get_new_timestamp(db, ["db_restart", process_name])
-    current_time = time.time()
-    if selected_timestamps is not None:
-        selected_timestamps = [str(k) for k in selected_timestamps]
-    for k in timestamps:
-        try:
-            if selected_timestamps is not None and k not in selected_timestamps:
-                continue
-            _, last_update, op_info = timestamps[k]
-            ts = int(k)
-            if current_time - last_update > interval:
-                if op_info[0] == "create_item_list":
-                    operation_management.create_item_reverse(db, ts)
-                elif op_info[0] == "append_item":
-                    operation_management.append_item_reverse(db, ts)
-                elif op_info[0] == "add_description_inner":
-                    operation_management.add_description_reverse(db, ts)
-                elif op_info[0] == "delete_item_list":
-                    op_name = op_info[1]
-                    op_coll_name = op_info[2]
-                    op_process_name = op_info[3]
-                    op_process_index = op_info[4]
-                    item_collection.delete_item_list_inner(
-                        db, ts, op_name, op_coll_name, op_process_name, op_process_index
-                    )
-                    utils.commit_new_timestamp(db, ts, "restart")
-                elif op_info[0] == "process_add_code_end":
-                    op_name = op_info[1]
-                    op_index = op_info[2]
-                    op_error = op_info[3]
-                    process_collection.process_add_code_end(
-                        db, op_name, op_index, op_error, ts
-                    )
-                elif op_info[0] == "process_resume_request":
-                    op_name = op_info[1]
-                    op_process_name = op_info[2]
-                    process_collection.process_resume_request(
-                        db, op_name, op_process_name, timestamp=ts
-                    )
-                elif op_info[0] == "process_stop_pause_request":
-                    utils.commit_new_timestamp(db, ts, "restart")
-                elif op_info[0] == "db_restart":
-                    pass
-        except Exception as e:
-            import warnings
 
-            warnings.warn(f"Cleanup failed for timestamp {k}: {e}")
+    groups: Dict[str, List[Tuple[int, List[Any]]]] = {}
+    for ts, op_info in stale:
+        if not op_info or op_info[0] == "db_restart":
             continue
-    utils.commit_new_timestamp(db, timestamp)
+        groups.setdefault(_group_key(op_info), []).append((ts, op_info))
+    total = sum(len(ops) for ops in groups.values())
+
+    restarted = 0
+    failed = 0
+    done = 0
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, parallelism)) as pool:
+            futures = {
+                pool.submit(_restart_group, db, ops): len(ops) for ops in groups.values()
+            }
+            for future in as_completed(futures):
+                ok, err = future.result()
+                restarted += ok
+                failed += err
+                done += futures[future]
+                if progress is not None:
+                    progress(done, total)
+    finally:
+        utils.commit_new_timestamp(db, timestamp)
+
+    elapsed = time.perf_counter() - start
+    return {
+        "stale": total,
+        "restarted": restarted,
+        "failed": failed,
+        "groups": len(groups),
+        "by_type": dict(Counter(op_info[0] for ops in groups.values() for _, op_info in ops)),
+        "elapsed": elapsed,
+        "ops_per_second": total / elapsed if elapsed > 0 else 0.0,
+    }
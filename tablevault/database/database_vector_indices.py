@@ -19,16 +19,26 @@ def _get_index_by_name(
 
 def add_one_vector_count(
     db: StandardDatabase, embedding_name: str, tries: int = 5, wait_time: float = 0.1
+) -> Tuple[int, int]:
+    return add_vector_count(db, embedding_name, 1, tries, wait_time)
+
+
+def add_vector_count(
+    db: StandardDatabase,
+    embedding_name: str,
+    count: int,
+    tries: int = 5,
+    wait_time: float = 0.1,
 ) -> Tuple[int, int]:
     coll = db.collection("metadata")
     for i in range(tries):
         meta = coll.get("global")
         if embedding_name in meta["vector_indices"]:
-            meta["vector_indices"][embedding_name]["total_count"] += 1
+            meta["vector_indices"][embedding_name]["total_count"] += count
         else:
             meta["vector_indices"][embedding_name] = {}
             meta["vector_indices"][embedding_name]["idx_count"] = 0
-            meta["vector_indices"][embedding_name]["total_count"] = 1
+            meta["vector_indices"][embedding_name]["total_count"] = count
         try:
             coll.update(meta, check_rev=True, merge=False)
             return meta["vector_indices"][embedding_name]["total_count"], meta[
@@ -39,7 +49,7 @@ def add_one_vector_count(
         time.sleep(wait_time)
     raise LockTimeoutError(
         f"Failed to update vector counters for '{embedding_name}' after {tries} attempts.",
-        operation="add_one_vector_count",
+        operation="add_vector_count",
         collection="metadata",
         key=embedding_name,
     )
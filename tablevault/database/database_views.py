@@ -7,10 +7,11 @@ def _create_or_replace_view(
     db: StandardDatabase, name: str, properties: Dict[str, Any]
 ) -> None:
     try:
-        v = db.view(name)  # fetch existing view
-        v.replace_properties(properties)  # update
+        db.view(name)  # returns the view's properties; raises when it does not exist
     except ViewGetError:
         db.create_arangosearch_view(name=name, properties=properties)
+        return
+    db.replace_arangosearch_view(name, properties)
 
 
 def create_description_view(
@@ -49,6 +50,7 @@ def create_process_view(
     collection_name: str = "process",
     text_analyzer: str = "text_en",
     text_field: str = "text",
+    blob_collection_name: str = "code_blob",
 ) -> None:
     props = {
         "links": {
@@ -69,7 +71,14 @@ def create_process_view(
                     "status": {"analyzers": ["identity"]},
                     "error": {"analyzers": [text_analyzer]},
                 },
-            }
+            },
+            # each distinct code body is indexed once; process cells point at it by hash
+            blob_collection_name: {
+                "includeAllFields": False,
+                "storeValues": "none",
+                "trackListPositions": False,
+                "fields": {text_field: {"analyzers": [text_analyzer]}},
+            },
         },
         "primarySort": [
             {"field": "name", "direction": "asc"},
@@ -58,13 +58,9 @@ def add_description_inner(
         db, key_, timestamp, guard_rev, "description_edge", str(timestamp), {}, doc
     )
 
-    doc = {
-        "_key": str(timestamp),
-        "timestamp": timestamp,
-        "index": process_index,
-        "_from": f"process_list/{process_name}",
-        "_to": f"description/{key_}",
-    }
+    doc = utils.process_edge(
+        timestamp, process_name, process_index, f"description/{key_}", key=str(timestamp)
+    )
     utils.guarded_upsert(
         db, key_, timestamp, guard_rev, "process_parent_edge", str(timestamp), {}, doc
     )
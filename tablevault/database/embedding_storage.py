@@ -0,0 +1,85 @@
+import math
+from typing import Any, Dict, List, Optional, Tuple
+
+STORAGE_MODES = ("float", "int8", "binary")
+
+
+def full_field(n_dim: int) -> str:
+    return "embedding_" + str(n_dim)
+
+
+def int8_field(n_dim: int) -> str:
+    return "embedding_int8_" + str(n_dim)
+
+
+def binary_field(n_dim: int) -> str:
+    return "embedding_binary_" + str(n_dim)
+
+
+def quantize_int8(vec: List[float]) -> Tuple[List[int], float]:
+    """Symmetric per-vector quantization to [-127, 127]; ``x ~= q * scale``."""
+    peak = max((abs(x) for x in vec), default=0.0)
+    if peak == 0.0 or math.isnan(peak):
+        return [0] * len(vec), 0.0
+    scale = peak / 127.0
+    return [int(round(x / scale)) for x in vec], scale
+
+
+def pack_binary(vec: List[float]) -> List[int]:
+    """Pack sign bits into unsigned 32-bit words (AQL bit functions are 32-bit)."""
+    words = []
+    for lo in range(0, len(vec), 32):
+        word = 0
+        for bit, x in enumerate(vec[lo : lo + 32]):
+            if x > 0:
+                word |= 1 << bit
+        words.append(word)
+    return words
+
+
+def storage_mode(embedding_list: Dict[str, Any]) -> Tuple[str, bool]:
+    """Storage mode of a list document; lists created before quantization are ``float``."""
+    return (
+        embedding_list.get("storage", "float"),
+        embedding_list.get("keep_full_precision", True),
+    )
+
+
+def indexed_fields(n_dim: int, storage: str, keep_full_precision: bool) -> List[str]:
+    """Fields of a list's documents that get a vector index (binary codes cannot)."""
+    fields = []
+    if storage == "float" or keep_full_precision:
+        fields.append(full_field(n_dim))
+    if storage == "int8":
+        fields.append(int8_field(n_dim))
+    return fields
+
+
+def encode_embedding(
+    vec: List[float], n_dim: int, storage: str, keep_full_precision: bool
+) -> Dict[str, Any]:
+    fields: Dict[str, Any] = {}
+    if storage == "float" or keep_full_precision:
+        fields[full_field(n_dim)] = vec
+    if storage == "int8":
+        codes, scale = quantize_int8(vec)
+        fields[int8_field(n_dim)] = codes
+        fields["embedding_scale"] = scale
+    elif storage == "binary":
+        fields[binary_field(n_dim)] = pack_binary(vec)
+    return fields
+
+
+def value_expression(var: str) -> str:
+    """AQL expression returning the float vector of ``var``, dequantizing int8-only docs."""
+    return (
+        f"(HAS({var}, @field) ? {var}[@field] : (HAS({var}, @int8Field) ? "
+        f"(FOR x IN {var}[@int8Field] RETURN x * {var}.embedding_scale) : null))"
+    )
+
+
+def value_bind_vars(n_dim: int, bind_vars: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    bind_vars = bind_vars if bind_vars is not None else {}
+    bind_vars["field"] = full_field(n_dim)
+    bind_vars["int8Field"] = int8_field(n_dim)
+    return bind_vars
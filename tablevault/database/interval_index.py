@@ -0,0 +1,36 @@
+from typing import List, Optional
+
+# Hierarchical binning of position intervals (as in UCSC/tabix binning): an edge is
+# filed under the finest level whose bin holds its whole interval, so an overlap
+# search only has to scan one contiguous bin range per level through a persistent
+# index on [_from, bin]. Bin values are level * 2**40 + (start >> shift).
+_SHIFTS = tuple(range(10, 60, 4))
+_LEVEL_STRIDE = 1 << 40
+
+
+def position_bin(start_position: int, end_position: int) -> int:
+    last = max(end_position - 1, start_position)
+    for level, shift in enumerate(_SHIFTS):
+        if start_position >> shift == last >> shift:
+            return level * _LEVEL_STRIDE + (start_position >> shift)
+    level = len(_SHIFTS) - 1
+    return level * _LEVEL_STRIDE + (start_position >> _SHIFTS[level])
+
+
+def position_bin_ranges(
+    start_position: Optional[int], end_position: Optional[int]
+) -> Optional[List[List[int]]]:
+    """Inclusive ``[lo, hi]`` bin ranges that can hold an interval overlapping the query."""
+    if start_position is None and end_position is None:
+        return None
+    lo_pos = max(start_position or 0, 0)
+    hi_pos = end_position - 1 if end_position is not None else (1 << 50) - 1
+    if hi_pos < lo_pos:
+        return []
+    return [
+        [
+            level * _LEVEL_STRIDE + (lo_pos >> shift),
+            level * _LEVEL_STRIDE + (hi_pos >> shift),
+        ]
+        for level, shift in enumerate(_SHIFTS)
+    ]
@@ -1,10 +1,26 @@
 # centralize creation
 
-from typing import Any, Dict, List, Optional
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
 
 from arango.database import StandardDatabase
 from tablevault.database.log_helper import utils
 from tablevault.database import database_vector_indices as vector_helper
+from tablevault.database import embedding_storage
+from tablevault.database import interval_index
+from tablevault.database import lineage_closure
+from tablevault.database import query_record_data
+from tablevault.database import record_schema
 from tablevault.database.log_helper.operation_management import function_safeguard
 from tablevault.utils.errors import ValidationError
 
@@ -55,6 +71,20 @@ def delete_item_list_inner(
         RETURN 1
     )
 
+    LET rmClosure = (
+    FOR c IN lineage_closure
+        FILTER c.name == rootKey
+        REMOVE c IN lineage_closure
+        RETURN 1
+    )
+
+    LET rmImport = (
+    FOR p IN import_progress
+        FILTER p._key == rootKey
+        REMOVE p IN import_progress
+        RETURN 1
+    )
+
     LET updRoot = (
     UPDATE rootKey WITH { deleted: 1 } IN @@rootCol
     RETURN 1
@@ -80,7 +110,9 @@ def delete_item_list_inner(
         process_parent_edge: LENGTH(rmProcessEdges),
         dependency_edge: LENGTH(rmDepEdges),
         children: LENGTH(rmChildren),
-        parent_edge: LENGTH(rmParentEdges)
+        parent_edge: LENGTH(rmParentEdges),
+        lineage_closure: LENGTH(rmClosure),
+        import_progress: LENGTH(rmImport)
     },
 
     updated: { root: LENGTH(updRoot) },
@@ -104,6 +136,8 @@ def delete_item_list_inner(
     print(bind_vars)
     val = next(db.aql.execute(aql, bind_vars=bind_vars), {})
     print(val)
+    # closure rows that other lists hold through the deleted one
+    lineage_closure.remove_ancestor(db, name)
 
 
 def delete_item_list(
@@ -163,13 +197,13 @@ def create_item_list(
         db, name, timestamp, rev_, collection_type, name, {}, item
     )
     if process_name != "":
-        doc = {
-            "_key": str(timestamp),
-            "timestamp": timestamp,
-            "index": process_index,
-            "_from": f"process_list/{process_name}",
-            "_to": f"{collection_type}/{name}",
-        }
+        doc = utils.process_edge(
+            timestamp,
+            process_name,
+            process_index,
+            f"{collection_type}/{name}",
+            key=str(timestamp),
+        )
         rev_ = utils.guarded_upsert(
             db, name, timestamp, rev_, "process_parent_edge", str(timestamp), {}, doc
         )
@@ -199,8 +233,32 @@ def create_document_list(
 
 
 def create_embedding_list(
-    db: StandardDatabase, name: str, process_name: str, process_index: int, n_dim: int
+    db: StandardDatabase,
+    name: str,
+    process_name: str,
+    process_index: int,
+    n_dim: int,
+    storage: str = "float",
+    keep_full_precision: Optional[bool] = None,
 ) -> None:
+    if keep_full_precision is None:
+        # int8 codes are searched through their own vector index and rescored on the codes
+        keep_full_precision = storage != "int8"
+    if storage not in embedding_storage.STORAGE_MODES:
+        raise ValidationError(
+            f"Unknown embedding storage '{storage}'; expected one of "
+            f"{list(embedding_storage.STORAGE_MODES)}.",
+            operation="create_embedding_list",
+            collection="embedding_list",
+            key=name,
+        )
+    if storage == "binary" and not keep_full_precision:
+        raise ValidationError(
+            "Binary storage needs keep_full_precision=True to rescore candidates.",
+            operation="create_embedding_list",
+            collection="embedding_list",
+            key=name,
+        )
     timestamp, _ = utils.get_new_timestamp(
         db,
         [
@@ -210,6 +268,8 @@ def create_embedding_list(
             process_name,
             process_index,
             n_dim,
+            storage,
+            keep_full_precision,
         ],
     )
     create_item_list(
@@ -218,7 +278,7 @@ def create_embedding_list(
         name,
         process_name,
         process_index,
-        {"n_dim": n_dim},
+        {"n_dim": n_dim, "storage": storage, "keep_full_precision": keep_full_precision},
         "embedding_list",
     )
 
@@ -229,7 +289,23 @@ def create_record_list(
     process_name: str,
     process_index: int,
     column_names: List[str],
+    indexed_columns: Optional[List[str]] = None,
+    column_types: Optional[Dict[str, str]] = None,
+    text_columns: Optional[List[str]] = None,
 ) -> None:
+    record_schema.check_schema(name, column_names, column_types, text_columns)
+    indexed_columns = list(indexed_columns or [])
+    query_record_data.validate_columns(
+        name, indexed_columns, column_names, "create_record_list"
+    )
+    nested = [c for c in indexed_columns if "." in c]
+    if nested:
+        raise ValidationError(
+            f"Indexed columns cannot contain '.': {nested}.",
+            operation="create_record_list",
+            collection="record_list",
+            key=name,
+        )
     timestamp, _ = utils.get_new_timestamp(
         db,
         [
@@ -247,9 +323,24 @@ def create_record_list(
         name,
         process_name,
         process_index,
-        {"column_names": column_names},
+        {
+            "column_names": column_names,
+            "indexed_columns": indexed_columns,
+            "column_types": column_types,
+            "text_columns": text_columns,
+        },
         "record_list",
     )
+    record = db.collection("record")
+    for column in indexed_columns:
+        # persistent indexes are per collection; lists indexing the same column share one
+        record.add_index(
+            {
+                "type": "persistent",
+                "name": query_record_data.data_index_name(column),
+                "fields": ["name", f"data.{column}"],
+            }
+        )
 
 @function_safeguard
 def append_item(
@@ -281,6 +372,7 @@ def append_item(
         "timestamp": timestamp,
         "start_position": start_position,
         "end_position": end_position,
+        "bin": interval_index.position_bin(start_position, end_position),
         "_from": f"{dtype}_list/{name}",
         "_to": f"{dtype}/{item_key}",
     }
@@ -292,12 +384,9 @@ def append_item(
         db, name, timestamp, rev_, "parent_edge", str(timestamp), {}, doc
     )
     if process_name != "":
-        doc = {
-            "timestamp": timestamp,
-            "index": process_index,
-            "_from": f"process_list/{process_name}",
-            "_to": f"{dtype}/{item_key}",
-        }
+        doc = utils.process_edge(
+            timestamp, process_name, process_index, f"{dtype}/{item_key}"
+        )
         rev_ = utils.guarded_upsert(
             db, name, timestamp, rev_, "process_parent_edge", str(timestamp), {}, doc
         )
@@ -310,6 +399,7 @@ def append_item(
                 "timestamp": timestamp,
                 "start_position": positions[0],
                 "end_position": positions[1],
+                "bin": interval_index.position_bin(positions[0], positions[1]),
                 "_from": f"{itm_collection}/{itm_name}",
                 "_to": f"{dtype}/{item_key}",
             }
@@ -323,6 +413,13 @@ def append_item(
                 {},
                 doc,
             )
+        closure_docs = lineage_closure.closure_entries(
+            db,
+            timestamp,
+            name,
+            [lineage_closure.closure_row(index, start_position, end_position, input_items)],
+        )
+        rev_ = utils.guarded_import(db, name, rev_, "lineage_closure", closure_docs)
     list_collection = db.collection(f"{dtype}_list")
     item_list = list_collection.get(name)
     if item_list["n_items"] <= index:
@@ -337,6 +434,208 @@ def append_item(
     return index
 
 
+def _append_items(
+    db: StandardDatabase,
+    timestamp: int,
+    name: str,
+    item_chunks: Iterable[List[Tuple[Dict[str, Any], int]]],
+    process_name: str,
+    process_index: int,
+    input_items: Optional[Union[Dict[str, List[int]], List[Optional[Dict[str, List[int]]]]]],
+    dtype: str,
+    index: int,
+    start_position: int,
+    rev_: Optional[str],
+    on_chunk: Optional[Callable[[str, int, int, int], str]] = None,
+) -> int:
+    """
+    Append many items to a list under one timestamp.
+
+    ``item_chunks`` yields lists of ``(item, length)`` pairs; each chunk is written with one
+    bulk import per collection. ``input_items`` is either one mapping applied to every item or
+    one (optional) mapping per item. ``on_chunk(rev, n_rows, index, start_position)`` runs
+    after each chunk is written and returns the new guard revision.
+
+    With ``rev_`` None the list is not locked: the index and position range was reserved
+    beforehand (see ``reserve_items``) and the list document is already up to date.
+    """
+    items = db.collection("items")
+    input_collections: Dict[str, str] = {}
+    first_index = index
+    row = 0
+    for chunk in item_chunks:
+        item_docs = []
+        parent_docs = []
+        process_docs = []
+        dependency_docs = []
+        closure_rows = []
+        for item, length in chunk:
+            end_position = start_position + length
+            item_key = f"{name}_{index}"
+            edge_key = f"{timestamp}_{index}"
+            item["_key"] = item_key
+            item["index"] = index
+            item["start_position"] = start_position
+            item["end_position"] = end_position
+            item["name"] = name
+            item["process_name"] = process_name
+            item["process_index"] = process_index
+            item["timestamp"] = timestamp
+            item_docs.append(item)
+            parent_docs.append(
+                {
+                    "_key": edge_key,
+                    "timestamp": timestamp,
+                    "start_position": start_position,
+                    "end_position": end_position,
+                    "bin": interval_index.position_bin(start_position, end_position),
+                    "_from": f"{dtype}_list/{name}",
+                    "_to": f"{dtype}/{item_key}",
+                }
+            )
+            if process_name != "":
+                process_docs.append(
+                    utils.process_edge(
+                        timestamp,
+                        process_name,
+                        process_index,
+                        f"{dtype}/{item_key}",
+                        key=edge_key,
+                    )
+                )
+            row_inputs = input_items[row] if isinstance(input_items, list) else input_items
+            if row_inputs:
+                closure_rows.append(
+                    lineage_closure.closure_row(index, start_position, end_position, row_inputs)
+                )
+            for itm_name, positions in (row_inputs or {}).items():
+                if itm_name not in input_collections:
+                    input_collections[itm_name] = items.get({"_key": itm_name})["collection"]
+                dependency_docs.append(
+                    {
+                        "_key": f"{edge_key}_{itm_name}",
+                        "timestamp": timestamp,
+                        "start_position": positions[0],
+                        "end_position": positions[1],
+                        "bin": interval_index.position_bin(positions[0], positions[1]),
+                        "_from": f"{input_collections[itm_name]}/{itm_name}",
+                        "_to": f"{dtype}/{item_key}",
+                    }
+                )
+            index += 1
+            row += 1
+            start_position = end_position
+        rev_ = utils.guarded_import(db, name, rev_, dtype, item_docs)
+        rev_ = utils.guarded_import(db, name, rev_, "parent_edge", parent_docs)
+        rev_ = utils.guarded_import(db, name, rev_, "process_parent_edge", process_docs)
+        rev_ = utils.guarded_import(db, name, rev_, "dependency_edge", dependency_docs)
+        if closure_rows:
+            closure_docs = lineage_closure.closure_entries(db, timestamp, name, closure_rows)
+            rev_ = utils.guarded_import(db, name, rev_, "lineage_closure", closure_docs)
+        if on_chunk is not None:
+            rev_ = on_chunk(rev_, len(item_docs), index, start_position)
+    if rev_ is None:
+        utils.commit_new_timestamp(db, timestamp)
+        return first_index
+    list_collection = db.collection(f"{dtype}_list")
+    item_list = list_collection.get(name)
+    if item_list["n_items"] < index:
+        item_list["n_items"] = index
+    if item_list["length"] < start_position:
+        item_list["length"] = start_position
+    rev_ = utils.guarded_upsert(
+        db, name, timestamp, rev_, f"{dtype}_list", name, item_list, {}
+    )
+    utils.commit_new_timestamp(db, timestamp)
+    return first_index
+
+
+@function_safeguard
+def append_items(
+    db: StandardDatabase,
+    timestamp: int,
+    name: str,
+    item_chunks: Iterable[List[Tuple[Dict[str, Any], int]]],
+    process_name: str,
+    process_index: int,
+    input_items: Optional[Union[Dict[str, List[int]], List[Optional[Dict[str, List[int]]]]]],
+    dtype: str,
+    index: int,
+    start_position: int,
+    rev_: str,
+) -> int:
+    return _append_items(
+        db,
+        timestamp,
+        name,
+        item_chunks,
+        process_name,
+        process_index,
+        input_items,
+        dtype,
+        index,
+        start_position,
+        rev_,
+    )
+
+
+@function_safeguard
+def import_items(
+    db: StandardDatabase,
+    timestamp: int,
+    name: str,
+    item_chunks: Iterable[List[Tuple[Dict[str, Any], int]]],
+    process_name: str,
+    process_index: int,
+    input_items: Optional[Dict[str, List[int]]],
+    dtype: str,
+    index: int,
+    start_position: int,
+    rev_: str,
+    source: str,
+    rows_done: int,
+) -> int:
+    """
+    Bulk append for an import; checkpoints ``import_progress`` after every chunk.
+
+    A failed import keeps the checkpointed chunks (see ``import_items_reverse``) so it can be
+    resumed from the next source row.
+    """
+
+    def _checkpoint(rev: str, n_rows: int, next_index: int, next_start: int) -> str:
+        nonlocal rows_done
+        rows_done += n_rows
+        progress = {
+            "name": name,
+            "source": source,
+            "dtype": dtype,
+            "timestamp": timestamp,
+            "rows_done": rows_done,
+            "n_items": next_index,
+            "length": next_start,
+        }
+        return utils.guarded_upsert(
+            db, name, timestamp, rev, "import_progress", name, progress, progress
+        )
+
+    first_index = _append_items(
+        db,
+        timestamp,
+        name,
+        item_chunks,
+        process_name,
+        process_index,
+        input_items,
+        dtype,
+        index,
+        start_position,
+        rev_,
+        on_chunk=_checkpoint,
+    )
+    db.collection("import_progress").delete(name, ignore_missing=True)
+    return first_index
+
+
 def append_file(
     db: StandardDatabase,
     name: str,
@@ -450,6 +749,8 @@ def append_embedding(
     build_idx: bool = True,
     index_rebuild_count: int = 10000,
 ) -> None:
+    if hasattr(embedding, "tolist"):
+        embedding = embedding.tolist()
     timestamp, itm = utils.get_new_timestamp(db, [], name)
     embedding_list = db.collection("embedding_list").get(name)
 
@@ -461,10 +762,10 @@ def append_embedding(
             collection="embedding_list",
             key=name,
         )
-    embedding_name = "embedding_" + str(len(embedding))
-    item = {
-        embedding_name: embedding,
-    }
+    storage, keep_full_precision = embedding_storage.storage_mode(embedding_list)
+    item = embedding_storage.encode_embedding(
+        embedding, len(embedding), storage, keep_full_precision
+    )
     if index is None:
         index = embedding_list["n_items"]
         start_position = embedding_list["length"]
@@ -497,20 +798,139 @@ def append_embedding(
         itm["_rev"],
     )
     if build_idx:
-        total_count, index_count = vector_helper.add_one_vector_count(
-            db, embedding_name
+        _update_vector_indices(
+            db,
+            embedding_storage.indexed_fields(len(embedding), storage, keep_full_precision),
+            len(embedding),
+            1,
+            index_rebuild_count,
         )
+
+
+def _update_vector_indices(
+    db: StandardDatabase,
+    fields: List[str],
+    n_dim: int,
+    count: int,
+    index_rebuild_count: int,
+) -> None:
+    """Count ``count`` new vectors per indexed field; rebuild an index that fell behind."""
+    for field in fields:
+        total_count, index_count = vector_helper.add_vector_count(db, field, count)
         if total_count - index_count > index_rebuild_count:
             vector_helper.build_vector_idx(
                 db,
-                embedding_name,
-                len(embedding),
+                field,
+                n_dim,
                 parallelism=1,
                 n_lists=2,
                 default_n_probe=1,
                 training_iterations=2,
             )
-            vector_helper.update_vector_idx(db, embedding_name)
+            vector_helper.update_vector_idx(db, field)
+
+
+def append_embeddings(
+    db: StandardDatabase,
+    name: str,
+    embeddings: Any,
+    process_name: str,
+    process_index: int,
+    input_items: Optional[Union[Dict[str, List[int]], List[Optional[Dict[str, List[int]]]]]] = None,
+    build_idx: bool = True,
+    index_rebuild_count: int = 10000,
+    chunk_size: int = 1000,
+    precision: Optional[int] = None,
+) -> int:
+    embedding_list = db.collection("embedding_list").get(name)
+    n_dim = embedding_list["n_dim"]
+    if hasattr(embeddings, "ndim"):
+        if embeddings.ndim == 1:
+            embeddings = embeddings.reshape(1, -1)
+        shape_ok = embeddings.ndim == 2 and embeddings.shape[1] == n_dim
+        n_rows = embeddings.shape[0] if embeddings.ndim == 2 else 0
+    else:
+        # a sequence of vectors (lists, tuples or 1-D arrays) rather than a single vector
+        if len(embeddings) > 0 and not hasattr(embeddings[0], "__len__"):
+            embeddings = [embeddings]
+        shape_ok = all(len(e) == n_dim for e in embeddings)
+        n_rows = len(embeddings)
+    if not shape_ok:
+        raise ValidationError(
+            f"Embedding batch does not match required dimension {n_dim} for list '{name}'.",
+            operation="append_embeddings",
+            collection="embedding_list",
+            key=name,
+        )
+    if isinstance(input_items, list) and len(input_items) != n_rows:
+        raise ValidationError(
+            f"Got {len(input_items)} input_items entries for {n_rows} embeddings.",
+            operation="append_embeddings",
+            collection="embedding_list",
+            key=name,
+        )
+    if n_rows == 0:
+        return embedding_list["n_items"]
+    storage, keep_full_precision = embedding_storage.storage_mode(embedding_list)
+
+    def _chunks() -> Iterator[List[Tuple[Dict[str, Any], int]]]:
+        for lo in range(0, n_rows, chunk_size):
+            chunk = embeddings[lo : lo + chunk_size]
+            if hasattr(chunk, "tolist"):
+                if precision is not None:
+                    # rounded float32 values widen to long decimals (0.123 -> 0.12300000339...)
+                    chunk = chunk.astype("float64").round(precision)
+                rows = chunk.tolist()
+            elif precision is not None:
+                rows = [[round(float(x), precision) for x in e] for e in chunk]
+            else:
+                rows = [[float(x) for x in e] for e in chunk]
+            yield [
+                (
+                    embedding_storage.encode_embedding(
+                        r, n_dim, storage, keep_full_precision
+                    ),
+                    1,
+                )
+                for r in rows
+            ]
+
+    timestamp, itm = utils.get_new_timestamp(db, [], name)
+    embedding_list = db.collection("embedding_list").get(name)
+    data = [
+        "append_items",
+        name,
+        "embedding",
+        sorted(input_items) if isinstance(input_items, dict) else [],
+        process_name,
+        process_index,
+        embedding_list["n_items"],
+        embedding_list["length"],
+    ]
+    utils.update_timestamp_info(db, timestamp, data)
+
+    first_index = append_items(
+        db,
+        timestamp,
+        name,
+        _chunks(),
+        process_name,
+        process_index,
+        input_items,
+        "embedding",
+        embedding_list["n_items"],
+        embedding_list["length"],
+        itm["_rev"],
+    )
+    if build_idx:
+        _update_vector_indices(
+            db,
+            embedding_storage.indexed_fields(n_dim, storage, keep_full_precision),
+            n_dim,
+            n_rows,
+            index_rebuild_count,
+        )
+    return first_index
 
 
 def append_record(
@@ -524,32 +944,11 @@ def append_record(
     end_position: Optional[int] = None,
     input_items: Optional[Dict[str, List[int]]] = None,
 ) -> None:
+    record_list = db.collection("record_list").get(name)
+    record_schema.validate_records(name, record_list, [record], "append_record")
+    item = record_schema.record_item(record_list, record)
     timestamp, itm = utils.get_new_timestamp(db, [], name)
     record_list = db.collection("record_list").get(name)
-
-    if set(record_list["column_names"]) != set(record.keys()):
-        expected = set(record_list["column_names"])
-        provided = set(record.keys())
-        missing = expected - provided
-        extra = provided - expected
-        details = []
-        if missing:
-            details.append(f"missing={sorted(missing)}")
-        if extra:
-            details.append(f"extra={sorted(extra)}")
-        detail_msg = "; ".join(details) if details else "column mismatch"
-        raise ValidationError(
-            f"Record columns do not match record_list '{name}': {detail_msg}.",
-            operation="append_record",
-            collection="record_list",
-            key=name,
-        )
-
-    item = {
-        "data": record,
-        "data_text": str(record),
-        "column_names": list(record.keys()),
-    }
     if index is None:
         index = record_list["n_items"]
         start_position = record_list["length"]
@@ -581,3 +980,229 @@ def append_record(
         end_position,
         itm["_rev"],
     )
+
+
+@dataclass
+class Reservation:
+    """
+    A block of indices ``[index, index + n_items)`` and positions
+    ``[start_position, start_position + length)`` of a list, reserved for one writer.
+
+    ``next_index``/``next_position`` track how much of the block has been written.
+    """
+
+    name: str
+    dtype: str
+    index: int
+    n_items: int
+    start_position: int
+    length: int
+    next_index: int
+    next_position: int
+
+
+@function_safeguard
+def reserve_block(
+    db: StandardDatabase,
+    timestamp: int,
+    name: str,
+    dtype: str,
+    n_items: int,
+    length: int,
+    rev_: str,
+) -> Tuple[int, int]:
+    item_list = db.collection(f"{dtype}_list").get(name)
+    index = item_list["n_items"]
+    start_position = item_list["length"]
+    patch = {"n_items": index + n_items, "length": start_position + length}
+    utils.guarded_upsert(db, name, timestamp, rev_, f"{dtype}_list", name, patch, {})
+    utils.commit_new_timestamp(db, timestamp)
+    return index, start_position
+
+
+def reserve_items(
+    db: StandardDatabase, name: str, n_items: int, length: Optional[int] = None
+) -> Reservation:
+    """
+    Reserve the next ``n_items`` indices (and ``length`` positions) of a list.
+
+    This is the only step that takes the list lock; ``append_reserved`` then writes into the
+    block without it, so writers holding separate reservations append concurrently. A
+    reservation that is never filled leaves a gap of missing indices in the list.
+    """
+    itm = db.collection("items").get(name)
+    if itm is None:
+        raise ValidationError(
+            f"Item list '{name}' does not exist.",
+            operation="reserve_items",
+            collection="items",
+            key=name,
+        )
+    dtype = itm["collection"].split("_")[0]
+    if dtype not in ("file", "document", "embedding", "record"):
+        raise ValidationError(
+            f"Cannot reserve items of a {itm['collection']}.",
+            operation="reserve_items",
+            collection=itm["collection"],
+            key=name,
+        )
+    if length is None:
+        if dtype == "document":
+            raise ValidationError(
+                "Document reservations need the total text length of the block.",
+                operation="reserve_items",
+                collection="document_list",
+                key=name,
+            )
+        length = n_items
+    elif dtype != "document" and length != n_items:
+        raise ValidationError(
+            f"Items of a {itm['collection']} have length 1; got length {length} for {n_items} items.",
+            operation="reserve_items",
+            collection=itm["collection"],
+            key=name,
+        )
+    timestamp, itm = utils.get_new_timestamp(
+        db, ["reserve_block", name, dtype, n_items, length], name
+    )
+    index, start_position = reserve_block(
+        db, timestamp, name, dtype, n_items, length, itm["_rev"]
+    )
+    return Reservation(
+        name, dtype, index, n_items, start_position, length, index, start_position
+    )
+
+
+@function_safeguard
+def append_reserved_items(
+    db: StandardDatabase,
+    timestamp: int,
+    name: str,
+    items: List[Tuple[Dict[str, Any], int]],
+    process_name: str,
+    process_index: int,
+    input_items: Optional[Union[Dict[str, List[int]], List[Optional[Dict[str, List[int]]]]]],
+    dtype: str,
+    index: int,
+    start_position: int,
+) -> int:
+    return _append_items(
+        db,
+        timestamp,
+        name,
+        [items],
+        process_name,
+        process_index,
+        input_items,
+        dtype,
+        index,
+        start_position,
+        None,
+    )
+
+
+def _reserved_item(
+    db: StandardDatabase, reservation: Reservation
+) -> Callable[[Any], Tuple[Dict[str, Any], int]]:
+    name = reservation.name
+    if reservation.dtype == "file":
+        return lambda location: ({"location": location}, 1)
+    if reservation.dtype == "document":
+        return lambda text: ({"text": text}, len(text))
+    if reservation.dtype == "record":
+        record_list = db.collection("record_list").get(name)
+
+        def _record(record: Dict[str, Any]) -> Tuple[Dict[str, Any], int]:
+            record_schema.validate_records(name, record_list, [record], "append_reserved")
+            return record_schema.record_item(record_list, record), 1
+
+        return _record
+    embedding_list = db.collection("embedding_list").get(name)
+    n_dim = embedding_list["n_dim"]
+    storage, keep_full_precision = embedding_storage.storage_mode(embedding_list)
+
+    def _embedding(embedding: Any) -> Tuple[Dict[str, Any], int]:
+        if hasattr(embedding, "tolist"):
+            embedding = embedding.tolist()
+        if len(embedding) != n_dim:
+            raise ValidationError(
+                f"Embedding length {len(embedding)} does not match required dimension "
+                f"{n_dim} for list '{name}'.",
+                operation="append_reserved",
+                collection="embedding_list",
+                key=name,
+            )
+        item = embedding_storage.encode_embedding(
+            embedding, n_dim, storage, keep_full_precision
+        )
+        return item, 1
+
+    return _embedding
+
+
+def append_reserved(
+    db: StandardDatabase,
+    reservation: Reservation,
+    values: List[Any],
+    process_name: str,
+    process_index: int,
+    input_items: Optional[Union[Dict[str, List[int]], List[Optional[Dict[str, List[int]]]]]] = None,
+) -> int:
+    """Write ``values`` into the next free slots of ``reservation``; returns the first index."""
+    to_item = _reserved_item(db, reservation)
+    items = [to_item(v) for v in values]
+    end_index = reservation.next_index + len(items)
+    end_position = reservation.next_position + sum(length for _, length in items)
+    if (
+        end_index > reservation.index + reservation.n_items
+        or end_position > reservation.start_position + reservation.length
+    ):
+        raise ValidationError(
+            f"{len(items)} items do not fit in the rest of the reservation at index "
+            f"{reservation.index} of '{reservation.name}'.",
+            operation="append_reserved",
+            collection=f"{reservation.dtype}_list",
+            key=reservation.name,
+        )
+    if isinstance(input_items, list) and len(input_items) != len(items):
+        raise ValidationError(
+            f"Got {len(input_items)} input_items entries for {len(items)} items.",
+            operation="append_reserved",
+            collection=f"{reservation.dtype}_list",
+            key=reservation.name,
+        )
+    if not items:
+        return reservation.next_index
+    data = [
+        "append_reserved_items",
+        reservation.name,
+        reservation.dtype,
+        sorted(input_items) if isinstance(input_items, dict) else [],
+        process_name,
+        process_index,
+        reservation.next_index,
+        reservation.next_position,
+    ]
+    # no list lock: the slots are already ours
+    timestamp, _ = utils.get_new_timestamp(db, data)
+    first_index = append_reserved_items(
+        db,
+        timestamp,
+        reservation.name,
+        items,
+        process_name,
+        process_index,
+        input_items,
+        reservation.dtype,
+        reservation.next_index,
+        reservation.next_position,
+    )
+    reservation.next_index = end_index
+    reservation.next_position = end_position
+    if reservation.dtype == "embedding":
+        embedding_list = db.collection("embedding_list").get(reservation.name)
+        storage, keep_full_precision = embedding_storage.storage_mode(embedding_list)
+        n_dim = embedding_list["n_dim"]
+        for field in embedding_storage.indexed_fields(n_dim, storage, keep_full_precision):
+            vector_helper.add_vector_count(db, field, len(items))
+    return first_index
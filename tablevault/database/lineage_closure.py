@@ -0,0 +1,263 @@
+from typing import Any, Dict, List, Optional
+
+from arango.database import StandardDatabase
+from tablevault.database import snapshot
+
+
+def closure_entries(
+    db: StandardDatabase,
+    timestamp: int,
+    name: str,
+    rows: List[Dict[str, Any]],
+    exclude: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Closure documents for newly appended entries of ``name``.
+
+    Each row is ``{"index", "start", "end", "inputs": [{"name", "start", "end"}]}``. An entry
+    inherits every closure entry of its inputs that overlaps the input range, one level deeper.
+    Lineage through the list ``exclude`` is left out.
+    """
+    aql = r"""
+    FOR r IN @rows
+      LET entries = FLATTEN(
+        FOR inp IN r.inputs
+          FILTER inp.name != @exclude
+          LET direct = [{
+            ancestor: inp.name,
+            ancestor_collection: DOCUMENT("items", inp.name).collection,
+            ancestor_start: inp.start,
+            ancestor_end: inp.end,
+            depth: 1
+          }]
+          LET inherited = (
+            FOR c IN lineage_closure
+              FILTER c.name == inp.name
+                AND c.start_position < inp.end
+                AND c.end_position > inp.start
+                AND c.ancestor != @exclude
+              RETURN {
+                ancestor: c.ancestor,
+                ancestor_collection: c.ancestor_collection,
+                ancestor_start: c.ancestor_start,
+                ancestor_end: c.ancestor_end,
+                depth: c.depth + 1
+              }
+          )
+          RETURN APPEND(direct, inherited)
+      )
+      FOR a IN entries
+        COLLECT
+          idx = r.index,
+          start = r.start,
+          end = r.end,
+          ancestor = a.ancestor,
+          ancestorCollection = a.ancestor_collection,
+          ancestorStart = a.ancestor_start,
+          ancestorEnd = a.ancestor_end
+        AGGREGATE depth = MIN(a.depth)
+        RETURN {
+          name: @name,
+          index: idx,
+          start_position: start,
+          end_position: end,
+          ancestor: ancestor,
+          ancestor_collection: ancestorCollection,
+          ancestor_start: ancestorStart,
+          ancestor_end: ancestorEnd,
+          depth: depth,
+          timestamp: @ts
+        }
+    """
+    rows = [r for r in rows if r["inputs"]]
+    if not rows:
+        return []
+    bind_vars = {"rows": rows, "name": name, "ts": timestamp, "exclude": exclude}
+    return list(db.aql.execute(aql, bind_vars=bind_vars))
+
+
+def closure_row(
+    index: int,
+    start_position: int,
+    end_position: int,
+    input_items: Optional[Dict[str, List[int]]],
+) -> Dict[str, Any]:
+    return {
+        "index": index,
+        "start": start_position,
+        "end": end_position,
+        "inputs": [
+            {"name": itm_name, "start": positions[0], "end": positions[1]}
+            for itm_name, positions in (input_items or {}).items()
+        ],
+    }
+
+
+def remove_closure_entries(
+    db: StandardDatabase,
+    name: str,
+    timestamp: Optional[int] = None,
+    min_index: int = 0,
+) -> None:
+    """Remove closure entries of ``name``; restricted to one operation when ``timestamp`` is set."""
+    aql = r"""
+    FOR c IN lineage_closure
+      FILTER c.name == @name
+      FILTER @ts == null OR (c.timestamp == @ts AND c.index >= @minIndex)
+      REMOVE c IN lineage_closure
+    """
+    bind_vars = {"name": name, "ts": timestamp, "minIndex": min_index}
+    db.aql.execute(aql, bind_vars=bind_vars)
+
+
+def remove_ancestor(db: StandardDatabase, name: str) -> None:
+    """
+    Drop the deleted list ``name`` from the closure.
+
+    Entries that have ``name`` as an ancestor may also have inherited other ancestors through
+    it, so their closure is rebuilt from their remaining direct inputs. Entries are rebuilt in
+    timestamp order, the order they were written in, so every entry inherits from inputs that
+    are already rebuilt. Each rebuilt entry stops referencing ``name``, which makes an
+    interrupted run safe to repeat.
+    """
+    affected = list(
+        db.aql.execute(
+            r"""
+            LET affected = (
+              FOR c IN lineage_closure
+                FILTER c.ancestor == @name AND c.name != @name
+                COLLECT entryName = c.name, idx = c.index
+                RETURN [entryName, idx]
+            )
+            FOR a IN affected
+              LET rows = (
+                FOR c IN lineage_closure
+                  FILTER c.name == a[0] AND c.index == a[1]
+                  RETURN c
+              )
+              SORT rows[0].timestamp ASC
+              RETURN {
+                name: a[0],
+                timestamp: rows[0].timestamp,
+                row: {
+                  index: a[1],
+                  start: rows[0].start_position,
+                  end: rows[0].end_position,
+                  inputs: rows[* FILTER CURRENT.depth == 1 RETURN {
+                    name: CURRENT.ancestor,
+                    start: CURRENT.ancestor_start,
+                    end: CURRENT.ancestor_end
+                  }]
+                }
+              }
+            """,
+            bind_vars={"name": name},
+        )
+    )
+    groups: Dict[Any, List[Dict[str, Any]]] = {}
+    for entry in affected:
+        groups.setdefault((entry["timestamp"], entry["name"]), []).append(entry["row"])
+    replace = r"""
+    LET rm = (
+      FOR c IN lineage_closure
+        FILTER c.name == @name AND c.index IN @indices
+        REMOVE c IN lineage_closure
+        RETURN 1
+    )
+    FOR d IN @docs
+      INSERT d INTO lineage_closure
+    """
+    for (timestamp, entry_name), rows in groups.items():
+        docs = closure_entries(db, timestamp, entry_name, rows, exclude=name)
+        bind_vars = {
+            "name": entry_name,
+            "indices": [r["index"] for r in rows],
+            "docs": docs,
+        }
+        db.aql.execute(replace, bind_vars=bind_vars)
+    db.aql.execute(
+        r"""
+        FOR c IN lineage_closure
+          FILTER c.name == @name OR c.ancestor == @name
+          REMOVE c IN lineage_closure
+        """,
+        bind_vars={"name": name},
+    )
+
+
+def _merge_intervals(rows: List[List[Any]]) -> List[List[Any]]:
+    # rows: [collection, name, start, end, depth] sorted by name, start
+    merged: List[List[Any]] = []
+    for collection, item_name, start, end, depth in rows:
+        last = merged[-1] if merged else None
+        if last is not None and last[1] == item_name:
+            intervals = last[2]
+            if start <= intervals[-1][1]:
+                intervals[-1][1] = max(intervals[-1][1], end)
+            else:
+                intervals.append([start, end])
+            last[3] = min(last[3], depth)
+        else:
+            merged.append([collection, item_name, [[start, end]], depth])
+    return merged
+
+
+def query_upstream(
+    db: StandardDatabase,
+    name: str,
+    start_position: Optional[int] = None,
+    end_position: Optional[int] = None,
+    collections: Optional[List[str]] = None,
+    as_of: Optional[int] = None,
+) -> List[List[Any]]:
+    aql = r"""
+    FOR c IN lineage_closure
+      FILTER c.name == @name
+      FILTER (@qEnd == null OR c.start_position < @qEnd)
+        AND (@qStart == null OR c.end_position > @qStart)
+      FILTER LENGTH(@collections) == 0 OR c.ancestor_collection IN @collections
+      FILTER __VISIBLE(c)__
+      SORT c.ancestor ASC, c.ancestor_start ASC
+      RETURN [c.ancestor_collection, c.ancestor, c.ancestor_start, c.ancestor_end, c.depth]
+    """
+    bind_vars = {
+        "name": name,
+        "qStart": start_position,
+        "qEnd": end_position,
+        "collections": collections or [],
+    }
+    snapshot.bind_as_of(db, as_of, bind_vars)
+    return _merge_intervals(
+        list(db.aql.execute(snapshot.apply(aql), bind_vars=bind_vars))
+    )
+
+
+def query_downstream(
+    db: StandardDatabase,
+    name: str,
+    start_position: Optional[int] = None,
+    end_position: Optional[int] = None,
+    collections: Optional[List[str]] = None,
+    as_of: Optional[int] = None,
+) -> List[List[Any]]:
+    aql = r"""
+    FOR c IN lineage_closure
+      FILTER c.ancestor == @name
+      FILTER (@qEnd == null OR c.ancestor_start < @qEnd)
+        AND (@qStart == null OR c.ancestor_end > @qStart)
+      LET coll = DOCUMENT("items", c.name).collection
+      FILTER LENGTH(@collections) == 0 OR coll IN @collections
+      FILTER __VISIBLE(c)__
+      SORT c.name ASC, c.start_position ASC
+      RETURN [coll, c.name, c.start_position, c.end_position, c.depth]
+    """
+    bind_vars = {
+        "name": name,
+        "qStart": start_position,
+        "qEnd": end_position,
+        "collections": collections or [],
+    }
+    snapshot.bind_as_of(db, as_of, bind_vars)
+    return _merge_intervals(
+        list(db.aql.execute(snapshot.apply(aql), bind_vars=bind_vars))
+    )
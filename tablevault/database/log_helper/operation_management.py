@@ -1,7 +1,8 @@
-from typing import Any, Callable, Dict, TypeVar
+from typing import Any, Callable, Dict, List, Optional, TypeVar
 
 from arango.database import StandardDatabase
 
+from tablevault.database import lineage_closure
 from tablevault.database.log_helper import utils
 import functools
 import sys
@@ -9,8 +10,33 @@ import sys
 F = TypeVar("F", bound=Callable[..., Any])
 
 
-def add_description_reverse(db: StandardDatabase, timestamp: int) -> None:
-    _, op_info = utils.get_timestamp_info(db, timestamp)
+def _op_info(
+    db: StandardDatabase, timestamp: int, op_info: Optional[List[Any]]
+) -> Optional[List[Any]]:
+    """Operation info of an active timestamp; recovery passes it in to skip the read."""
+    if op_info is not None:
+        return op_info
+    info = utils.get_timestamp_info(db, timestamp)
+    return None if info is None else info[1]
+
+
+def _finish(
+    db: StandardDatabase, timestamp: int, commits: Optional[Dict[int, str]], status: str
+) -> None:
+    """Commit ``timestamp`` now, or record its status in ``commits`` for a batched commit."""
+    if commits is None:
+        utils.commit_new_timestamp(db, timestamp, status)
+    else:
+        commits[timestamp] = status
+
+
+def add_description_reverse(
+    db: StandardDatabase,
+    timestamp: int,
+    op_info: Optional[List[Any]] = None,
+    commits: Optional[Dict[int, str]] = None,
+) -> None:
+    op_info = _op_info(db, timestamp, op_info)
     if op_info is None:
         return
     name = op_info[1]
@@ -27,11 +53,16 @@ def add_description_reverse(db: StandardDatabase, timestamp: int) -> None:
     edge.delete(str(timestamp), ignore_missing=True)
     process_edge = db.collection("process_parent_edge")
     process_edge.delete(str(timestamp), ignore_missing=True)
-    utils.commit_new_timestamp(db, timestamp, "failed")
+    _finish(db, timestamp, commits, "failed")
 
 
-def create_item_reverse(db: StandardDatabase, timestamp: int) -> None:
-    _, op_info = utils.get_timestamp_info(db, timestamp)
+def create_item_reverse(
+    db: StandardDatabase,
+    timestamp: int,
+    op_info: Optional[List[Any]] = None,
+    commits: Optional[Dict[int, str]] = None,
+) -> None:
+    op_info = _op_info(db, timestamp, op_info)
     if op_info is None:
         return
     name = op_info[1]
@@ -39,18 +70,23 @@ def create_item_reverse(db: StandardDatabase, timestamp: int) -> None:
     items = db.collection("items")
     doc = items.get(name)
     if doc is None or int(doc["timestamp"]) != int(timestamp):
-        utils.commit_new_timestamp(db, timestamp, "failed")
+        _finish(db, timestamp, commits, "failed")
         return
     items.delete(name, ignore_missing=True)
     coll = db.collection(collection_type)
     coll.delete(name, ignore_missing=True)
     process_edge = db.collection("process_parent_edge")
     process_edge.delete(str(timestamp), ignore_missing=True)
-    utils.commit_new_timestamp(db, timestamp, "failed")
+    _finish(db, timestamp, commits, "failed")
 
 
-def append_item_reverse(db: StandardDatabase, timestamp: int) -> None:
-    _, op_info = utils.get_timestamp_info(db, timestamp)
+def append_item_reverse(
+    db: StandardDatabase,
+    timestamp: int,
+    op_info: Optional[List[Any]] = None,
+    commits: Optional[Dict[int, str]] = None,
+) -> None:
+    op_info = _op_info(db, timestamp, op_info)
     if op_info is None:
         return
     name = op_info[1]
@@ -62,12 +98,12 @@ def append_item_reverse(db: StandardDatabase, timestamp: int) -> None:
     items = db.collection("items")
     doc = items.get(name)
     if doc is None or int(doc["timestamp"]) != int(timestamp):
-        utils.commit_new_timestamp(db, timestamp, "failed")
+        _finish(db, timestamp, commits, "failed")
         return
     collection = db.collection(dtype)
     doc = items.get(f"{name}_{n_items}")
     if doc is None or int(doc["timestamp"]) != int(timestamp):
-        utils.commit_new_timestamp(db, timestamp, "failed")
+        _finish(db, timestamp, commits, "failed")
         return
     collection.delete(f"{name}_{n_items}", ignore_missing=True)
     parent = db.collection("parent_edge")
@@ -77,17 +113,153 @@ def append_item_reverse(db: StandardDatabase, timestamp: int) -> None:
     edge = db.collection("dependency_edge")
     for itm in input_items:
         edge.delete(f"{timestamp}_{itm}", ignore_missing=True)
+    lineage_closure.remove_closure_entries(db, name, timestamp, n_items)
+    list_collection = db.collection(f"{dtype}_list")
+    itm = list_collection.get(name)
+    itm["n_items"] = n_items
+    itm["length"] = length
+    list_collection.update(itm)
+    _finish(db, timestamp, commits, "reverse_failed")
+
+
+def _remove_appended_items(
+    db: StandardDatabase, dtype: str, name: str, timestamp: int, n_items: int
+) -> None:
+    aql = r"""
+    LET removed = (
+      FOR v IN @@col
+        FILTER v.name == @name AND v.timestamp == @ts AND v.index >= @nItems
+        REMOVE v IN @@col
+        RETURN OLD._id
+    )
+    LET rmParent = (
+      FOR e IN parent_edge
+        FILTER e._to IN removed
+        REMOVE e IN parent_edge
+        RETURN 1
+    )
+    LET rmProcess = (
+      FOR e IN process_parent_edge
+        FILTER e._to IN removed
+        REMOVE e IN process_parent_edge
+        RETURN 1
+    )
+    LET rmDep = (
+      FOR e IN dependency_edge
+        FILTER e._to IN removed
+        REMOVE e IN dependency_edge
+        RETURN 1
+    )
+    RETURN LENGTH(removed)
+    """
+    bind_vars = {"@col": dtype, "name": name, "ts": timestamp, "nItems": n_items}
+    db.aql.execute(aql, bind_vars=bind_vars)
+    lineage_closure.remove_closure_entries(db, name, timestamp, n_items)
+
+
+def _truncate_list(
+    db: StandardDatabase,
+    timestamp: int,
+    name: str,
+    dtype: str,
+    n_items: int,
+    length: int,
+) -> None:
+    _remove_appended_items(db, dtype, name, timestamp, n_items)
     list_collection = db.collection(f"{dtype}_list")
     itm = list_collection.get(name)
     itm["n_items"] = n_items
     itm["length"] = length
     list_collection.update(itm)
-    utils.commit_new_timestamp(db, timestamp, "reverse_failed")
 
 
-FUNCTION_REVERSE_MAP: Dict[str, Callable[[StandardDatabase, int], None]] = {
+def append_items_reverse(
+    db: StandardDatabase,
+    timestamp: int,
+    op_info: Optional[List[Any]] = None,
+    commits: Optional[Dict[int, str]] = None,
+) -> None:
+    op_info = _op_info(db, timestamp, op_info)
+    if op_info is None:
+        return
+    name = op_info[1]
+    dtype = op_info[2]
+    n_items = op_info[6]
+    length = op_info[7]
+
+    items = db.collection("items")
+    doc = items.get(name)
+    if doc is None or int(doc["timestamp"]) != int(timestamp):
+        _finish(db, timestamp, commits, "failed")
+        return
+    _truncate_list(db, timestamp, name, dtype, n_items, length)
+    _finish(db, timestamp, commits, "reverse_failed")
+
+
+def import_items_reverse(
+    db: StandardDatabase,
+    timestamp: int,
+    op_info: Optional[List[Any]] = None,
+    commits: Optional[Dict[int, str]] = None,
+) -> None:
+    # keeps every chunk recorded in import_progress; the import resumes after them
+    op_info = _op_info(db, timestamp, op_info)
+    if op_info is None:
+        return
+    name = op_info[1]
+    dtype = op_info[2]
+    n_items = op_info[6]
+    length = op_info[7]
+
+    items = db.collection("items")
+    doc = items.get(name)
+    if doc is None or int(doc["timestamp"]) != int(timestamp):
+        _finish(db, timestamp, commits, "failed")
+        return
+    progress = db.collection("import_progress").get(name)
+    if progress is not None and int(progress["timestamp"]) == int(timestamp):
+        n_items = progress["n_items"]
+        length = progress["length"]
+    _truncate_list(db, timestamp, name, dtype, n_items, length)
+    _finish(db, timestamp, commits, "reverse_failed")
+
+
+def reserve_block_reverse(
+    db: StandardDatabase,
+    timestamp: int,
+    op_info: Optional[List[Any]] = None,
+    commits: Optional[Dict[int, str]] = None,
+) -> None:
+    # a reservation that may have been recorded is left as a gap; nothing else was written
+    if _op_info(db, timestamp, op_info) is None:
+        return
+    _finish(db, timestamp, commits, "reverse_failed")
+
+
+def append_reserved_items_reverse(
+    db: StandardDatabase,
+    timestamp: int,
+    op_info: Optional[List[Any]] = None,
+    commits: Optional[Dict[int, str]] = None,
+) -> None:
+    # no list lock to check: the slots belong to this writer's reservation
+    op_info = _op_info(db, timestamp, op_info)
+    if op_info is None:
+        return
+    name = op_info[1]
+    dtype = op_info[2]
+    index = op_info[6]
+    _remove_appended_items(db, dtype, name, timestamp, index)
+    _finish(db, timestamp, commits, "reverse_failed")
+
+
+FUNCTION_REVERSE_MAP: Dict[str, Callable[..., None]] = {
     "create_item_list": create_item_reverse,
     "append_item": append_item_reverse,
+    "append_items": append_items_reverse,
+    "import_items": import_items_reverse,
+    "reserve_block": reserve_block_reverse,
+    "append_reserved_items": append_reserved_items_reverse,
     "add_description_inner": add_description_reverse,
 }
 
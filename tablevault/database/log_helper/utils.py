@@ -1,6 +1,8 @@
 # ADD LOGS
 from arango.database import StandardDatabase
 from arango.exceptions import ArangoError
+from contextvars import ContextVar
+import threading
 import time
 from typing import Any, Dict, List, Optional, Tuple, Union
 from tablevault.database.log_helper import log_manager
@@ -11,6 +13,36 @@ from tablevault.utils.errors import (
     NotFoundError,
 )
 
+# serializes this process's read-modify-write cycles on the metadata document, so threads
+# queue locally instead of failing each other's revision checks and backing off; other
+# processes are still arbitrated by the revision check
+_metadata_lock = threading.Lock()
+
+# worker id of the VaultWorker whose call is running (see tablevault.process.worker)
+current_worker: ContextVar[Optional[str]] = ContextVar("tablevault_worker", default=None)
+
+
+def process_edge(
+    timestamp: int,
+    process_name: str,
+    process_index: int,
+    to: str,
+    key: Optional[str] = None,
+) -> Dict[str, Any]:
+    """Build a process_parent_edge document, attributed to the calling worker if any."""
+    doc: Dict[str, Any] = {
+        "timestamp": timestamp,
+        "index": process_index,
+        "_from": f"process_list/{process_name}",
+        "_to": to,
+    }
+    if key is not None:
+        doc["_key"] = key
+    worker_id = current_worker.get()
+    if worker_id is not None:
+        doc["worker_id"] = worker_id
+    return doc
+
 
 def guarded_upsert(
     db: StandardDatabase,
@@ -72,6 +104,48 @@ def guarded_upsert(
         raise
 
 
+def guarded_bump(db: StandardDatabase, name: str, guard_rev: str) -> str:
+    aql = r"""
+    FOR i IN items
+      FILTER i._key == @name
+      UPDATE { _key: @name, _rev: @guardRev }
+        WITH { version: @now }
+      IN items
+      OPTIONS { ignoreRevs: false }
+      RETURN NEW._rev
+    """
+    bind_vars = {"name": name, "guardRev": guard_rev, "now": time.time()}
+    try:
+        out = next(db.aql.execute(aql, bind_vars=bind_vars), None)
+    except ArangoError:
+        out = None
+    if out is None:
+        raise ConflictError(
+            f"Guard check failed for item '{name}' at rev '{guard_rev}' (possible revision mismatch).",
+            operation="guarded_bump",
+            collection="items",
+            key=name,
+        )
+    return out
+
+
+def guarded_import(
+    db: StandardDatabase,
+    name: str,
+    guard_rev: Optional[str],
+    target_col: str,
+    docs: List[Dict[str, Any]],
+) -> Optional[str]:
+    """Bulk import documents after confirming the item lock is still held at ``guard_rev``."""
+    if guard_rev is not None:
+        guard_rev = guarded_bump(db, name, guard_rev)
+    if docs:
+        db.collection(target_col).import_bulk(
+            docs, halt_on_error=True, on_duplicate="replace"
+        )
+    return guard_rev
+
+
 def add_item_name(
     db: StandardDatabase, item_name: str, item_type: str, timestamp: int
 ) -> str:
@@ -191,19 +265,21 @@ def get_new_timestamp(
     success = False
     data = [] if data is None else list(data)
     while timeout is None or end - start < timeout:
-        doc = metadata.get("global")
-        ts = doc["new_timestamp"]
-        key = str(ts)
-        doc["active_timestamps"][key] = ["start", time.time(), data]
-        doc["new_timestamp"] = ts + 1
-        log_file = doc["log_file"]
-        try:
-            log_manager.log_tuple(log_file, doc["active_timestamps"][key])
-            metadata.update(doc, check_rev=True, merge=False)
-            success = True
-            break
-        except ArangoError:
-            time.sleep(wait_time)
+        with _metadata_lock:
+            doc = metadata.get("global")
+            ts = doc["new_timestamp"]
+            key = str(ts)
+            doc["active_timestamps"][key] = ["start", time.time(), data]
+            doc["new_timestamp"] = ts + 1
+            log_file = doc["log_file"]
+            try:
+                log_manager.log_tuple(log_file, doc["active_timestamps"][key])
+                metadata.update(doc, check_rev=True, merge=False)
+                success = True
+                break
+            except ArangoError:
+                pass
+        time.sleep(wait_time)
         end = time.time()
     if not success:
         raise LockTimeoutError(
@@ -235,15 +311,17 @@ def update_timestamp_info(
     key = str(timestamp)
     data = [] if data is None else list(data)
     while timeout is None or end - start < timeout:
-        doc = metadata.get("global")
-        doc["active_timestamps"][key] = ["update", time.time(), data]
-        log_file = doc["log_file"]
-        try:
-            log_manager.log_tuple(log_file, doc["active_timestamps"][key])
-            metadata.update(doc, check_rev=True, merge=False)
-            return
-        except ArangoError:
-            time.sleep(wait_time)
+        with _metadata_lock:
+            doc = metadata.get("global")
+            doc["active_timestamps"][key] = ["update", time.time(), data]
+            log_file = doc["log_file"]
+            try:
+                log_manager.log_tuple(log_file, doc["active_timestamps"][key])
+                metadata.update(doc, check_rev=True, merge=False)
+                return
+            except ArangoError:
+                pass
+        time.sleep(wait_time)
         end = time.time()
     raise LockTimeoutError(
         f"Could not update timestamp information for {timestamp} within {timeout}s.",
@@ -267,19 +345,21 @@ def commit_new_timestamp(
     log_file = doc["log_file"]
     key = str(timestamp)
     while timeout is None or end - start < timeout:
-        doc = metadata.get("global")
-        data = None
-        if key in doc["active_timestamps"]:
-            data = doc["active_timestamps"][key]
-            data[0] = status
-            del doc["active_timestamps"][key]  #
-        try:
-            if data is not None:
-                log_manager.log_tuple(log_file, data)
-            metadata.update(doc, check_rev=True, merge=False)
-            return True
-        except ArangoError:
-            time.sleep(wait_time)
+        with _metadata_lock:
+            doc = metadata.get("global")
+            data = None
+            if key in doc["active_timestamps"]:
+                data = doc["active_timestamps"][key]
+                data[0] = status
+                del doc["active_timestamps"][key]  #
+            try:
+                if data is not None:
+                    log_manager.log_tuple(log_file, data)
+                metadata.update(doc, check_rev=True, merge=False)
+                return True
+            except ArangoError:
+                pass
+        time.sleep(wait_time)
         end = time.time()
     raise LockTimeoutError(
         f"Could not commit timestamp {timestamp} with status '{status}' within {timeout or 'unbounded'}s.",
@@ -289,6 +369,70 @@ def commit_new_timestamp(
     )
 
 
+def commit_timestamps(
+    db: StandardDatabase,
+    statuses: Dict[int, str],
+    wait_time: float = 0.1,
+    timeout: Optional[float] = None,
+) -> None:
+    """Commit several timestamps in one metadata write (see ``commit_new_timestamp``)."""
+    if not statuses:
+        return
+    metadata = db.collection("metadata")
+    start = time.time()
+    end = time.time()
+    while timeout is None or end - start < timeout:
+        with _metadata_lock:
+            doc = metadata.get("global")
+            log_file = doc["log_file"]
+            entries = []
+            for timestamp, status in statuses.items():
+                data = doc["active_timestamps"].pop(str(timestamp), None)
+                if data is not None:
+                    data[0] = status
+                    entries.append(data)
+            try:
+                for data in entries:
+                    log_manager.log_tuple(log_file, data)
+                metadata.update(doc, check_rev=True, merge=False)
+                return
+            except ArangoError:
+                pass
+        time.sleep(wait_time)
+        end = time.time()
+    raise LockTimeoutError(
+        f"Could not commit {len(statuses)} timestamps within {timeout or 'unbounded'}s.",
+        operation="commit_timestamps",
+        collection="metadata",
+    )
+
+
+def get_stale_timestamps(
+    db: StandardDatabase,
+    cutoff: float,
+    selected_timestamps: Optional[List[int]] = None,
+) -> List[Tuple[int, List[Any]]]:
+    """
+    ``(timestamp, op_info)`` of active operations last updated before ``cutoff``, oldest first.
+
+    The filter runs on the server, so only the stale entries of the active map are transferred.
+    """
+    aql = r"""
+    LET active = DOCUMENT("metadata", "global").active_timestamps
+    FOR k IN ATTRIBUTES(active)
+      LET entry = active[k]
+      FILTER entry[1] < @cutoff
+      FILTER @selected == null OR k IN @selected
+      SORT TO_NUMBER(k) ASC
+      RETURN [TO_NUMBER(k), entry[2]]
+    """
+    selected = None
+    if selected_timestamps is not None:
+        selected = [str(ts) for ts in selected_timestamps]
+    rows = db.aql.execute(aql, bind_vars={"cutoff": cutoff, "selected": selected})
+    return [(int(ts), op_info) for ts, op_info in rows]
+
+
 def get_timestamp_info(
     db: StandardDatabase, timestamp: Optional[int] = None
 ) -> Union[Optional[List[Any]], Dict[str, List[Any]]]:
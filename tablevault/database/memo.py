@@ -0,0 +1,183 @@
+import hashlib
+import inspect
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from arango.database import StandardDatabase
+
+from tablevault.database import process_collection
+from tablevault.utils.errors import NotFoundError, ValidationError
+
+
+def function_source(fn: Callable[..., Any]) -> str:
+    """Source text of ``fn``; bytecode and constants when the source is unavailable."""
+    try:
+        return inspect.getsource(fn)
+    except (OSError, TypeError):
+        code = getattr(fn, "__code__", None)
+        if code is None:
+            raise ValidationError(
+                f"Cannot fingerprint {fn!r}: no source or bytecode available.",
+                operation="memoize",
+            ) from None
+        return f"{fn.__qualname__}\n{code.co_code.hex()}\n{code.co_consts!r}"
+
+
+def input_fingerprint(
+    db: StandardDatabase, inputs: Dict[str, List[int]]
+) -> List[List[Any]]:
+    """
+    ``[name, [[index, rev], ...]]`` of the items overlapping each input range.
+
+    Document revisions change whenever an item is rewritten, so the fingerprint changes with
+    the content of the range, not only with its bounds.
+    """
+    aql = r"""
+    FOR inp IN @inputs
+      LET itm = DOCUMENT("items", inp[0])
+      LET items = itm == null ? null : (
+        FOR v, e IN 1..1 OUTBOUND CONCAT(itm.collection, "/", inp[0]) parent_edge
+          FILTER e.start_position < inp[2] AND e.end_position > inp[1]
+          SORT v.index ASC
+          RETURN [v.index, v._rev]
+      )
+      RETURN [inp[0], items]
+    """
+    rows = [[name, rng[0], rng[1]] for name, rng in sorted(inputs.items())]
+    fingerprint = list(db.aql.execute(aql, bind_vars={"inputs": rows}))
+    for name, items in fingerprint:
+        if items is None:
+            raise NotFoundError(
+                f"Item list '{name}' does not exist.",
+                operation="memoize",
+                collection="items",
+                key=name,
+            )
+    return fingerprint
+
+
+def _digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _canonical(value: Any) -> Any:
+    """
+    JSON-encodable stand-in for an argument that identifies it by content.
+
+    Arrays and pandas objects are keyed by dtype, shape and a hash of their data; their
+    ``repr`` elides large contents, so it cannot tell two such arguments apart.
+    """
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if isinstance(value, dict):
+        return sorted([type(k).__name__, str(k), _canonical(v)] for k, v in value.items())
+    if isinstance(value, (bytes, bytearray)):
+        return ["bytes", _digest(bytes(value))]
+    if type(value).__module__.split(".")[0] == "pandas" and hasattr(value, "dtypes"):
+        from pandas.util import hash_pandas_object  # installed, since value is a pandas object
+
+        hashed = hash_pandas_object(value, index=True).to_numpy()
+        columns = list(getattr(value, "columns", [getattr(value, "name", None)]))
+        return [
+            type(value).__name__,
+            _canonical([str(c) for c in columns]),
+            str(value.dtypes.to_dict() if hasattr(value.dtypes, "to_dict") else value.dtypes),
+            _digest(hashed.tobytes()),
+        ]
+    dtype = getattr(value, "dtype", None)
+    if dtype is not None and hasattr(value, "tobytes") and hasattr(value, "shape"):
+        if dtype.hasobject:
+            return ["ndarray", str(dtype), list(value.shape), _canonical(value.tolist())]
+        return ["ndarray", str(dtype), list(value.shape), _digest(value.tobytes())]
+    raise ValidationError(
+        f"Cannot memoize on an argument of type {type(value).__qualname__}; pass JSON values, "
+        "bytes, numpy arrays or pandas objects.",
+        operation="memoize",
+    )
+
+
+def memo_key(code_hash: str, inputs: Dict[str, List[int]], fingerprint: Any, call: Any) -> str:
+    payload = json.dumps(
+        [code_hash, sorted(inputs.items()), fingerprint, _canonical(call)],
+        sort_keys=True,
+    )
+    return _digest(payload.encode("utf-8"))
+
+
+def _list_sizes(db: StandardDatabase, outputs: Sequence[str]) -> Dict[str, List[int]]:
+    sizes: Dict[str, List[int]] = {}
+    for name in outputs:
+        itm = db.collection("items").get(name)
+        item_list = None if itm is None else db.collection(itm["collection"]).get(name)
+        if item_list is None or item_list.get("deleted", -1) != -1:
+            raise NotFoundError(
+                f"Output list '{name}' does not exist.",
+                operation="memoize",
+                collection="items",
+                key=name,
+            )
+        sizes[name] = [item_list["n_items"], item_list["length"]]
+    return sizes
+
+
+def _outputs_intact(db: StandardDatabase, outputs: Dict[str, List[int]]) -> bool:
+    """Outputs of a memo hit must still be present (lists not deleted or truncated)."""
+    try:
+        sizes = _list_sizes(db, list(outputs))
+    except NotFoundError:
+        return False
+    return all(sizes[name][0] >= rng[1] for name, rng in outputs.items())
+
+
+def memoize(
+    db: StandardDatabase,
+    fn: Callable[..., Any],
+    inputs: Optional[Dict[str, List[int]]],
+    outputs: Optional[Sequence[str]],
+    args: Sequence[Any],
+    kwargs: Dict[str, Any],
+    process_name: str,
+    process_index: int,
+) -> Any:
+    inputs = dict(inputs or {})
+    outputs = list(outputs or [])
+    code_hash = process_collection.store_code(db, function_source(fn))
+    fingerprint = input_fingerprint(db, inputs)
+    key = memo_key(code_hash, inputs, fingerprint, [list(args), kwargs])
+    memos = db.collection("memo")
+    hit = memos.get(key)
+    if hit is not None and sorted(hit["outputs"]) == sorted(outputs):
+        if _outputs_intact(db, hit["outputs"]):
+            return hit["value"]
+
+    before = _list_sizes(db, outputs)
+    value = fn(*args, **kwargs)
+    try:
+        json.dumps(value)
+    except (TypeError, ValueError):
+        raise ValidationError(
+            f"Memoized function {fn.__qualname__} returned a value that is not JSON-serializable.",
+            operation="memoize",
+            collection="memo",
+            key=key,
+        ) from None
+    after = _list_sizes(db, outputs)
+    doc = {
+        "_key": key,
+        "code_hash": code_hash,
+        "inputs": inputs,
+        # output list -> [first_index, end_index, start_position, end_position] written
+        "outputs": {
+            name: [before[name][0], after[name][0], before[name][1], after[name][1]]
+            for name in outputs
+        },
+        "value": value,
+        "process_name": process_name,
+        "process_index": process_index,
+        "created": time.time(),
+    }
+    memos.insert(doc, overwrite=True, silent=True)
+    return value
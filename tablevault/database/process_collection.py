@@ -1,7 +1,8 @@
 # Move to general items
 # double check conditions
 
-from typing import Optional
+from typing import Any, Callable, Dict, Optional
+import hashlib
 
 from arango.database import StandardDatabase
 
@@ -36,11 +37,44 @@ def create_process(
     )
 
 
+# AQL for the code of process cell ``v``: older cells keep their text inline
+CODE_TEXT = '(v.code_hash == null ? v.text : DOCUMENT("code_blob", v.code_hash).text)'
+
+
+def store_code(db: StandardDatabase, code: str) -> str:
+    """
+    Store ``code`` once in ``code_blob`` and return its key (the sha256 of the text).
+
+    Blobs are immutable and shared by every cell that ran the same code, so an existing blob
+    is left untouched and a blob orphaned by a failed append is harmless.
+    """
+    code_hash = hashlib.sha256(code.encode("utf-8")).hexdigest()
+    db.collection("code_blob").insert(
+        {"_key": code_hash, "text": code, "length": len(code)},
+        overwrite_mode="ignore",
+        silent=True,
+    )
+    return code_hash
+
+
+def get_code(db: StandardDatabase, item: Dict[str, Any]) -> str:
+    if item.get("code_hash") is None:
+        return item["text"]
+    return db.collection("code_blob").get(item["code_hash"])["text"]
+
+
 def process_add_code_start(
-    db: StandardDatabase, name: str, code: str, process_name: str, process_index: int
+    db: StandardDatabase,
+    name: str,
+    code: str,
+    process_name: str,
+    process_index: int,
+    index: Optional[int] = None,
 ) -> int:
     timestamp, itm = utils.get_new_timestamp(db, [], name)
     process_list = db.collection("process_list").get(name)
+    if index is None:
+        index = process_list["n_items"]
     data = [
         "append_item",
         name,
@@ -48,13 +82,13 @@ def process_add_code_start(
         {},
         process_name,
         process_index,
-        process_list["n_items"],
+        index,
         process_list["length"],
         "dtype"
     ]
     utils.update_timestamp_info(db, timestamp, data)
     code_doc = {
-        "text": code,
+        "code_hash": store_code(db, code),
         "status": "start",
         "error": "",
     }
@@ -68,7 +102,7 @@ def process_add_code_start(
         process_index,
         None,
         "process",
-        process_list["n_items"],
+        index,
         process_list["length"],
         process_list["length"] + len(code),
         itm["_rev"],
@@ -82,16 +116,31 @@ def process_add_code_end(
     index: int,
     error: str = "",
     timestamp: Optional[int] = None,
+    telemetry: Optional[Dict[str, Any]] = None,
 ) -> None:
     if timestamp is None:
         timestamp, item = utils.get_new_timestamp(
-            db, ["process_add_code_end", name, index, error], name
+            db, ["process_add_code_end", name, index, error, telemetry], name
         )
     process_code = db.collection("process")
-    code_doc = process_code.get(f"{name}_{index}")
-    code_doc["status"] = "complete"
-    code_doc["error"] = error
-    process_code.update(code_doc, check_rev=True, merge=False)
+    try:
+        code_doc = process_code.get(f"{name}_{index}")
+        if code_doc is None:
+            raise NotFoundError(
+                f"Cell {index} of process '{name}' was never recorded as started.",
+                operation="process_add_code_end",
+                collection="process",
+                key=f"{name}_{index}",
+            )
+        code_doc["status"] = "complete"
+        code_doc["error"] = error
+        if telemetry is not None:
+            code_doc["telemetry"] = telemetry
+        process_code.update(code_doc, check_rev=True, merge=False)
+    except Exception:
+        # release the list lock; nothing was written
+        utils.commit_new_timestamp(db, timestamp, "failed")
+        raise
     utils.commit_new_timestamp(db, timestamp)
 
 
@@ -181,12 +230,42 @@ def process_resume_request(
         utils.commit_new_timestamp(db, timestamp)
 
 
-def process_checkpoint(db: StandardDatabase, name: str) -> None:
-    process = db.collection("process_list")
-    doc = process.get({"_key": name})
-    if doc["interrupt_request"] != "":
-        p = psutil.Process(doc["pid"])
-        if doc["interrupt_action"] == "pause":
+def get_interrupt_state(db: StandardDatabase, name: str) -> Dict[str, Any]:
+    aql = r"""
+    LET doc = DOCUMENT("process_list", @name)
+    RETURN {
+      interrupt_request: doc.interrupt_request,
+      interrupt_action: doc.interrupt_action,
+      pid: doc.pid,
+      rev: doc._rev
+    }
+    """
+    return next(db.aql.execute(aql, bind_vars={"name": name}))
+
+
+def apply_interrupt(
+    state: Dict[str, Any], quiesce: Optional[Callable[[], None]] = None
+) -> bool:
+    """
+    Act on an interrupt state; returns True if the process was paused (and has resumed).
+
+    ``quiesce`` runs before the process is suspended or terminated. Suspending stops every
+    thread, so a background writer caught holding a list lock would keep it, and the
+    resume request, which needs the same lock, could never run.
+    """
+    if state["interrupt_request"] != "":
+        if quiesce is not None:
+            quiesce()
+        p = psutil.Process(state["pid"])
+        if state["interrupt_action"] == "pause":
             p.suspend()
-        elif doc["interrupt_action"] == "stop":
+            return True
+        elif state["interrupt_action"] == "stop":
             p.terminate()
+    return False
+
+
+def process_checkpoint(
+    db: StandardDatabase, name: str, quiesce: Optional[Callable[[], None]] = None
+) -> None:
+    apply_interrupt(get_interrupt_state(db, name), quiesce)
@@ -1,5 +1,9 @@
 from typing import Any, Dict, List, Optional
 
+from tablevault.database import embedding_storage
+from tablevault.database import snapshot
+from tablevault.utils.errors import ValidationError
+
 
 def query_process(
     db,
@@ -11,6 +15,7 @@ def query_process(
     k_text: int = 500,
     text_analyzer: str = "text_en",
     filtered: Optional[List[str]] = None,  # list of process.name strings
+    as_of: Optional[int] = None,
 ):
     filtered = filtered or []
 
@@ -35,24 +40,30 @@ def query_process(
 
     // --- Process candidates ---
     LET processCandidates = (useText && LENGTH(qTokens) > 0) ? (
-      FOR s IN process_view
-        SEARCH ANALYZER(s.text IN qTokens, @text_analyzer)
-
-        FILTER !hasFilter OR s.name IN filteredNames
+      FOR hit IN process_view
+        SEARCH ANALYZER(hit.text IN qTokens, @text_analyzer)
 
         // enforce AND over tokens (post-filter)
-        LET sTokens = TOKENS(s.text, @text_analyzer)
+        LET sTokens = TOKENS(hit.text, @text_analyzer)
         FILTER LENGTH(
           FOR t IN qTokens
             FILTER t IN sTokens
             RETURN 1
         ) == LENGTH(qTokens)
 
+        // a code_blob hit stands for every process cell that ran that code
+        FOR s IN IS_SAME_COLLECTION("code_blob", hit) ? (
+            FOR p IN process FILTER p.code_hash == hit._key RETURN p
+          ) : [hit]
+        FILTER !hasFilter OR s.name IN filteredNames
+        FILTER __VISIBLE(s)__
+
         LIMIT @k_text
         RETURN { _id: s._id, _key: s._key }
     ) : (
       FOR s IN process
         FILTER !hasFilter OR s.name IN filteredNames
+        FILTER __VISIBLE(s)__
         RETURN { _id: s._id, _key: s._key }
     )
 
@@ -60,6 +71,7 @@ def query_process(
     LET descVecCandidateIds = useDescVec ? (
       FOR d IN description
         FILTER d.collection == "process_list"
+        FILTER __VISIBLE(d)__
         LET score = COSINE_SIMILARITY(d.embedding, @e2)
         SORT score DESC
         LIMIT @k2
@@ -71,6 +83,7 @@ def query_process(
     LET descTxtCandidateIds = (useDescTxt && LENGTH(descQTokens) > 0) ? (
       FOR d IN description_view
         SEARCH ANALYZER(d.text IN descQTokens, @text_analyzer)
+        FILTER __VISIBLE(d)__
 
         LET dTokens = TOKENS(d.text, @text_analyzer)
         FILTER LENGTH(
@@ -87,16 +100,22 @@ def query_process(
 
     // --- Parent process candidates: token-AND text hits (optional) ---
     LET procCandidateIds = (useParent && LENGTH(parentQTokens) > 0) ? (
-      FOR s IN process_view
-        SEARCH ANALYZER(s.text IN parentQTokens, @text_analyzer)
+      FOR hit IN process_view
+        SEARCH ANALYZER(hit.text IN parentQTokens, @text_analyzer)
 
-        LET sTokens = TOKENS(s.text, @text_analyzer)
+        LET sTokens = TOKENS(hit.text, @text_analyzer)
         FILTER LENGTH(
           FOR t IN parentQTokens
             FILTER t IN sTokens
             RETURN 1
         ) == LENGTH(parentQTokens)
 
+        // a code_blob hit stands for every process cell that ran that code
+        FOR s IN IS_SAME_COLLECTION("code_blob", hit) ? (
+            FOR p IN process FILTER p.code_hash == hit._key RETURN p
+          ) : [hit]
+        FILTER __VISIBLE(s)__
+
         LIMIT @k_text
         RETURN s._id
     ) : []
@@ -140,7 +159,8 @@ def query_process(
         "filtered": filtered,
     }
 
-    return list(db.aql.execute(aql, bind_vars=bind_vars))
+    snapshot.bind_as_of(db, as_of, bind_vars)
+    return list(db.aql.execute(snapshot.apply(aql), bind_vars=bind_vars))
 
 
 def query_embedding(
@@ -155,6 +175,8 @@ def query_embedding(
     text_analyzer: str = "text_en",
     filtered: Optional[List[str]] = None,  # list of embedding.name strings
     use_approx: bool = True,  # NEW: toggle approx vs exact
+    rescore_k: int = 300,
+    as_of: Optional[int] = None,
 ):
     filtered = filtered or []
 
@@ -177,7 +199,16 @@ def query_embedding(
     LET hasFilter = LENGTH(filteredNames) > 0
 
     // --- Embedding candidates ---
-    LET embCandidates = useEmbVec ? (
+    // Lists stored as int8/binary are searched on their quantized codes and the
+    // best @rescore_k per mode are rescored at full precision; other lists use
+    // the full-precision field directly. int8 codes have their own vector
+    // index, so that stage is an approximate index lookup like the float path;
+    // binary codes are a few 32-bit words per vector, Hamming-scanned on the
+    // server. Both stages return ids only, and whole documents are read for
+    // the survivors.
+    LET quantNames = APPEND(@int8Names, @binaryNames)
+
+    LET legacyCandidates = (useEmbVec && @useLegacy) ? (
       FOR e IN embedding
         // safety checks
         FILTER HAS(e, @embedding_field)
@@ -187,12 +218,59 @@ def query_embedding(
         LET score = __SCORE_FN__(vec, @e1)
 
         FILTER !hasFilter OR e.name IN filteredNames
+        FILTER __VISIBLE(e)__
+        FILTER LENGTH(quantNames) == 0 OR e.name NOT IN quantNames
         SORT score DESC
         LIMIT @k1
         RETURN { _id: e._id, _key: e._key, score: score }
+    ) : []
+
+    LET int8Pool = (useEmbVec && LENGTH(@int8Names) > 0) ? (
+      FOR e IN embedding
+        FILTER e.name IN @int8Names
+        FILTER __VISIBLE(e)__
+        FILTER HAS(e, @int8_field)
+        LET codes = e[@int8_field]
+        SORT __SCORE_FN__(codes, @e1) DESC
+        LIMIT @rescore_k
+        RETURN e._id
+    ) : []
+
+    LET binaryPool = (useEmbVec && LENGTH(@binaryNames) > 0) ? (
+      FOR e IN embedding
+        FILTER e.name IN @binaryNames
+        FILTER __VISIBLE(e)__
+        FILTER HAS(e, @binary_field)
+        LET code = e[@binary_field]
+        LET dist = SUM(
+          FOR w IN 0..(LENGTH(@qBits) - 1)
+            RETURN BIT_POPCOUNT(BIT_XOR(code[w], @qBits[w]))
+        )
+        SORT dist ASC
+        LIMIT @rescore_k
+        RETURN e._id
+    ) : []
+
+    LET quantCandidates = (
+      FOR id IN APPEND(int8Pool, binaryPool)
+        LET e = DOCUMENT(id)
+        LET score = HAS(e, @embedding_field)
+          ? COSINE_SIMILARITY(e[@embedding_field], @e1)
+          : COSINE_SIMILARITY(e[@int8_field], @e1)
+        SORT score DESC
+        LIMIT @k1
+        RETURN { _id: e._id, _key: e._key, score: score }
+    )
+
+    LET embCandidates = useEmbVec ? (
+      FOR c IN APPEND(legacyCandidates, quantCandidates)
+        SORT c.score DESC
+        LIMIT @k1
+        RETURN c
     ) : (
       FOR e IN embedding
         FILTER !hasFilter OR e.name IN filteredNames
+        FILTER __VISIBLE(e)__
         RETURN { _id: e._id, _key: e._key }
     )
 
@@ -200,6 +278,7 @@ def query_embedding(
     LET descVecCandidateIds = useDescVec ? (
       FOR d IN description
         FILTER d.collection == "embedding_list"
+        FILTER __VISIBLE(d)__
         LET score = COSINE_SIMILARITY(d.embedding, @e2)
         SORT score DESC
         LIMIT @k2
@@ -211,6 +290,7 @@ def query_embedding(
     LET descTxtCandidateIds = (useDescTxt && LENGTH(descQTokens) > 0) ? (
       FOR d IN description_view
         SEARCH ANALYZER(d.text IN descQTokens, @text_analyzer)
+        FILTER __VISIBLE(d)__
 
         LET dTokens = TOKENS(d.text, @text_analyzer)
         FILTER LENGTH(
@@ -229,16 +309,22 @@ def query_embedding(
     LET qTokens = TOKENS(@t1, @text_analyzer)
 
     LET procCandidateIds = (useText && LENGTH(qTokens) > 0) ? (
-      FOR s IN process_view
-        SEARCH ANALYZER(s.text IN qTokens, @text_analyzer)
+      FOR hit IN process_view
+        SEARCH ANALYZER(hit.text IN qTokens, @text_analyzer)
 
-        LET sTokens = TOKENS(s.text, @text_analyzer)
+        LET sTokens = TOKENS(hit.text, @text_analyzer)
         FILTER LENGTH(
           FOR t IN qTokens
             FILTER t IN sTokens
             RETURN 1
         ) == LENGTH(qTokens)
 
+        // a code_blob hit stands for every process cell that ran that code
+        FOR s IN IS_SAME_COLLECTION("code_blob", hit) ? (
+            FOR p IN process FILTER p.code_hash == hit._key RETURN p
+          ) : [hit]
+        FILTER __VISIBLE(s)__
+
         LIMIT @k_text
         RETURN s._id
     ) : []
@@ -268,9 +354,26 @@ def query_embedding(
 
     embedding_field = None
     e1_list: List[float] = []
+    int8_names: List[str] = []
+    binary_names: List[str] = []
+    use_legacy = True
     if use_emb_vec:
         e1_list = list(embedding)
         embedding_field = f"embedding_{len(e1_list)}"  # e.g., embedding_16
+        quantized = db.aql.execute(
+            r"""
+            FOR l IN embedding_list
+              FILTER l.deleted == -1 AND l.n_dim == @n_dim
+              FILTER l.storage IN ["int8", "binary"]
+              FILTER @filtered == [] OR l.name IN @filtered
+              RETURN [l.name, l.storage]
+            """,
+            bind_vars={"n_dim": len(e1_list), "filtered": filtered},
+        )
+        for list_name, storage in quantized:
+            (int8_names if storage == "int8" else binary_names).append(list_name)
+        if filtered:
+            use_legacy = bool(set(filtered) - set(int8_names) - set(binary_names))
 
     bind_vars: Dict[str, Any] = {
         "useEmbVec": use_emb_vec,
@@ -288,10 +391,19 @@ def query_embedding(
         "text_analyzer": text_analyzer,
         "filtered": filtered,
         "embedding_field": embedding_field or "embedding_0",
+        "useLegacy": use_legacy,
+        "int8Names": int8_names,
+        "binaryNames": binary_names,
+        "int8_field": embedding_storage.int8_field(len(e1_list)),
+        "binary_field": embedding_storage.binary_field(len(e1_list)),
+        "qBits": embedding_storage.pack_binary(e1_list),
+        "rescore_k": rescore_k,
     }
 
+    snapshot.bind_as_of(db, as_of, bind_vars)
+
     def _run_query(score_fn: str) -> List[Any]:
-        aql = aql_template.replace("__SCORE_FN__", score_fn)
+        aql = snapshot.apply(aql_template.replace("__SCORE_FN__", score_fn))
         return list(db.aql.execute(aql, bind_vars=bind_vars))
 
     if not use_approx:
@@ -320,6 +432,7 @@ def query_record(
     k_text: int = 500,
     text_analyzer: str = "text_en",
     filtered: Optional[List[str]] = None,  # list of record.name strings
+    as_of: Optional[int] = None,
 ):
     filtered = filtered or []
 
@@ -347,6 +460,7 @@ def query_record(
         SEARCH ANALYZER(r.data_text IN qTokens, @text_analyzer)
 
         FILTER !hasFilter OR r.name IN filteredNames
+        FILTER __VISIBLE(r)__
 
         // enforce AND over tokens (post-filter)
         LET recordTokens = TOKENS(r.data_text, @text_analyzer)
@@ -361,6 +475,7 @@ def query_record(
     ) : (
       FOR r IN record
         FILTER !hasFilter OR r.name IN filteredNames
+        FILTER __VISIBLE(r)__
         RETURN { _id: r._id, _key: r._key }
     )
 
@@ -368,6 +483,7 @@ def query_record(
     LET descVecCandidateIds = useDescVec ? (
       FOR d IN description
         FILTER d.collection == "record_list"
+        FILTER __VISIBLE(d)__
         LET score = COSINE_SIMILARITY(d.embedding, @e2)
         SORT score DESC
         LIMIT @k2
@@ -379,6 +495,7 @@ def query_record(
     LET descTxtCandidateIds = (useDescTxt && LENGTH(descQTokens) > 0) ? (
       FOR d IN description_view
         SEARCH ANALYZER(d.text IN descQTokens, @text_analyzer)
+        FILTER __VISIBLE(d)__
 
         LET dTokens = TOKENS(d.text, @text_analyzer)
         FILTER LENGTH(
@@ -397,16 +514,22 @@ def query_record(
     LET procQTokens = TOKENS(@t2, @text_analyzer)
 
     LET procCandidateIds = (useText && LENGTH(procQTokens) > 0) ? (
-      FOR s IN process_view
-        SEARCH ANALYZER(s.text IN procQTokens, @text_analyzer)
+      FOR hit IN process_view
+        SEARCH ANALYZER(hit.text IN procQTokens, @text_analyzer)
 
-        LET sTokens = TOKENS(s.text, @text_analyzer)
+        LET sTokens = TOKENS(hit.text, @text_analyzer)
         FILTER LENGTH(
           FOR t IN procQTokens
             FILTER t IN sTokens
             RETURN 1
         ) == LENGTH(procQTokens)
 
+        // a code_blob hit stands for every process cell that ran that code
+        FOR s IN IS_SAME_COLLECTION("code_blob", hit) ? (
+            FOR p IN process FILTER p.code_hash == hit._key RETURN p
+          ) : [hit]
+        FILTER __VISIBLE(s)__
+
         LIMIT @k_text
         RETURN s._id
     ) : []
@@ -450,7 +573,8 @@ def query_record(
         "filtered": filtered,
     }
 
-    return list(db.aql.execute(aql, bind_vars=bind_vars))
+    snapshot.bind_as_of(db, as_of, bind_vars)
+    return list(db.aql.execute(snapshot.apply(aql), bind_vars=bind_vars))
 
 
 def query_document(
@@ -463,6 +587,7 @@ def query_document(
     k_text: int = 500,
     text_analyzer: str = "text_en",
     filtered: Optional[List[str]] = None,  # list of document.name strings
+    as_of: Optional[int] = None,
 ):
     filtered = filtered or []
 
@@ -493,6 +618,7 @@ def query_document(
         SEARCH ANALYZER(d.text IN qTokens, @text_analyzer)
 
         FILTER !hasFilter OR d.name IN filteredNames
+        FILTER __VISIBLE(d)__
 
         // enforce AND over tokens (post-filter)
         LET docTokens = TOKENS(d.text, @text_analyzer)
@@ -508,6 +634,7 @@ def query_document(
       // simplest: scan base collection
       FOR d IN document
         FILTER !hasFilter OR d.name IN filteredNames
+        FILTER __VISIBLE(d)__
         RETURN { _id: d._id, _key: d._key }
     )
 
@@ -515,6 +642,7 @@ def query_document(
     LET descVecCandidateIds = useDescVec ? (
       FOR x IN description
         FILTER x.collection == "document_list"
+        FILTER __VISIBLE(x)__
         LET score = COSINE_SIMILARITY(x.embedding, @e2)
         SORT score DESC
         LIMIT @k2
@@ -526,6 +654,7 @@ def query_document(
     LET descTxtCandidateIds = (useDescTxt && LENGTH(descQTokens) > 0) ? (
       FOR x IN description_view
         SEARCH ANALYZER(x.text IN descQTokens, @text_analyzer)
+        FILTER __VISIBLE(x)__
 
         LET xTokens = TOKENS(x.text, @text_analyzer)
         FILTER LENGTH(
@@ -544,16 +673,22 @@ def query_document(
     LET procQTokens = TOKENS(@t2, @text_analyzer)
 
     LET procCandidateIds = (useText && LENGTH(procQTokens) > 0) ? (
-      FOR s IN process_view
-        SEARCH ANALYZER(s.text IN procQTokens, @text_analyzer)
+      FOR hit IN process_view
+        SEARCH ANALYZER(hit.text IN procQTokens, @text_analyzer)
 
-        LET sTokens = TOKENS(s.text, @text_analyzer)
+        LET sTokens = TOKENS(hit.text, @text_analyzer)
         FILTER LENGTH(
           FOR t IN procQTokens
             FILTER t IN sTokens
             RETURN 1
         ) == LENGTH(procQTokens)
 
+        // a code_blob hit stands for every process cell that ran that code
+        FOR s IN IS_SAME_COLLECTION("code_blob", hit) ? (
+            FOR p IN process FILTER p.code_hash == hit._key RETURN p
+          ) : [hit]
+        FILTER __VISIBLE(s)__
+
         LIMIT @k_text
         RETURN s._id
     ) : []
@@ -597,7 +732,8 @@ def query_document(
         "filtered": filtered,
     }
 
-    return list(db.aql.execute(aql, bind_vars=bind_vars))
+    snapshot.bind_as_of(db, as_of, bind_vars)
+    return list(db.aql.execute(snapshot.apply(aql), bind_vars=bind_vars))
 
 
 def query_file(
@@ -610,6 +746,7 @@ def query_file(
     k_text: int = 500,
     text_analyzer: str = "text_en",
     filtered: Optional[List[str]] = None,  # list of file.name strings
+    as_of: Optional[int] = None,
 ):
     filtered = filtered or []
 
@@ -634,6 +771,7 @@ def query_file(
     LET fileCandidates = (
       FOR f IN file
         FILTER !hasFilter OR f.name IN filteredNames
+        FILTER __VISIBLE(f)__
         RETURN { _id: f._id, _key: f._key }
     )
 
@@ -643,6 +781,7 @@ def query_file(
       LET descVecCandidateIds = useDescVec ? (
         FOR d IN description
           FILTER d.collection == "file_list"
+          FILTER __VISIBLE(d)__
           LET score = COSINE_SIMILARITY(d.embedding, @e2)
           SORT score DESC
           LIMIT @k2
@@ -654,6 +793,7 @@ def query_file(
       LET descTxtCandidateIds = (useDescTxt && LENGTH(descQTokens) > 0) ? (
         FOR d IN description_view
           SEARCH ANALYZER(d.text IN descQTokens, @text_analyzer)
+          FILTER __VISIBLE(d)__
 
           LET dTokens = TOKENS(d.text, @text_analyzer)
           FILTER LENGTH(
@@ -673,16 +813,22 @@ def query_file(
       LET qTokens = TOKENS(@t1, @text_analyzer)
 
       RETURN (LENGTH(qTokens) > 0) ? (
-        FOR s IN process_view
-          SEARCH ANALYZER(s.text IN qTokens, @text_analyzer)
+        FOR hit IN process_view
+          SEARCH ANALYZER(hit.text IN qTokens, @text_analyzer)
 
-          LET sTokens = TOKENS(s.text, @text_analyzer)
+          LET sTokens = TOKENS(hit.text, @text_analyzer)
           FILTER LENGTH(
             FOR t IN qTokens
               FILTER t IN sTokens
               RETURN 1
           ) == LENGTH(qTokens)
 
+          // a code_blob hit stands for every process cell that ran that code
+          FOR s IN IS_SAME_COLLECTION("code_blob", hit) ? (
+              FOR p IN process FILTER p.code_hash == hit._key RETURN p
+            ) : [hit]
+          FILTER __VISIBLE(s)__
+
           LIMIT @k_text
           RETURN s._id
       ) : []
@@ -726,4 +872,195 @@ def query_file(
         "filtered": filtered,
     }
 
-    return list(db.aql.execute(aql, bind_vars=bind_vars))
+    snapshot.bind_as_of(db, as_of, bind_vars)
+    return list(db.aql.execute(snapshot.apply(aql), bind_vars=bind_vars))
+
+
+def query_embedding_hybrid(
+    db,
+    embedding: Any,
+    document_text: str,
+    filtered: Optional[List[str]] = None,  # list of embedding.name strings
+    document_filtered: Optional[List[str]] = None,  # list of document.name strings
+    link: str = "dependency",
+    fusion: str = "rrf",
+    k: int = 10,
+    k_vector: int = 100,
+    k_text: int = 100,
+    rrf_k: int = 60,
+    vector_weight: float = 1.0,
+    text_weight: float = 1.0,
+    text_analyzer: str = "text_en",
+    use_approx: bool = False,
+    as_of: Optional[int] = None,
+):
+    filtered = filtered or []
+    document_filtered = document_filtered or []
+
+    if link not in ("dependency", "index"):
+        raise ValidationError(
+            f"Unknown hybrid link mode '{link}'; expected 'dependency' or 'index'.",
+            operation="query_embedding_hybrid",
+            collection="embedding",
+        )
+    if fusion not in ("rrf", "weighted"):
+        raise ValidationError(
+            f"Unknown fusion mode '{fusion}'; expected 'rrf' or 'weighted'.",
+            operation="query_embedding_hybrid",
+            collection="embedding",
+        )
+    if link == "index" and not filtered:
+        raise ValidationError(
+            "link='index' requires 'filtered' embedding list names to pair with document indices.",
+            operation="query_embedding_hybrid",
+            collection="embedding",
+        )
+
+    aql_template = r"""
+    LET filteredNames = @filtered
+    LET hasFilter = LENGTH(filteredNames) > 0
+    LET docNames = @docFiltered
+    LET hasDocFilter = LENGTH(docNames) > 0
+
+    // --- Vector candidates ---
+    LET vecHits = (
+      FOR e IN embedding
+        FILTER HAS(e, @embedding_field)
+        LET vec = e[@embedding_field]
+        FILTER IS_ARRAY(vec) && LENGTH(vec) == LENGTH(@e1)
+
+        LET score = __SCORE_FN__(vec, @e1)
+
+        FILTER !hasFilter OR e.name IN filteredNames
+        FILTER __VISIBLE(e)__
+        SORT score DESC
+        LIMIT @k_vector
+        RETURN { _id: e._id, score: score }
+    )
+
+    // --- BM25 candidates over documents ---
+    LET qTokens = TOKENS(@t1, @text_analyzer)
+
+    LET textHits = LENGTH(qTokens) > 0 ? (
+      FOR d IN document_view
+        SEARCH ANALYZER(d.text IN qTokens, @text_analyzer)
+        FILTER __VISIBLE(d)__
+        FILTER !hasDocFilter OR d.name IN docNames
+        LET score = BM25(d)
+        SORT score DESC
+        LIMIT @k_text
+        RETURN {
+          name: d.name,
+          index: d.index,
+          start_position: d.start_position,
+          end_position: d.end_position,
+          score: score
+        }
+    ) : []
+
+    // --- Map document hits to linked embeddings, keeping the best text rank per embedding ---
+    LET textLinks = LENGTH(textHits) == 0 ? [] : (
+      FOR i IN 0..(LENGTH(textHits) - 1)
+        LET d = textHits[i]
+        FOR linkedId IN (__LINK__)
+          RETURN { _id: linkedId, rank: i + 1, score: d.score }
+    )
+
+    LET textBest = (
+      FOR l IN textLinks
+        COLLECT id = l._id AGGREGATE rank = MIN(l.rank), score = MAX(l.score)
+        RETURN { id, rank, score }
+    )
+    LET maxText = MAX(textBest[*].score)
+
+    LET vecRanked = LENGTH(vecHits) == 0 ? [] : (
+      FOR i IN 0..(LENGTH(vecHits) - 1)
+        RETURN { id: vecHits[i]._id, rank: i + 1, score: vecHits[i].score }
+    )
+
+    // --- Fusion ---
+    LET fused = (
+      FOR h IN APPEND(
+        (
+          FOR v IN vecRanked
+            RETURN {
+              id: v.id,
+              s: @useRrf ? @wVec / (@rrfK + v.rank) : @wVec * v.score
+            }
+        ),
+        (
+          FOR t IN textBest
+            RETURN {
+              id: t.id,
+              s: @useRrf ? @wText / (@rrfK + t.rank) : @wText * (maxText > 0 ? t.score / maxText : 0)
+            }
+        )
+      )
+        COLLECT id = h.id AGGREGATE score = SUM(h.s)
+        SORT score DESC
+        LIMIT @k
+        RETURN { id, score }
+    )
+
+    FOR f IN fused
+      LET embDoc = DOCUMENT(f.id)
+      RETURN [embDoc.name, embDoc.index, embDoc.start_position, f.score]
+    """
+
+    dependency_link = r"""
+          FOR v, depE IN 1..1 OUTBOUND CONCAT("document_list/", d.name) dependency_edge
+            FILTER IS_SAME_COLLECTION("embedding", v)
+            FILTER depE.start_position < d.end_position
+              AND depE.end_position > d.start_position
+            FILTER !hasFilter OR v.name IN filteredNames
+            FILTER __VISIBLE(v)__
+            RETURN v._id
+    """
+    index_link = r"""
+          FOR n IN filteredNames
+            LET e = DOCUMENT("embedding", CONCAT(n, "_", d.index))
+            FILTER e != null
+            FILTER __VISIBLE(e)__
+            RETURN e._id
+    """
+
+    e1_list = list(embedding)
+    bind_vars: Dict[str, Any] = {
+        "e1": e1_list,
+        "embedding_field": f"embedding_{len(e1_list)}",
+        "k_vector": k_vector,
+        "t1": document_text or "",
+        "k_text": k_text,
+        "text_analyzer": text_analyzer,
+        "filtered": filtered,
+        "docFiltered": document_filtered,
+        "useRrf": fusion == "rrf",
+        "rrfK": rrf_k,
+        "wVec": vector_weight,
+        "wText": text_weight,
+        "k": k,
+    }
+
+    aql_linked = aql_template.replace(
+        "__LINK__", dependency_link if link == "dependency" else index_link
+    )
+
+    snapshot.bind_as_of(db, as_of, bind_vars)
+
+    def _run_query(score_fn: str) -> List[Any]:
+        aql = snapshot.apply(aql_linked.replace("__SCORE_FN__", score_fn))
+        return list(db.aql.execute(aql, bind_vars=bind_vars))
+
+    if not use_approx:
+        return _run_query("COSINE_SIMILARITY")
+
+    try:
+        return _run_query("APPROX_NEAR_COSINE")
+    except Exception as exc:
+        msg = str(exc).lower()
+        if (
+            "approx_near_cosine" in msg
+            and ("unknown function" in msg or "vector index" in msg)
+        ):
+            return _run_query("COSINE_SIMILARITY")
+        raise
@@ -1,7 +1,12 @@
-from typing import Optional, Any, List, Dict
+from typing import Optional, Any, Iterator, List, Dict
 
 from arango.database import StandardDatabase
+from tablevault.database import embedding_storage
+from tablevault.database import interval_index
+from tablevault.database import process_collection
+from tablevault.database import snapshot
 from tablevault.utils.errors import ValidationError
+from tablevault.utils.optional import import_optional
 
 
 def _query_process_item(
@@ -9,6 +14,7 @@ def _query_process_item(
     name: str,
     start_position: Optional[int] = None,
     end_position: Optional[int] = None,
+    as_of: Optional[int] = None,
 ) -> List[Dict[str, Any]]:
     aql = r"""
     LET qStart = @qStart
@@ -23,9 +29,10 @@ def _query_process_item(
       FOR v, e IN 1..1 OUTBOUND s parent_edge
         FILTER (!hasEnd   OR e.start_position < qEnd)
           AND (!hasStart OR e.end_position   > qStart)
+        FILTER __VISIBLE(v)__
         SORT v.start_position ASC
         RETURN {
-          text: v.text,
+          text: __CODE_TEXT__,
           status: v.status,
           error: v.error,
           start_position: v.start_position,
@@ -39,7 +46,9 @@ def _query_process_item(
         "qEnd": end_position,
     }
 
-    return list(db.aql.execute(aql, bind_vars=bind_vars))
+    snapshot.bind_as_of(db, as_of, bind_vars)
+    aql = aql.replace("__CODE_TEXT__", process_collection.CODE_TEXT)
+    return list(db.aql.execute(snapshot.apply(aql), bind_vars=bind_vars))
 
 
 def _query_file_item(
@@ -47,6 +56,7 @@ def _query_file_item(
     name: str,
     start_position: Optional[int],
     end_position: Optional[int],
+    as_of: Optional[int] = None,
 ) -> List[str]:
     aql = r"""
     LET qStart = @qStart
@@ -61,6 +71,7 @@ def _query_file_item(
       FOR v, e IN 1..1 OUTBOUND s parent_edge
         FILTER (!hasEnd   OR e.start_position < qEnd)
           AND (!hasStart OR e.end_position   > qStart)
+        FILTER __VISIBLE(v)__
         SORT v.start_position ASC
         RETURN v.location
     """
@@ -71,7 +82,8 @@ def _query_file_item(
         "qEnd": end_position,
     }
 
-    return list(db.aql.execute(aql, bind_vars=bind_vars))
+    snapshot.bind_as_of(db, as_of, bind_vars)
+    return list(db.aql.execute(snapshot.apply(aql), bind_vars=bind_vars))
 
 
 def _query_embedding_item(
@@ -79,6 +91,8 @@ def _query_embedding_item(
     name: str,
     start_position: Optional[int],
     end_position: Optional[int],
+    n_dim: int,
+    as_of: Optional[int] = None,
 ) -> List[Optional[List[float]]]:
     aql = r"""
     LET qStart = @qStart
@@ -89,28 +103,26 @@ def _query_embedding_item(
     LET targetId = CONCAT("embedding_list/", @name)
 
     FOR s IN embedding_list
-      FILTER TO_STRING(s._id) == targetId
-
+      FILTER s._id == targetId
       FOR v, e IN 1..1 OUTBOUND s parent_edge
         FILTER (!hasEnd   OR e.start_position < qEnd)
           AND (!hasStart OR e.end_position   > qStart)
-        LET embKey = FIRST(
-          FOR k IN ATTRIBUTES(v, true)   // true => include system attrs too; OK either way
-            FILTER STARTS_WITH(k, "embedding_")
-            SORT k ASC                  // deterministic choice if there are multiple
-            RETURN k
-        )
+        FILTER __VISIBLE(v)__
         SORT v.start_position ASC
-        RETURN embKey != null ? v[embKey] : null
-    """
+        RETURN __VALUE__
+    """.replace("__VALUE__", embedding_storage.value_expression("v"))
 
-    bind_vars = {
-        "name": name,
-        "qStart": start_position,
-        "qEnd": end_position,
-    }
+    bind_vars = embedding_storage.value_bind_vars(
+        n_dim,
+        {
+            "name": name,
+            "qStart": start_position,
+            "qEnd": end_position,
+        },
+    )
 
-    return list(db.aql.execute(aql, bind_vars=bind_vars))
+    snapshot.bind_as_of(db, as_of, bind_vars)
+    return list(db.aql.execute(snapshot.apply(aql), bind_vars=bind_vars))
 
 
 def _query_document_item(
@@ -118,6 +130,7 @@ def _query_document_item(
     name: str,
     start_position: Optional[int],
     end_position: Optional[int],
+    as_of: Optional[int] = None,
 ) -> List[str]:
     aql = r"""
     LET qStart = @qStart
@@ -132,6 +145,7 @@ def _query_document_item(
       FOR v, e IN 1..1 OUTBOUND s parent_edge
         FILTER (!hasEnd   OR e.start_position < qEnd)
           AND (!hasStart OR e.end_position   > qStart)
+        FILTER __VISIBLE(v)__
         SORT v.start_position ASC
         RETURN v.text
     """
@@ -142,7 +156,8 @@ def _query_document_item(
         "qEnd": end_position,
     }
 
-    return list(db.aql.execute(aql, bind_vars=bind_vars))
+    snapshot.bind_as_of(db, as_of, bind_vars)
+    return list(db.aql.execute(snapshot.apply(aql), bind_vars=bind_vars))
 
 
 def _query_record_item(
@@ -150,6 +165,7 @@ def _query_record_item(
     name: str,
     start_position: Optional[int],
     end_position: Optional[int],
+    as_of: Optional[int] = None,
 ) -> List[Optional[Dict[str, Any]]]:
     aql = r"""
     LET qStart = @qStart
@@ -164,6 +180,7 @@ def _query_record_item(
       FOR v, e IN 1..1 OUTBOUND s parent_edge
         FILTER (!hasEnd   OR e.start_position < qEnd)
           AND (!hasStart OR e.end_position   > qStart)
+        FILTER __VISIBLE(v)__
         SORT v.start_position ASC
         RETURN  v.data
     """
@@ -174,7 +191,8 @@ def _query_record_item(
         "qEnd": end_position,
     }
 
-    return list(db.aql.execute(aql, bind_vars=bind_vars))
+    snapshot.bind_as_of(db, as_of, bind_vars)
+    return list(db.aql.execute(snapshot.apply(aql), bind_vars=bind_vars))
 
 
 def query_names_by_collection(db: StandardDatabase, collection: str) -> List[str]:
@@ -203,7 +221,9 @@ def query_item_list(db: StandardDatabase, name: str) -> Dict[str, Any]:
     return coll.get(name)
 
 
-def query_item_index(db: StandardDatabase, name: str, index: int) -> Any:
+def query_item_index(
+    db: StandardDatabase, name: str, index: int, as_of: Optional[int] = None
+) -> Any:
     items = db.collection("items")
     itm = items.get(name)
     coll_name = itm["collection"]
@@ -217,9 +237,11 @@ def query_item_index(db: StandardDatabase, name: str, index: int) -> Any:
     key_ = f"{name}_{index}"
     coll_name = itm["collection"].split("_")[0]
     item = db.collection(coll_name).get(key_)
+    if as_of is not None and not snapshot.is_visible(db, item, as_of):
+        return None
     if coll_name == "process":
         return {
-          "text": item["text"],
+          "text": process_collection.get_code(db, item),
           "status": item["status"],
           "error": item["error"],
           "start_position": item["start_position"],
@@ -228,7 +250,12 @@ def query_item_index(db: StandardDatabase, name: str, index: int) -> Any:
     elif coll_name == "file":
         return item["location"]
     elif coll_name == "embedding":
-        return item["embedding_"]
+        n_dim = db.collection("embedding_list").get(name)["n_dim"]
+        field = embedding_storage.full_field(n_dim)
+        if field in item:
+            return item[field]
+        scale = item["embedding_scale"]
+        return [x * scale for x in item[embedding_storage.int8_field(n_dim)]]
     elif coll_name == "document":
         return item["text"]
     elif coll_name == "record":
@@ -239,6 +266,7 @@ def query_item(
     name: str,
     start_position: Optional[int] = None,
     end_position: Optional[int] = None,
+    as_of: Optional[int] = None,
 ) -> Optional[List[Any]]:
     items = db.collection("items")
     itm = items.get(name)
@@ -251,29 +279,226 @@ def query_item(
             key=name,
         )
     elif coll_name == "process_list":
-        return _query_process_item(db, name, start_position, end_position)
+        return _query_process_item(db, name, start_position, end_position, as_of)
     elif coll_name == "file_list":
-        return _query_file_item(db, name, start_position, end_position)
+        return _query_file_item(db, name, start_position, end_position, as_of)
     elif coll_name == "embedding_list":
-        return _query_embedding_item(db, name, start_position, end_position)
+        n_dim = db.collection("embedding_list").get(name)["n_dim"]
+        return _query_embedding_item(
+            db, name, start_position, end_position, n_dim, as_of
+        )
     elif coll_name == "document_list":
-        return _query_document_item(db, name, start_position, end_position)
+        return _query_document_item(db, name, start_position, end_position, as_of)
     elif coll_name == "record_list":
-        return _query_record_item(db, name, start_position, end_position)
+        return _query_record_item(db, name, start_position, end_position, as_of)
+
+
+def _iter_cursor_batches(cursor: Any) -> Iterator[List[Any]]:
+    """
+    Yield the rows of ``cursor`` one server batch at a time.
+
+    If the caller stops early (breaks, raises, or drops the generator) the cursor is
+    closed so the server releases it instead of holding it until its TTL expires.
+    """
+    try:
+        while True:
+            batch = cursor.batch()
+            rows = list(batch)
+            batch.clear()
+            if rows:
+                yield rows
+            if not cursor.has_more():
+                return
+            cursor.fetch()
+    finally:
+        if cursor.has_more():
+            cursor.close(ignore_missing=True)
+
+
+_ITEM_VALUE_EXPRESSIONS: Dict[str, str] = {
+    "process_list": f"{{ text: {process_collection.CODE_TEXT}, status: v.status, error: v.error, start_position: v.start_position, index: v.index }}",
+    "file_list": "v.location",
+    "embedding_list": embedding_storage.value_expression("v"),
+    "document_list": "v.text",
+    "record_list": "v.data",
+}
+
+
+def _item_cursor(
+    db: StandardDatabase,
+    name: str,
+    coll_name: str,
+    start_position: Optional[int],
+    end_position: Optional[int],
+    batch_size: int,
+    count: bool = False,
+    as_of: Optional[int] = None,
+    positions: bool = False,
+) -> Any:
+    aql = r"""
+    LET qStart = @qStart
+    LET qEnd   = @qEnd
+
+    LET hasStart = (qStart != null)
+    LET hasEnd   = (qEnd != null)
+
+    FOR v, e IN 1..1 OUTBOUND @targetId parent_edge
+      FILTER (!hasEnd   OR e.start_position < qEnd)
+        AND (!hasStart OR e.end_position   > qStart)
+      FILTER __VISIBLE(v)__
+      SORT v.start_position ASC
+      RETURN __VALUE__
+    """
+    value = _ITEM_VALUE_EXPRESSIONS[coll_name]
+    if positions:
+        value = f"[v.index, v.start_position, v.end_position, {value}]"
+    aql = aql.replace("__VALUE__", value)
+    bind_vars: Dict[str, Any] = {
+        "targetId": f"{coll_name}/{name}",
+        "qStart": start_position,
+        "qEnd": end_position,
+    }
+    if coll_name == "embedding_list":
+        n_dim = db.collection("embedding_list").get(name)["n_dim"]
+        embedding_storage.value_bind_vars(n_dim, bind_vars)
+    snapshot.bind_as_of(db, as_of, bind_vars)
+    return db.aql.execute(
+        snapshot.apply(aql), bind_vars=bind_vars, batch_size=batch_size, count=count
+    )
+
+
+def _get_list_collection(db: StandardDatabase, name: str, operation: str) -> str:
+    itm = db.collection("items").get(name)
+    coll_name = itm["collection"]
+    if coll_name == "description":
+        raise ValidationError(
+            "Use query_item_list instead for descriptions.",
+            operation=operation,
+            collection=coll_name,
+            key=name,
+        )
+    return coll_name
+
+
+def _fill_rows(out: Any, offset: int, rows: List[Any]) -> None:
+    if all(r is not None for r in rows):
+        out[offset : offset + len(rows)] = rows
+        return
+    for i, r in enumerate(rows):
+        out[offset + i] = r if r is not None else float("nan")
+
+
+def query_embedding_array(
+    db: StandardDatabase,
+    name: str,
+    start_position: Optional[int] = None,
+    end_position: Optional[int] = None,
+    batch_size: int = 10000,
+    as_of: Optional[int] = None,
+) -> Any:
+    np = import_optional("numpy", "vector")
+    coll_name = _get_list_collection(db, name, "query_embedding_array")
+    if coll_name != "embedding_list":
+        raise ValidationError(
+            f"as_array is only supported for embedding lists; '{name}' is a '{coll_name}'.",
+            operation="query_embedding_array",
+            collection=coll_name,
+            key=name,
+        )
+    n_dim = db.collection("embedding_list").get(name)["n_dim"]
+    cursor = _item_cursor(
+        db,
+        name,
+        coll_name,
+        start_position,
+        end_position,
+        batch_size,
+        count=True,
+        as_of=as_of,
+    )
+    out = np.empty((cursor.count(), n_dim), dtype=np.float32)
+    offset = 0
+    for rows in _iter_cursor_batches(cursor):
+        _fill_rows(out, offset, rows)
+        offset += len(rows)
+    return out[:offset]
+
+
+def stream_item(
+    db: StandardDatabase,
+    name: str,
+    start_position: Optional[int] = None,
+    end_position: Optional[int] = None,
+    batch_size: int = 10000,
+    as_array: bool = False,
+    as_of: Optional[int] = None,
+) -> Iterator[Any]:
+    coll_name = _get_list_collection(db, name, "stream_item")
+    if as_array and coll_name != "embedding_list":
+        raise ValidationError(
+            f"as_array is only supported for embedding lists; '{name}' is a '{coll_name}'.",
+            operation="stream_item",
+            collection=coll_name,
+            key=name,
+        )
+    cursor = _item_cursor(
+        db, name, coll_name, start_position, end_position, batch_size, as_of=as_of
+    )
+    if not as_array:
+        yield from _iter_cursor_batches(cursor)
+        return
+    np = import_optional("numpy", "vector")
+    n_dim = db.collection("embedding_list").get(name)["n_dim"]
+    for rows in _iter_cursor_batches(cursor):
+        out = np.empty((len(rows), n_dim), dtype=np.float32)
+        _fill_rows(out, 0, rows)
+        yield out
+
+
+def _with_edge_scan(aql: str, edge_col: str, bind_vars: Dict[str, Any]) -> str:
+    """
+    Replace ``__EDGES__`` with the edges of ``startId`` that may fall in the position range.
+
+    With a range, edges are read through the ``[_from, bin]`` index one bin range per level;
+    edges written before binning have no ``bin`` and are always included.
+    """
+    bin_ranges = interval_index.position_bin_ranges(
+        bind_vars["start_position"], bind_vars["end_position"]
+    )
+    if bin_ranges is None:
+        edges = f"(FOR e IN {edge_col} FILTER e._from == startId RETURN e)"
+    else:
+        bind_vars["binRanges"] = bin_ranges
+        edges = f"""APPEND(
+      (FOR r IN @binRanges
+        FOR e IN {edge_col}
+          FILTER e._from == startId AND e.bin >= r[0] AND e.bin <= r[1]
+          RETURN e),
+      (FOR e IN {edge_col}
+        FILTER e._from == startId AND e.bin == null
+        RETURN e)
+    )"""
+    return snapshot.apply(aql.replace("__EDGES__", edges))
 
 
 def query_item_input(
-    db: StandardDatabase, name: str, start_position: Optional[int], end_position: Optional[int]
+    db: StandardDatabase,
+    name: str,
+    start_position: Optional[int],
+    end_position: Optional[int],
+    as_of: Optional[int] = None,
 ) -> List[Any]:
     AQL_QUERY_ITEM_DEPENDENCY = r"""
     LET itm = DOCUMENT("items", @name)
     LET startId = CONCAT(itm.collection, "/", @name)
 
-    FOR child, parentE IN 1..1 OUTBOUND startId parent_edge
+    FOR parentE IN __EDGES__
     FILTER (@start_position == null OR parentE.start_position >= @start_position)
         AND (@end_position   == null OR parentE.end_position   < @end_position)
+    FILTER __VISIBLE(parentE)__
 
-    FOR dep, depE IN 1..1 INBOUND child dependency_edge
+    FOR dep, depE IN 1..1 INBOUND parentE._to dependency_edge
+        FILTER __VISIBLE(depE)__
         RETURN [
         parentE.start_position,
         parentE.end_position,
@@ -288,22 +513,29 @@ def query_item_input(
         "start_position": start_position,
         "end_position": end_position,
     }
+    snapshot.bind_as_of(db, as_of, bind_vars)
     cursor = db.aql.execute(
-        AQL_QUERY_ITEM_DEPENDENCY,
+        _with_edge_scan(AQL_QUERY_ITEM_DEPENDENCY, "parent_edge", bind_vars),
         bind_vars=bind_vars,
     )
     return list(cursor)
 
 
 def query_item_output(
-    db: StandardDatabase, name: str, start_position: Optional[int], end_position: Optional[int]
+    db: StandardDatabase,
+    name: str,
+    start_position: Optional[int],
+    end_position: Optional[int],
+    as_of: Optional[int] = None,
 ) -> List[Any]:
     AQL_QUERY_ITEM_CHILDREN = r"""
     LET itm = DOCUMENT("items", @name)
     LET startId = CONCAT(itm.collection, "/", @name)
-    FOR dep, depE IN 1..1 OUTBOUND startId dependency_edge
+    FOR depE IN __EDGES__
     FILTER (@start_position == null OR depE.start_position >= @start_position)
         AND (@end_position   == null OR depE.end_position   < @end_position)
+    FILTER __VISIBLE(depE)__
+    LET dep = DOCUMENT(depE._to)
 
     RETURN [
         depE.start_position,
@@ -320,13 +552,195 @@ def query_item_output(
         "end_position": end_position,  # None -> AQL null
     }
 
+    snapshot.bind_as_of(db, as_of, bind_vars)
     cursor = db.aql.execute(
-        AQL_QUERY_ITEM_CHILDREN,
+        _with_edge_scan(AQL_QUERY_ITEM_CHILDREN, "dependency_edge", bind_vars),
         bind_vars=bind_vars,
     )
     return list(cursor)
 
 
+# An edge stays on the path only if its interval overlaps the interval that led to it:
+# the query range for the first hop, otherwise the edge two steps back.
+_LINEAGE_START = r"""
+FOR v, pe IN 1..1 OUTBOUND @startId parent_edge
+  FILTER __VISIBLE(pe)__
+  FILTER (@qEnd == null OR pe.start_position < @qEnd)
+    AND (@qStart == null OR pe.end_position > @qStart)
+  RETURN v._id
+"""
+
+
+def _query_lineage(
+    db: StandardDatabase,
+    name: str,
+    hop_aql: str,
+    depth: int,
+    start_position: Optional[int],
+    end_position: Optional[int],
+    collections: Optional[List[str]],
+    batch_size: int,
+    as_of: Optional[int] = None,
+) -> Iterator[List[Any]]:
+    """
+    Breadth-first lineage walk over entries, one server-side query per hop.
+
+    ``hop_aql`` expands the ``@frontier`` entries by one dependency hop and returns, per
+    dependency edge, ``{edge, row, keep, next}``. Every entry is expanded once and every
+    edge reported once, at the first hop that reaches it, so diamond-shaped lineage costs
+    one visit per entry instead of one per path.
+    """
+    if depth < 1:
+        raise ValidationError(
+            f"depth must be at least 1, got {depth}.",
+            operation="query_item_lineage",
+            collection="items",
+            key=name,
+        )
+    itm = db.collection("items").get(name)
+    bind_vars: Dict[str, Any] = {
+        "startId": f"{itm['collection']}/{name}",
+        "qStart": start_position,
+        "qEnd": end_position,
+    }
+    snapshot.bind_as_of(db, as_of, bind_vars)
+    frontier = list(db.aql.execute(snapshot.apply(_LINEAGE_START), bind_vars=bind_vars))
+    visited = set(frontier)
+    seen_edges = set()
+    hop_aql = snapshot.apply(hop_aql)
+    for hop in range(1, depth + 1):
+        if not frontier:
+            return
+        hop_vars = {
+            "frontier": frontier,
+            "hop": hop,
+            "collections": collections or [],
+            "asOf": bind_vars["asOf"],
+            "activeTs": bind_vars["activeTs"],
+        }
+        cursor = db.aql.execute(
+            hop_aql, bind_vars=hop_vars, batch_size=batch_size, stream=True
+        )
+        frontier = []
+        for rows in _iter_cursor_batches(cursor):
+            for r in rows:
+                if r["edge"] in seen_edges:
+                    continue
+                seen_edges.add(r["edge"])
+                if r["keep"]:
+                    yield r["row"]
+                for entry in r["next"]:
+                    if entry not in visited:
+                        visited.add(entry)
+                        frontier.append(entry)
+
+
+def query_item_ancestors(
+    db: StandardDatabase,
+    name: str,
+    depth: int,
+    start_position: Optional[int] = None,
+    end_position: Optional[int] = None,
+    collections: Optional[List[str]] = None,
+    batch_size: int = 1000,
+    as_of: Optional[int] = None,
+) -> Iterator[List[Any]]:
+    # entry <-dependency_edge- input list -parent_edge-> input entries in the edge's range
+    aql = r"""
+    FOR itemId IN @frontier
+      LET item = DOCUMENT(itemId)
+      FOR l, dep IN 1..1 INBOUND itemId dependency_edge
+        FILTER __VISIBLE(dep)__
+        LET depColl = PARSE_IDENTIFIER(l._id).collection
+        RETURN {
+          edge: dep._id,
+          row: [
+            @hop,
+            item.name,
+            item.start_position,
+            item.end_position,
+            depColl,
+            l.name,
+            dep.start_position,
+            dep.end_position
+          ],
+          keep: LENGTH(@collections) == 0 OR depColl IN @collections,
+          next: (
+            FOR v, pe IN 1..1 OUTBOUND l parent_edge
+              FILTER __VISIBLE(pe)__
+              FILTER pe.start_position < dep.end_position
+                AND pe.end_position > dep.start_position
+              RETURN v._id
+          )
+        }
+    """
+    return _query_lineage(
+        db,
+        name,
+        aql,
+        depth,
+        start_position,
+        end_position,
+        collections,
+        batch_size,
+        as_of,
+    )
+
+
+def query_item_descendants(
+    db: StandardDatabase,
+    name: str,
+    depth: int,
+    start_position: Optional[int] = None,
+    end_position: Optional[int] = None,
+    collections: Optional[List[str]] = None,
+    batch_size: int = 1000,
+    as_of: Optional[int] = None,
+) -> Iterator[List[Any]]:
+    # entries of a list -> dependency_edges of that list overlapping them -> child entries
+    aql = r"""
+    FOR itemId IN @frontier
+      LET item = DOCUMENT(itemId)
+      COLLECT listName = item.name INTO members = [item.start_position, item.end_position]
+      LET listId = CONCAT(DOCUMENT("items", listName).collection, "/", listName)
+      FOR child, dep IN 1..1 OUTBOUND listId dependency_edge
+        FILTER __VISIBLE(dep)__
+        FILTER LENGTH(
+          FOR m IN members
+            FILTER dep.start_position < m[1] AND dep.end_position > m[0]
+            LIMIT 1
+            RETURN 1
+        ) > 0
+        LET childColl = DOCUMENT("items", child.name).collection
+        RETURN {
+          edge: dep._id,
+          row: [
+            @hop,
+            listName,
+            dep.start_position,
+            dep.end_position,
+            childColl,
+            child.name,
+            child.start_position,
+            child.end_position
+          ],
+          keep: LENGTH(@collections) == 0 OR childColl IN @collections,
+          next: [child._id]
+        }
+    """
+    return _query_lineage(
+        db,
+        name,
+        aql,
+        depth,
+        start_position,
+        end_position,
+        collections,
+        batch_size,
+        as_of,
+    )
+
+
 def query_item_description(db: StandardDatabase, name: str) -> List[str]:
     AQL_QUERY_ITEM_DESCRIPTION = r"""
     LET itm = DOCUMENT("items", @name)
@@ -372,7 +786,8 @@ def query_item_process(
 
       FOR s, sPE IN 1..1 INBOUND child process_parent_edge
         COLLECT sid = s._id, idx = sPE.index
-        RETURN { process_id: sid, index: idx }
+        AGGREGATE workers = UNIQUE(sPE.worker_id)
+        RETURN { process_id: sid, index: idx, worker_ids: REMOVE_VALUE(workers, null) }
     """
 
     cursor = db.aql.execute(
@@ -420,3 +835,55 @@ def query_process_item(db: StandardDatabase, process_name: str) -> List[Dict[str
 
     bind_vars = {"sid": f"process_list/{process_name}"}
     return list(db.aql.execute(aql, bind_vars=bind_vars))
+
+
+# telemetry fields a process profile can be ranked by
+PROFILE_SORT_FIELDS = (
+    "wall_time",
+    "cpu_time",
+    "max_rss",
+    "read_bytes",
+    "write_bytes",
+    "vault_calls",
+    "vault_call_time",
+)
+
+
+def query_process_profile(
+    db: StandardDatabase,
+    process_name: str,
+    sort_by: str = "wall_time",
+    limit: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    if sort_by not in PROFILE_SORT_FIELDS:
+        raise ValidationError(
+            f"Cannot rank process steps by '{sort_by}'; expected one of {list(PROFILE_SORT_FIELDS)}.",
+            operation="process_profile",
+            collection="process_list",
+            key=process_name,
+        )
+    bind_vars: Dict[str, Any] = {
+        "sid": f"process_list/{process_name}",
+        "sort_by": sort_by,
+    }
+    limit_line = ""
+    if limit is not None:
+        bind_vars["limit"] = limit
+        limit_line = "LIMIT @limit"
+    aql = f"""
+    FOR v IN 1..1 OUTBOUND @sid parent_edge
+      FILTER v.telemetry != null
+      LET step = MERGE(v.telemetry, {{
+        cpu_time: v.telemetry.cpu_user + v.telemetry.cpu_system
+      }})
+      SORT step[@sort_by] DESC, v.index ASC
+      {limit_line}
+      RETURN MERGE({{
+        index: v.index,
+        status: v.status,
+        error: v.error,
+        start_position: v.start_position,
+        end_position: v.end_position
+      }}, step)
+    """
+    return list(db.aql.execute(aql, bind_vars=bind_vars))
@@ -0,0 +1,258 @@
+import hashlib
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+from arango.database import StandardDatabase
+from tablevault.database import snapshot
+from tablevault.utils.errors import ValidationError
+
+# user operators -> AQL operators; nothing outside this table reaches the query text
+COMPARISON_OPERATORS: Dict[str, str] = {
+    "==": "==",
+    "!=": "!=",
+    "<": "<",
+    "<=": "<=",
+    ">": ">",
+    ">=": ">=",
+    "in": "IN",
+    "not in": "NOT IN",
+    "like": "LIKE",
+}
+_LOGICAL_OPERATORS = ("and", "or", "not")
+
+
+def data_index_name(column: str) -> str:
+    safe = re.sub(r"[^A-Za-z0-9_]", "_", column)[:32]
+    digest = hashlib.sha1(column.encode()).hexdigest()[:8]
+    return f"record_data_{safe}_{digest}_idx"
+
+
+def validate_columns(
+    name: str, columns: Sequence[str], known: Sequence[str], operation: str
+) -> None:
+    unknown = [c for c in columns if c not in known]
+    if unknown:
+        raise ValidationError(
+            f"Unknown columns {unknown} for record_list '{name}'; expected a subset of {list(known)}.",
+            operation=operation,
+            collection="record_list",
+            key=name,
+        )
+
+
+class WhereCompiler:
+    """
+    Compiles a structured predicate on record columns into an AQL expression.
+
+    A predicate is a condition ``(column, operator, value)``, a list of predicates (all must
+    hold), or ``{"and": [...]}``, ``{"or": [...]}``, ``{"not": predicate}``. Columns and
+    values are passed as bind parameters; operators come from ``COMPARISON_OPERATORS``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        columns: Sequence[str],
+        bind_vars: Dict[str, Any],
+        operation: str,
+        var: str = "v",
+    ) -> None:
+        self.name = name
+        self.columns = columns
+        self.bind_vars = bind_vars
+        self.operation = operation
+        self.var = var
+        self._n = 0
+
+    def _error(self, message: str) -> ValidationError:
+        return ValidationError(
+            message, operation=self.operation, collection="record_list", key=self.name
+        )
+
+    def column(self, column: str) -> str:
+        validate_columns(self.name, [column], self.columns, self.operation)
+        key = f"col{self._n}"
+        self._n += 1
+        self.bind_vars[key] = column
+        return f"{self.var}.data.@{key}"
+
+    def _value(self, value: Any) -> str:
+        key = f"val{self._n}"
+        self._n += 1
+        self.bind_vars[key] = value
+        return f"@{key}"
+
+    def _condition(self, cond: Sequence[Any]) -> str:
+        if len(cond) != 3:
+            raise self._error(f"Conditions are (column, operator, value); got {cond!r}.")
+        column, op, value = cond
+        aql_op = COMPARISON_OPERATORS.get(str(op).lower())
+        if aql_op is None:
+            raise self._error(
+                f"Unknown operator {op!r}; expected one of {list(COMPARISON_OPERATORS)}."
+            )
+        if aql_op in ("IN", "NOT IN") and not isinstance(value, (list, tuple, set)):
+            raise self._error(f"Operator {op!r} needs a list value for column '{column}'.")
+        if isinstance(value, (tuple, set)):
+            value = list(value)
+        return f"({self.column(column)} {aql_op} {self._value(value)})"
+
+    def compile(self, where: Any) -> str:
+        if isinstance(where, dict):
+            if len(where) != 1 or next(iter(where)) not in _LOGICAL_OPERATORS:
+                raise self._error(
+                    f"Logical predicates have one key out of {list(_LOGICAL_OPERATORS)}; got {list(where)}."
+                )
+            op, arg = next(iter(where.items()))
+            if op == "not":
+                return f"(NOT {self.compile(arg)})"
+            parts = [self.compile(p) for p in arg]
+            if not parts:
+                return "true" if op == "and" else "false"
+            return "(" + f" {op.upper()} ".join(parts) + ")"
+        if isinstance(where, (list, tuple)):
+            if where and isinstance(where[0], str):
+                return self._condition(where)
+            return self.compile({"and": list(where)})
+        raise self._error(f"Cannot interpret predicate {where!r}.")
+
+
+def _record_filters(
+    name: str,
+    where: Optional[Any],
+    start_position: Optional[int],
+    end_position: Optional[int],
+    bind_vars: Dict[str, Any],
+    compiler: WhereCompiler,
+) -> str:
+    filters = ["v.name == @name"]
+    bind_vars["name"] = name
+    if start_position is not None:
+        bind_vars["qStart"] = start_position
+        filters.append("v.end_position > @qStart")
+    if end_position is not None:
+        bind_vars["qEnd"] = end_position
+        filters.append("v.start_position < @qEnd")
+    if where is not None:
+        filters.append(compiler.compile(where))
+    return " AND ".join(filters)
+
+
+def query_records(
+    db: StandardDatabase,
+    name: str,
+    where: Optional[Any] = None,
+    columns: Optional[List[str]] = None,
+    start_position: Optional[int] = None,
+    end_position: Optional[int] = None,
+    limit: Optional[int] = None,
+    as_of: Optional[int] = None,
+) -> List[List[Any]]:
+    known = db.collection("record_list").get(name)["column_names"]
+    bind_vars: Dict[str, Any] = {}
+    compiler = WhereCompiler(name, known, bind_vars, "query_records")
+    filters = _record_filters(
+        name, where, start_position, end_position, bind_vars, compiler
+    )
+    data = "v.data"
+    if columns is not None:
+        validate_columns(name, columns, known, "query_records")
+        bind_vars["columns"] = list(columns)
+        data = "KEEP(v.data, @columns)"
+    limit_line = ""
+    if limit is not None:
+        bind_vars["limit"] = limit
+        limit_line = "LIMIT @limit"
+    aql = f"""
+    FOR v IN record
+      FILTER {filters}
+      FILTER __VISIBLE(v)__
+      SORT v.start_position ASC
+      {limit_line}
+      RETURN [v.index, v.start_position, {data}]
+    """
+    snapshot.bind_as_of(db, as_of, bind_vars)
+    return list(db.aql.execute(snapshot.apply(aql), bind_vars=bind_vars))
+
+
+# metric name -> AQL aggregate over the column expression (``{}``); "count" without a
+# column counts rows, with a column it counts non-null values
+AGGREGATE_FUNCTIONS: Dict[str, str] = {
+    "count": "SUM({} != null ? 1 : 0)",
+    "count_distinct": "COUNT_DISTINCT({})",
+    "sum": "SUM({})",
+    "avg": "AVERAGE({})",
+    "min": "MIN({})",
+    "max": "MAX({})",
+    "stddev": "STDDEV_SAMPLE({})",
+    "variance": "VARIANCE_SAMPLE({})",
+}
+
+
+def aggregate_records(
+    db: StandardDatabase,
+    name: str,
+    group_by: Optional[List[str]] = None,
+    metrics: Optional[Dict[str, Any]] = None,
+    where: Optional[Any] = None,
+    start_position: Optional[int] = None,
+    end_position: Optional[int] = None,
+    as_of: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    known = db.collection("record_list").get(name)["column_names"]
+    group_by = list(group_by or [])
+    metrics = dict(metrics) if metrics else {"count": "count"}
+    bind_vars: Dict[str, Any] = {}
+    compiler = WhereCompiler(name, known, bind_vars, "aggregate_records")
+    filters = _record_filters(
+        name, where, start_position, end_position, bind_vars, compiler
+    )
+    overlap = set(group_by) & set(metrics)
+    if overlap:
+        raise ValidationError(
+            f"Metric names {sorted(overlap)} clash with group_by columns.",
+            operation="aggregate_records",
+            collection="record_list",
+            key=name,
+        )
+    groups = [f"g{i} = {compiler.column(col)}" for i, col in enumerate(group_by)]
+    aggregates = []
+    for i, (metric, spec) in enumerate(metrics.items()):
+        fn, column = (spec, None) if isinstance(spec, str) else tuple(spec)
+        template = AGGREGATE_FUNCTIONS.get(fn)
+        if template is None:
+            raise ValidationError(
+                f"Unknown aggregate {fn!r} for metric '{metric}'; expected one of "
+                f"{list(AGGREGATE_FUNCTIONS)}.",
+                operation="aggregate_records",
+                collection="record_list",
+                key=name,
+            )
+        if column is None and fn != "count":
+            raise ValidationError(
+                f"Aggregate {fn!r} for metric '{metric}' needs a column: ({fn!r}, column).",
+                operation="aggregate_records",
+                collection="record_list",
+                key=name,
+            )
+        if column is None:
+            aggregates.append(f"m{i} = COUNT(1)")
+        else:
+            aggregates.append(f"m{i} = {template.format(compiler.column(column))}")
+    aql = f"""
+    FOR v IN record
+      FILTER {filters}
+      FILTER __VISIBLE(v)__
+      COLLECT {", ".join(groups)}
+      AGGREGATE {", ".join(aggregates)}
+      RETURN [[{", ".join(f"g{i}" for i in range(len(group_by)))}],
+              [{", ".join(f"m{i}" for i in range(len(metrics)))}]]
+    """
+    snapshot.bind_as_of(db, as_of, bind_vars)
+    names = list(metrics)
+    out = []
+    for keys, values in db.aql.execute(snapshot.apply(aql), bind_vars=bind_vars):
+        row = dict(zip(group_by, keys))
+        row.update(zip(names, values))
+        out.append(row)
+    return out
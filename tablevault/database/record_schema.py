@@ -0,0 +1,163 @@
+import json
+from typing import Any, Callable, Dict, List, Optional, Set
+
+from tablevault.utils.errors import ValidationError
+
+# declared column type -> value check; None values are always allowed
+COLUMN_TYPES: Dict[str, Callable[[Any], bool]] = {
+    "string": lambda v: isinstance(v, str),
+    "int": lambda v: isinstance(v, int) and not isinstance(v, bool),
+    "float": lambda v: isinstance(v, (int, float)) and not isinstance(v, bool),
+    "bool": lambda v: isinstance(v, bool),
+    "json": lambda v: True,
+}
+
+_TRUE = {"true", "1", "yes", "t", "y"}
+_FALSE = {"false", "0", "no", "f", "n"}
+
+
+def _parse_bool(value: str) -> bool:
+    v = value.strip().lower()
+    if v in _TRUE:
+        return True
+    if v in _FALSE:
+        return False
+    raise ValueError(value)
+
+
+# parsers for values read from text sources (CSV); empty strings become None
+_PARSERS: Dict[str, Callable[[str], Any]] = {
+    "string": str,
+    "int": int,
+    "float": float,
+    "bool": _parse_bool,
+    "json": json.loads,
+}
+
+
+def is_typed(record_list: Dict[str, Any]) -> bool:
+    """Typed lists store compact rows: values only, with ``data_text`` from text columns."""
+    return record_list.get("column_types") is not None or (
+        record_list.get("text_columns") is not None
+    )
+
+
+def check_schema(
+    name: str,
+    column_names: List[str],
+    column_types: Optional[Dict[str, str]],
+    text_columns: Optional[List[str]],
+) -> None:
+    def _error(message: str) -> ValidationError:
+        return ValidationError(
+            message, operation="create_record_list", collection="record_list", key=name
+        )
+
+    if column_types is not None:
+        if set(column_types) != set(column_names):
+            raise _error("column_types must declare a type for every column.")
+        unknown = {c: t for c, t in column_types.items() if t not in COLUMN_TYPES}
+        if unknown:
+            raise _error(
+                f"Unknown column types {unknown}; expected one of {list(COLUMN_TYPES)}."
+            )
+    for column in text_columns or []:
+        if column not in column_names:
+            raise _error(f"Text column '{column}' is not one of {column_names}.")
+        if column_types is not None and column_types[column] not in ("string", "json"):
+            raise _error(
+                f"Text column '{column}' has type '{column_types[column]}'; "
+                "text columns must be 'string' or 'json'."
+            )
+
+
+def check_record_columns(
+    name: str, expected: Set[str], record: Dict[str, Any], operation: str
+) -> None:
+    if record.keys() == expected:
+        return
+    provided = set(record.keys())
+    missing = expected - provided
+    extra = provided - expected
+    details = []
+    if missing:
+        details.append(f"missing={sorted(missing)}")
+    if extra:
+        details.append(f"extra={sorted(extra)}")
+    detail_msg = "; ".join(details) if details else "column mismatch"
+    raise ValidationError(
+        f"Record columns do not match record_list '{name}': {detail_msg}.",
+        operation=operation,
+        collection="record_list",
+        key=name,
+    )
+
+
+def validate_records(
+    name: str,
+    record_list: Dict[str, Any],
+    records: List[Dict[str, Any]],
+    operation: str,
+    parse_text: bool = False,
+) -> None:
+    """
+    Check a batch of records against the list's columns and declared types.
+
+    With ``parse_text`` string values of typed columns are parsed in place (values read from
+    CSV); ``json`` columns are decoded from JSON text and empty strings become None.
+    """
+    expected = set(record_list["column_names"])
+    for record in records:
+        check_record_columns(name, expected, record, operation)
+    column_types = record_list.get("column_types")
+    if not column_types:
+        return
+    for column, type_name in column_types.items():
+        if parse_text:
+            parse = _PARSERS[type_name]
+            for row, record in enumerate(records):
+                value = record[column]
+                if isinstance(value, str) and type_name != "string":
+                    try:
+                        record[column] = parse(value) if value != "" else None
+                    except ValueError:
+                        raise _type_error(
+                            name, column, type_name, value, row, operation
+                        ) from None
+        if type_name == "json":
+            continue
+        check = COLUMN_TYPES[type_name]
+        for row, record in enumerate(records):
+            value = record[column]
+            if value is not None and not check(value):
+                raise _type_error(name, column, type_name, value, row, operation)
+
+
+def _type_error(
+    name: str, column: str, type_name: str, value: Any, row: int, operation: str
+) -> ValidationError:
+    return ValidationError(
+        f"Column '{column}' of record_list '{name}' is declared '{type_name}'; "
+        f"row {row} of the batch has {value!r}.",
+        operation=operation,
+        collection="record_list",
+        key=name,
+    )
+
+
+def record_item(record_list: Dict[str, Any], record: Dict[str, Any]) -> Dict[str, Any]:
+    if not is_typed(record_list):
+        return {
+            "data": record,
+            "data_text": str(record),
+            "column_names": list(record.keys()),
+        }
+    item: Dict[str, Any] = {"data": record}
+    text_columns = record_list.get("text_columns") or []
+    if text_columns:
+        item["data_text"] = "\n".join(
+            v if isinstance(v, str) else json.dumps(v)
+            for v in (record[c] for c in text_columns)
+            if v is not None
+        )
+    return item
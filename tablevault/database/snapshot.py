@@ -0,0 +1,60 @@
+import re
+from typing import Any, Dict, Optional
+
+from arango.database import StandardDatabase
+
+_VISIBLE = re.compile(r"__VISIBLE\((\w+)\)__")
+
+
+def get_committed_bound(db: StandardDatabase) -> int:
+    """Smallest timestamp that may still belong to an uncommitted operation."""
+    metadata = db.collection("metadata")
+    doc = metadata.get("global")
+    active = [int(k) for k in doc["active_timestamps"]]
+    if active:
+        return min(active)
+    return int(doc["new_timestamp"])
+
+
+def current_timestamp(db: StandardDatabase) -> int:
+    """Largest timestamp below which every operation has finished."""
+    return get_committed_bound(db) - 1
+
+
+def apply(aql: str) -> str:
+    """
+    Expand ``__VISIBLE(var)__`` markers into the as-of filter for ``var``.
+
+    A document is visible when no snapshot is requested, or when it was written at or
+    before ``@asOf`` by an operation that is not still in progress.
+    """
+    return _VISIBLE.sub(
+        lambda m: (
+            f"(@asOf == null OR ({m.group(1)}.timestamp <= @asOf"
+            f" AND {m.group(1)}.timestamp NOT IN @activeTs))"
+        ),
+        aql,
+    )
+
+
+def bind_as_of(
+    db: StandardDatabase, as_of: Optional[int], bind_vars: Dict[str, Any]
+) -> Dict[str, Any]:
+    bind_vars["asOf"] = as_of
+    active = []
+    if as_of is not None:
+        doc = db.collection("metadata").get("global")
+        active = [int(k) for k in doc["active_timestamps"] if int(k) <= as_of]
+    bind_vars["activeTs"] = active
+    return bind_vars
+
+
+def is_visible(
+    db: StandardDatabase, doc: Optional[Dict[str, Any]], as_of: Optional[int]
+) -> bool:
+    if doc is None:
+        return False
+    if as_of is None:
+        return True
+    active = bind_as_of(db, as_of, {})["activeTs"]
+    return doc["timestamp"] <= as_of and doc["timestamp"] not in active
@@ -0,0 +1,295 @@
+from collections import OrderedDict
+import threading
+import time
+from typing import Any, Dict, List, Optional
+
+from arango.database import StandardDatabase
+from tablevault.database import embedding_storage
+from tablevault.database import snapshot
+from tablevault.utils.errors import NotFoundError, ValidationError
+from tablevault.utils.optional import import_optional
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - optional dependency
+    np = None
+
+
+def _fetch_embeddings(
+    db: StandardDatabase,
+    name: str,
+    n_dim: int,
+    since: int,
+    until: int,
+    batch_size: int = 10000,
+) -> Any:
+    aql = r"""
+    FOR e IN embedding
+      FILTER e.name == @name
+        AND e.timestamp > @since
+        AND e.timestamp < @until
+      SORT e.timestamp ASC
+      RETURN [e.index, e.start_position, __VALUE__]
+    """.replace("__VALUE__", embedding_storage.value_expression("e"))
+    bind_vars = embedding_storage.value_bind_vars(
+        n_dim,
+        {
+            "name": name,
+            "since": since,
+            "until": until,
+        },
+    )
+    return db.aql.execute(aql, bind_vars=bind_vars, batch_size=batch_size)
+
+
+def _normalize_rows(mat: Any) -> Any:
+    norms = np.linalg.norm(mat, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return mat / norms
+
+
+class _CachedList:
+    """In-memory float32 mirror of one embedding list."""
+
+    def __init__(self, name: str, n_dim: int, capacity: int = 1024) -> None:
+        self.name = name
+        self.n_dim = n_dim
+        self.size = 0
+        self.vectors = np.zeros((capacity, n_dim), dtype=np.float32)
+        self.indices = np.zeros(capacity, dtype=np.int64)
+        self.start_positions = np.zeros(capacity, dtype=np.int64)
+        self.rows: Dict[int, int] = {}
+        self.watermark = 0
+        self.last_sync = 0.0
+        self.centroids: Optional[Any] = None
+        self.assignments: Optional[Any] = None
+        self.trained_size = 0
+
+    @property
+    def nbytes(self) -> int:
+        total = self.vectors.nbytes + self.indices.nbytes + self.start_positions.nbytes
+        if self.centroids is not None:
+            total += self.centroids.nbytes + self.assignments.nbytes
+        return total
+
+    def _grow(self, needed: int) -> None:
+        capacity = self.vectors.shape[0]
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        vectors = np.zeros((capacity, self.n_dim), dtype=np.float32)
+        vectors[: self.size] = self.vectors[: self.size]
+        indices = np.zeros(capacity, dtype=np.int64)
+        indices[: self.size] = self.indices[: self.size]
+        start_positions = np.zeros(capacity, dtype=np.int64)
+        start_positions[: self.size] = self.start_positions[: self.size]
+        self.vectors, self.indices, self.start_positions = vectors, indices, start_positions
+        if self.assignments is not None:
+            assignments = np.full(capacity, -1, dtype=np.int64)
+            assignments[: self.size] = self.assignments[: self.size]
+            self.assignments = assignments
+
+    def add_batch(self, rows: List[List[Any]]) -> None:
+        rows = [r for r in rows if r[2] is not None and len(r[2]) == self.n_dim]
+        if not rows:
+            return
+        self._grow(self.size + len(rows))
+        mat = _normalize_rows(np.asarray([r[2] for r in rows], dtype=np.float32))
+        for i, (index, start_position, _) in enumerate(rows):
+            row = self.rows.get(index)
+            if row is None:
+                row = self.size
+                self.size += 1
+                self.rows[index] = row
+            self.vectors[row] = mat[i]
+            self.indices[row] = index
+            self.start_positions[row] = start_position
+            if self.centroids is not None:
+                self.assignments[row] = int(np.argmax(self.centroids @ mat[i]))
+
+    def train(self, n_lists: int, iterations: int = 10, seed: int = 0) -> None:
+        data = self.vectors[: self.size]
+        n_lists = max(1, min(n_lists, self.size))
+        rng = np.random.default_rng(seed)
+        centroids = data[rng.choice(self.size, n_lists, replace=False)].copy()
+        assignments = np.zeros(self.size, dtype=np.int64)
+        for _ in range(iterations):
+            assignments = np.argmax(data @ centroids.T, axis=1)
+            for c in range(n_lists):
+                members = data[assignments == c]
+                if len(members) > 0:
+                    centroids[c] = members.sum(axis=0)
+            centroids = _normalize_rows(centroids).astype(np.float32)
+        self.centroids = centroids
+        self.assignments = np.full(self.vectors.shape[0], -1, dtype=np.int64)
+        self.assignments[: self.size] = assignments
+        self.trained_size = self.size
+
+    def search(
+        self, query: Any, k: int, use_approx: bool, n_probe: int
+    ) -> List[List[Any]]:
+        if self.size == 0:
+            return []
+        if use_approx and self.centroids is not None:
+            probes = np.argsort(-(self.centroids @ query))[:n_probe]
+            candidates = np.nonzero(np.isin(self.assignments[: self.size], probes))[0]
+        else:
+            candidates = np.arange(self.size)
+        if len(candidates) == 0:
+            return []
+        scores = self.vectors[candidates] @ query
+        if len(candidates) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(candidates))
+        top = top[np.argsort(-scores[top])]
+        return [
+            [
+                float(scores[t]),
+                self.name,
+                int(self.indices[candidates[t]]),
+                int(self.start_positions[candidates[t]]),
+            ]
+            for t in top
+        ]
+
+
+class VectorCache:
+    """
+    Local in-process mirror of selected embedding lists.
+
+    Vectors are kept as L2-normalized float32 matrices so cosine similarity is a single
+    matrix-vector product. Lists are synced incrementally from the ``embedding``
+    collection by timestamp and evicted least-recently-used once ``max_bytes`` is exceeded.
+    """
+
+    def __init__(
+        self,
+        db: StandardDatabase,
+        max_bytes: int = 1 << 30,
+        sync_interval: float = 1.0,
+        n_lists: Optional[int] = None,
+        n_probe: int = 4,
+        min_train_size: int = 4096,
+    ) -> None:
+        import_optional("numpy", "vector")
+        self.db = db
+        self.max_bytes = max_bytes
+        self.sync_interval = sync_interval
+        self.n_lists = n_lists
+        self.n_probe = n_probe
+        self.min_train_size = min_train_size
+        self._lists: "OrderedDict[str, _CachedList]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._lists
+
+    @property
+    def nbytes(self) -> int:
+        return sum(c.nbytes for c in self._lists.values())
+
+    def add(self, name: str) -> None:
+        with self._lock:
+            if name not in self._lists:
+                embedding_list = self._get_list_doc(name)
+                self._lists[name] = _CachedList(name, embedding_list["n_dim"])
+            self.sync([name], force=True)
+
+    def remove(self, name: str) -> None:
+        with self._lock:
+            self._lists.pop(name, None)
+
+    def _get_list_doc(self, name: str) -> Dict[str, Any]:
+        embedding_list = self.db.collection("embedding_list").get(name)
+        if embedding_list is None:
+            raise NotFoundError(
+                f"Embedding list '{name}' not found.",
+                operation="vector_cache",
+                collection="embedding_list",
+                key=name,
+            )
+        return embedding_list
+
+    def sync(self, names: Optional[List[str]] = None, force: bool = False) -> None:
+        with self._lock:
+            names = list(self._lists) if names is None else names
+            now = time.time()
+            stale = [
+                n
+                for n in names
+                if n in self._lists
+                and (force or now - self._lists[n].last_sync >= self.sync_interval)
+            ]
+            if not stale:
+                return
+            until = snapshot.get_committed_bound(self.db)
+            for name in stale:
+                self._sync_one(name, until, now)
+            self._evict(keep=stale[-1])
+
+    def _sync_one(self, name: str, until: int, now: float) -> None:
+        cached = self._lists[name]
+        embedding_list = self.db.collection("embedding_list").get(name)
+        if embedding_list is None or embedding_list["deleted"] != -1:
+            del self._lists[name]
+            return
+        if cached.size > 0 and embedding_list["n_items"] <= int(cached.indices[: cached.size].max()):
+            # list shrank (reversed append), reload from scratch
+            cached = _CachedList(name, embedding_list["n_dim"])
+            self._lists[name] = cached
+        if until - 1 > cached.watermark:
+            cursor = _fetch_embeddings(self.db, name, cached.n_dim, cached.watermark, until)
+            batch: List[List[Any]] = []
+            for row in cursor:
+                batch.append(row)
+                if len(batch) >= 10000:
+                    cached.add_batch(batch)
+                    batch = []
+            cached.add_batch(batch)
+            cached.watermark = until - 1
+        n_lists = self.n_lists or int(np.sqrt(cached.size))
+        if cached.size >= self.min_train_size and cached.size >= 2 * cached.trained_size:
+            cached.train(n_lists)
+        cached.last_sync = now
+
+    def _evict(self, keep: str) -> None:
+        while self.nbytes > self.max_bytes and len(self._lists) > 1:
+            name = next(iter(self._lists))
+            if name == keep:
+                self._lists.move_to_end(name)
+                name = next(iter(self._lists))
+            del self._lists[name]
+
+    def query(
+        self,
+        embedding: Any,
+        filtered: Optional[List[str]] = None,
+        k: int = 500,
+        use_approx: bool = False,
+    ) -> List[List[Any]]:
+        """Return ``[name, index, start_position, [], []]`` rows sorted by cosine similarity."""
+        with self._lock:
+            names = list(self._lists) if not filtered else filtered
+            missing = [n for n in names if n not in self._lists]
+            if missing:
+                raise ValidationError(
+                    f"Embedding lists {missing} are not cached.",
+                    operation="vector_cache_query",
+                    collection="embedding_list",
+                )
+            self.sync(names)
+            query = np.asarray(embedding, dtype=np.float32)
+            norm = np.linalg.norm(query)
+            if norm > 0:
+                query = query / norm
+            hits: List[List[Any]] = []
+            for name in names:
+                cached = self._lists.get(name)
+                if cached is None or cached.n_dim != len(query):
+                    continue
+                self._lists.move_to_end(name)
+                hits.extend(cached.search(query, k, use_approx, self.n_probe))
+            hits.sort(key=lambda h: -h[0])
+            return [[h[1], h[2], h[3], [], []] for h in hits[:k]]
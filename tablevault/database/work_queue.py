@@ -0,0 +1,290 @@
+import os
+import socket
+import time
+from typing import Any, Dict, List, Optional
+
+import psutil
+from arango.database import StandardDatabase
+from arango.exceptions import ArangoError, DocumentInsertError
+
+from tablevault.utils.errors import ConflictError, DuplicateItemError, NotFoundError
+
+_UNIQUE_CONSTRAINT_VIOLATED = 1210
+
+
+def _lease_key(queue_name: str, start_index: int) -> str:
+    return f"{queue_name}_{start_index}"
+
+
+def _get_queue(db: StandardDatabase, queue_name: str, operation: str) -> Dict[str, Any]:
+    queue = db.collection("work_queue").get(queue_name)
+    if queue is None:
+        raise NotFoundError(
+            f"Work queue '{queue_name}' does not exist.",
+            operation=operation,
+            collection="work_queue",
+            key=queue_name,
+        )
+    return queue
+
+
+def create_work_queue(
+    db: StandardDatabase,
+    queue_name: str,
+    source: str,
+    process_name: str,
+    process_index: int,
+    chunk_size: int = 100,
+) -> None:
+    items = db.collection("items").get(source)
+    if items is None:
+        raise NotFoundError(
+            f"Item list '{source}' does not exist.",
+            operation="create_work_queue",
+            collection="items",
+            key=source,
+        )
+    doc = {
+        "_key": queue_name,
+        "name": queue_name,
+        "source": source,
+        "dtype": items["collection"].split("_")[0],
+        "chunk_size": chunk_size,
+        "next_index": 0,
+        "process_name": process_name,
+        "process_index": process_index,
+    }
+    try:
+        db.collection("work_queue").insert(doc)
+    except DocumentInsertError as e:
+        if e.error_code != _UNIQUE_CONSTRAINT_VIOLATED:
+            raise
+        raise DuplicateItemError(
+            f"Work queue '{queue_name}' already exists.",
+            operation="create_work_queue",
+            collection="work_queue",
+            key=queue_name,
+        ) from None
+
+
+class WorkLease:
+    """
+    A leased range ``[start_index, end_index)`` of a work queue's source list.
+
+    The lease is held by one worker until ``expires`` (seconds since the epoch); ``renew``
+    extends it. Writing each output at the index of its input (``index=`` on the append
+    methods) makes re-running a range after a lost lease idempotent.
+    """
+
+    def __init__(self, db: StandardDatabase, queue: Dict[str, Any], doc: Dict[str, Any]) -> None:
+        self.db = db
+        self.queue_name: str = queue["name"]
+        self.source: str = queue["source"]
+        self.key: str = doc["_key"]
+        self.worker_id: str = doc["worker_id"]
+        self.start_index: int = doc["start_index"]
+        self.end_index: int = doc["end_index"]
+        self.expires: float = doc["expires"]
+        self.attempt: int = doc["attempts"]
+        self._rev: str = doc["_rev"]
+        # [index, start_position, end_position] of every source item in the range
+        self.items: List[List[int]] = list(
+            db.aql.execute(
+                r"""
+                FOR i IN @start..(@end - 1)
+                  LET v = DOCUMENT(@coll, CONCAT(@name, "_", i))
+                  FILTER v != null
+                  RETURN [v.index, v.start_position, v.end_position]
+                """,
+                bind_vars={
+                    "start": self.start_index,
+                    "end": self.end_index,
+                    "coll": queue["dtype"],
+                    "name": self.source,
+                },
+            )
+        )
+
+    @property
+    def input_items(self) -> Dict[str, List[int]]:
+        """Lineage of an output derived from the whole range."""
+        if not self.items:
+            return {}
+        return {self.source: [self.items[0][1], self.items[-1][2]]}
+
+    def item_inputs(self, index: int) -> Dict[str, List[int]]:
+        """Lineage of an output derived from source item ``index`` alone."""
+        for i, start, end in self.items:
+            if i == index:
+                return {self.source: [start, end]}
+        raise NotFoundError(
+            f"Index {index} is not part of lease '{self.key}'.",
+            operation="item_inputs",
+            collection="work_lease",
+            key=self.key,
+        )
+
+    def _update(self, patch: Dict[str, Any], operation: str) -> None:
+        patch = {"_key": self.key, "_rev": self._rev, **patch}
+        try:
+            result = self.db.collection("work_lease").update(patch, check_rev=True)
+        except ArangoError:
+            raise ConflictError(
+                f"Lease '{self.key}' was reassigned after it expired.",
+                operation=operation,
+                collection="work_lease",
+                key=self.key,
+            ) from None
+        self._rev = result["_rev"]
+
+    def renew(self, lease_seconds: float = 600) -> None:
+        self.expires = time.time() + lease_seconds
+        self._update({"expires": self.expires}, "renew_lease")
+
+    def complete(self) -> None:
+        self._update({"status": "done", "completed": time.time()}, "complete_work")
+
+    def release(self) -> None:
+        """Give the range back immediately, e.g. after a failure."""
+        self._update({"expires": 0}, "release_work")
+
+
+def _reclaimable(lease: Dict[str, Any], now: float, host: str) -> bool:
+    if lease["expires"] < now:
+        return True
+    # a dead holder on this machine does not need to wait out its lease
+    return lease["host"] == host and not psutil.pid_exists(lease["pid"])
+
+
+def _claim(
+    db: StandardDatabase,
+    queue: Dict[str, Any],
+    worker_id: str,
+    process_name: str,
+    process_index: int,
+    lease_seconds: float,
+) -> Optional[WorkLease]:
+    leases = db.collection("work_lease")
+    now = time.time()
+    host = socket.gethostname()
+    stale = db.aql.execute(
+        r"""
+        FOR l IN work_lease
+          FILTER l.queue == @queue AND l.status == "leased"
+          FILTER l.expires < @now OR l.host == @host
+          SORT l.start_index ASC
+          RETURN l
+        """,
+        bind_vars={"queue": queue["name"], "now": now, "host": host},
+    )
+    holder = {
+        "status": "leased",
+        "worker_id": worker_id,
+        "process_name": process_name,
+        "process_index": process_index,
+        "pid": os.getpid(),
+        "host": host,
+        "expires": now + lease_seconds,
+    }
+    for lease in stale:
+        if not _reclaimable(lease, now, host):
+            continue
+        lease.update(holder)
+        lease["attempts"] += 1
+        try:
+            meta = leases.update(lease, check_rev=True)
+        except ArangoError:
+            continue  # another worker reclaimed it first
+        lease["_rev"] = meta["_rev"]
+        return WorkLease(db, queue, lease)
+
+    n_items = db.collection(f"{queue['dtype']}_list").get(queue["source"])["n_items"]
+    start = queue["next_index"]
+    while start < n_items:
+        end = min(start + queue["chunk_size"], n_items)
+        doc = {
+            "_key": _lease_key(queue["name"], start),
+            "queue": queue["name"],
+            "start_index": start,
+            "end_index": end,
+            "attempts": 1,
+            **holder,
+        }
+        try:
+            meta = leases.insert(doc)
+        except DocumentInsertError as e:
+            if e.error_code != _UNIQUE_CONSTRAINT_VIOLATED:
+                raise
+            # leased concurrently; skip past it
+            start = leases.get(doc["_key"])["end_index"]
+            continue
+        _advance(db, queue["name"], end)
+        doc["_rev"] = meta["_rev"]
+        return WorkLease(db, queue, doc)
+    return None
+
+
+def _advance(db: StandardDatabase, queue_name: str, next_index: int) -> None:
+    """Move the queue cursor forward; a lost race only costs the next leaser a skip."""
+    db.aql.execute(
+        r"""
+        LET q = DOCUMENT("work_queue", @name)
+        FILTER q.next_index < @next
+        UPDATE q WITH { next_index: @next } IN work_queue OPTIONS { ignoreErrors: true }
+        """,
+        bind_vars={"name": queue_name, "next": next_index},
+    )
+
+
+def lease_work(
+    db: StandardDatabase,
+    queue_name: str,
+    worker_id: str,
+    process_name: str,
+    process_index: int,
+    lease_seconds: float = 600,
+) -> Optional[WorkLease]:
+    """
+    Lease the next range of a work queue, or None when every range is leased or done.
+
+    Expired leases, and leases whose holder process on this host has died, are reassigned
+    before new ranges are handed out. New items appended to the source list become new ranges.
+    """
+    queue = _get_queue(db, queue_name, "lease_work")
+    return _claim(db, queue, worker_id, process_name, process_index, lease_seconds)
+
+
+def work_queue_status(db: StandardDatabase, queue_name: str) -> Dict[str, Any]:
+    queue = _get_queue(db, queue_name, "work_queue_status")
+    n_items = db.collection(f"{queue['dtype']}_list").get(queue["source"])["n_items"]
+    counts = next(
+        db.aql.execute(
+            r"""
+            LET now = @now
+            LET rows = (
+              FOR l IN work_lease
+                FILTER l.queue == @queue
+                COLLECT state = (l.status == "done" ? "done"
+                                 : (l.expires < now ? "expired" : "leased"))
+                AGGREGATE n = COUNT(1), items = SUM(l.end_index - l.start_index)
+                RETURN { state, n, items }
+            )
+            RETURN rows
+            """,
+            bind_vars={"queue": queue_name, "now": time.time()},
+        )
+    )
+    status: Dict[str, Any] = {
+        "source": queue["source"],
+        "n_items": n_items,
+        "done": 0,
+        "leased": 0,
+        "expired": 0,
+        "done_items": 0,
+    }
+    for row in counts:
+        status[row["state"]] = row["n"]
+        if row["state"] == "done":
+            status["done_items"] = row["items"]
+    status["unleased_items"] = max(n_items - queue["next_index"], 0)
+    return status
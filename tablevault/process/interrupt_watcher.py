@@ -0,0 +1,59 @@
+import threading
+import warnings
+from typing import Any, Callable, Dict, Optional
+
+from arango.database import StandardDatabase
+from tablevault.database import process_collection
+
+
+class InterruptWatcher:
+    """
+    Polls a process's interrupt request on a background thread and caches it locally.
+
+    ``checkpoint`` only reads the cached state, so it is cheap enough for hot loops; a pause
+    or stop request takes effect at the first checkpoint after the next poll, i.e. within
+    ``poll_interval`` seconds.
+    """
+
+    def __init__(
+        self,
+        db: StandardDatabase,
+        name: str,
+        poll_interval: float = 0.5,
+        quiesce: Optional[Callable[[], None]] = None,
+    ) -> None:
+        self.db = db
+        self.name = name
+        self.poll_interval = poll_interval
+        self.quiesce = quiesce
+        self._state: Optional[Dict[str, Any]] = None
+        self._handled_rev: Optional[str] = None
+        self._stop = threading.Event()
+        self.refresh()
+        self._thread = threading.Thread(
+            target=self._run, name=f"tablevault-interrupts-{name}", daemon=True
+        )
+        self._thread.start()
+
+    def refresh(self) -> None:
+        self._state = process_collection.get_interrupt_state(self.db, self.name)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.poll_interval):
+            try:
+                self.refresh()
+            except Exception as e:
+                warnings.warn(f"TableVault could not poll interrupts for '{self.name}': {e}")
+
+    def checkpoint(self) -> None:
+        state = self._state
+        if state is None or state["interrupt_request"] == "":
+            return
+        if state["rev"] == self._handled_rev:
+            # a pause we already served; the resumer clears it after resuming us
+            return
+        if process_collection.apply_interrupt(state, self.quiesce):
+            self._handled_rev = state["rev"]
+
+    def close(self) -> None:
+        self._stop.set()
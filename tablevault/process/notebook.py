@@ -1,16 +1,95 @@
-from typing import Any, Optional
+from typing import Any, Optional, Set, Tuple
+import atexit
+import queue
 import re
+import threading
+import warnings
 
 
 from arango.database import StandardDatabase
 from IPython import get_ipython
 from IPython.core.interactiveshell import InteractiveShell
 from tablevault.database import process_collection
+from tablevault.process.telemetry import StepTelemetry
 
 def extract_star_block(s: str) -> str:
     match = re.search(r'"""\*(.*?)\*"""', s, re.DOTALL)
     return match.group(1).strip() if match else s
 
+
+class CellRecorder:
+    """
+    Records cell start/end events on a background thread.
+
+    Events are written in submission order by a single worker; the queue is bounded, so a
+    stalled database eventually applies back-pressure instead of growing without limit.
+    """
+
+    _STOP = object()
+
+    def __init__(self, db: StandardDatabase, name: str, max_pending: int = 1000) -> None:
+        self.db = db
+        self.name = name
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max_pending)
+        # cells whose start was not recorded; their end event has no document to complete
+        self._failed_starts: Set[int] = set()
+        self._thread = threading.Thread(
+            target=self._run, name=f"tablevault-cells-{name}", daemon=True
+        )
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        while True:
+            event = self._queue.get()
+            try:
+                if event is self._STOP:
+                    return
+                self._record(event)
+            finally:
+                self._queue.task_done()
+
+    def _record(self, event: Tuple[Any, ...]) -> None:
+        kind, index, _ = event
+        try:
+            self._write(event)
+        except Exception as e:
+            if kind == "start":
+                self._failed_starts.add(index)
+            warnings.warn(f"TableVault could not record notebook cell {index}: {e}")
+
+    def _write(self, event: Tuple[Any, ...]) -> None:
+        kind, index, payload = event
+        if kind == "end" and index in self._failed_starts:
+            self._failed_starts.discard(index)
+            return
+        if kind == "start":
+            process_collection.process_add_code_start(
+                self.db, self.name, payload, "", 0, index=index
+            )
+        else:
+            error, telemetry = payload
+            process_collection.process_add_code_end(
+                self.db, self.name, index, error=error, telemetry=telemetry
+            )
+
+    def submit(self, kind: str, index: int, payload: Any) -> None:
+        if not self._thread.is_alive():
+            self._record((kind, index, payload))
+            return
+        self._queue.put((kind, index, payload))
+
+    def flush(self) -> None:
+        """Block until every submitted event has been written."""
+        if self._thread.is_alive():
+            self._queue.join()
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join()
+
+
 class ProcessNotebook:
     def __init__(self, db: StandardDatabase, name: str, user_id: str, parent_process_name: str, parent_process_index: int, is_experiment: bool) -> None:
         self.ip: InteractiveShell = get_ipython()
@@ -24,28 +103,37 @@ class ProcessNotebook:
         self._installed: bool = True
         self.user_id: str = user_id
         process_collection.create_process(db, name, user_id, "notebook", parent_process_name, parent_process_index)
+        # cell indices are reserved locally; this notebook is the only writer of its list
+        self._next_index: int = db.collection("process_list").get(name)["n_items"]
+        self.recorder = CellRecorder(db, name)
         self.ip.events.register("pre_run_cell", self.pre_run_cell)
         self.ip.events.register("post_run_cell", self.post_run_cell)
         self.current_index: Optional[int] = None
+        self._telemetry: Optional[StepTelemetry] = None
 
     def pre_run_cell(self, info: Any) -> None:
         final_code = info.raw_cell
         if self.is_experiment:
             final_code = extract_star_block(final_code)
-        self.current_index = process_collection.process_add_code_start(
-            self.db, self.name, final_code, "", 0
-        )
+        self.current_index = self._next_index
+        self._next_index += 1
+        self.recorder.submit("start", self.current_index, final_code)
         print("\n---[ TableVault Record ]---")
+        self._telemetry = StepTelemetry().start()
 
     def post_run_cell(self, result: Any) -> None:
         if self.current_index is None:
             return
+        telemetry = self._telemetry.stop() if self._telemetry is not None else None
+        self._telemetry = None
         err = result.error_before_exec or result.error_in_exec
         if err is None:
             err_msg = ""
         else:
             err_msg = str(err)
-        process_collection.process_add_code_end(
-            self.db, self.name, self.current_index, error=err_msg
-        )
+        self.recorder.submit("end", self.current_index, (err_msg, telemetry))
         print("---[ TableVault Record ]---\n")
+
+    def flush(self) -> None:
+        """Wait until all recorded cells have been written to the database."""
+        self.recorder.flush()
@@ -5,6 +5,7 @@ import traceback
 from dataclasses import dataclass
 from typing import Optional, Type
 from tablevault.database import process_collection
+from tablevault.process.telemetry import StepTelemetry
 import re
 
 def extract_star_block(s: str) -> str:
@@ -35,6 +36,7 @@ class ProcessScript:
         self.user_id = user_id
         self.is_experiment = is_experiment
         self.current_index = None
+        self._telemetry: Optional[StepTelemetry] = None
         self._uncaught: Optional[Uncaught] = None
         self._prev_excepthook = sys.excepthook
 
@@ -69,6 +71,7 @@ class ProcessScript:
             0,
         )
         print("\n---[ TableVault Record ]---")
+        self._telemetry = StepTelemetry().start()
 
     def _excepthook(self, exc_type, exc, tb):
         self._uncaught = Uncaught(exc_type, exc, tb)
@@ -77,6 +80,7 @@ class ProcessScript:
     def _atexit_finalize(self):
         if self.current_index is None:
             return
+        telemetry = self._telemetry.stop() if self._telemetry is not None else None
 
         if self._uncaught is None:
             err_msg = ""
@@ -91,5 +95,6 @@ class ProcessScript:
             self.name,
             self.current_index,
             error=err_msg,
+            telemetry=telemetry,
         )
         print("---[ TableVault Record ]---\n")
@@ -0,0 +1,165 @@
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import psutil
+
+T = TypeVar("T")
+
+# the step (cell or script) currently executing in this Python process
+_active: Optional["StepTelemetry"] = None
+_depth = threading.local()
+
+# RSS sampling period when the kernel's peak counter cannot be reset
+SAMPLE_INTERVAL = 0.05
+
+
+def _reset_peak_rss() -> bool:
+    """Reset this process's peak RSS (VmHWM) to its current RSS; Linux only."""
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _peak_rss() -> Optional[int]:
+    """VmHWM of this process in bytes, or None when unavailable."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+class _RssSampler(threading.Thread):
+    """Polls RSS in the background and keeps the largest value seen."""
+
+    def __init__(self, proc: psutil.Process, interval: float) -> None:
+        super().__init__(name="tablevault-rss-sampler", daemon=True)
+        self._proc = proc
+        self._interval = interval
+        self._stop_event = threading.Event()
+        self.peak = proc.memory_info().rss
+
+    def run(self) -> None:
+        while not self._stop_event.wait(self._interval):
+            try:
+                self.peak = max(self.peak, self._proc.memory_info().rss)
+            except psutil.Error:
+                return
+
+    def stop(self) -> int:
+        self._stop_event.set()
+        self.join()
+        return self.peak
+
+
+def _io_counters(proc: psutil.Process) -> Optional[Any]:
+    try:
+        return proc.io_counters()
+    except (AttributeError, psutil.Error):  # not available on macOS
+        return None
+
+
+class StepTelemetry:
+    """
+    Resource usage of one recorded step, measured between ``start`` and ``stop``.
+
+    CPU, memory and I/O are process-wide counters, so work done by other threads during the
+    step is included. ``max_rss`` is the peak within the step: on Linux the kernel's peak
+    counter is reset at ``start``; elsewhere RSS is sampled every ``sample_interval`` seconds,
+    which can miss spikes shorter than that. ``vault_calls``/``vault_call_time`` count the
+    public Vault methods called while the step is active (nested calls count once).
+    """
+
+    def __init__(self, sample_interval: float = SAMPLE_INTERVAL) -> None:
+        self._proc = psutil.Process()
+        self._sample_interval = sample_interval
+        self._sampler: Optional[_RssSampler] = None
+        self._kernel_peak = False
+        self.vault_calls = 0
+        self.vault_call_time = 0.0
+        self._lock = threading.Lock()
+        self._wall: float = 0.0
+        self._cpu: Any = None
+        self._io: Any = None
+
+    def start(self) -> "StepTelemetry":
+        global _active
+        self._wall = time.perf_counter()
+        self._cpu = self._proc.cpu_times()
+        self._io = _io_counters(self._proc)
+        self._kernel_peak = _reset_peak_rss() and _peak_rss() is not None
+        if not self._kernel_peak:
+            self._sampler = _RssSampler(self._proc, self._sample_interval)
+            self._sampler.start()
+        _active = self
+        return self
+
+    def record_call(self, seconds: float) -> None:
+        with self._lock:
+            self.vault_calls += 1
+            self.vault_call_time += seconds
+
+    def stop(self) -> Dict[str, Any]:
+        global _active
+        if _active is self:
+            _active = None
+        wall = time.perf_counter() - self._wall
+        cpu = self._proc.cpu_times()
+        rss = self._proc.memory_info().rss
+        peak = _peak_rss() if self._kernel_peak else None
+        if self._sampler is not None:
+            peak = self._sampler.stop()
+            self._sampler = None
+        out: Dict[str, Any] = {
+            "wall_time": wall,
+            "cpu_user": cpu.user - self._cpu.user,
+            "cpu_system": cpu.system - self._cpu.system,
+            "rss": rss,
+            "max_rss": max(rss, peak or 0),
+            "vault_calls": self.vault_calls,
+            "vault_call_time": self.vault_call_time,
+        }
+        io = _io_counters(self._proc)
+        if io is not None and self._io is not None:
+            out["read_bytes"] = io.read_bytes - self._io.read_bytes
+            out["write_bytes"] = io.write_bytes - self._io.write_bytes
+            out["read_count"] = io.read_count - self._io.read_count
+            out["write_count"] = io.write_count - self._io.write_count
+        return out
+
+
+def timed(func: Callable[..., T]) -> Callable[..., T]:
+    """Count a call to ``func`` and its latency against the active step."""
+
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> T:
+        step = _active
+        depth = getattr(_depth, "value", 0)
+        if step is None or depth:
+            return func(*args, **kwargs)
+        _depth.value = depth + 1
+        t0 = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            _depth.value = depth
+            step.record_call(time.perf_counter() - t0)
+
+    return wrapper
+
+
+def timed_methods(cls: type) -> type:
+    """Apply ``timed`` to every public method defined on ``cls``."""
+    for attr, value in list(vars(cls).items()):
+        if attr.startswith("_") or not callable(value):
+            continue
+        setattr(cls, attr, timed(value))
+    return cls
@@ -0,0 +1,92 @@
+import functools
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+import psutil
+from arango.database import StandardDatabase
+
+from tablevault.database import create_database, process_collection
+from tablevault.database.log_helper import utils
+
+T = TypeVar("T")
+
+
+class WorkerProcess:
+    """Stands in for ProcessNotebook/ProcessScript: a fixed step of the parent process."""
+
+    def __init__(self, current_index: Optional[int]) -> None:
+        self.current_index = current_index
+
+
+def attributed(func: Callable[..., T]) -> Callable[..., T]:
+    """Attribute the writes of a worker method call to ``self.worker_id``."""
+
+    @functools.wraps(func)
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> T:
+        token = utils.current_worker.set(self.worker_id)
+        try:
+            return func(self, *args, **kwargs)
+        finally:
+            utils.current_worker.reset(token)
+
+    return wrapper
+
+
+def attributed_methods(cls: type) -> type:
+    """Apply ``attributed`` to every public method ``cls`` inherits or defines."""
+    for klass in reversed(cls.__mro__[:-1]):
+        for attr, value in vars(klass).items():
+            if attr.startswith("_") or not callable(value) or attr in vars(cls):
+                continue
+            setattr(cls, attr, attributed(value))
+    return cls
+
+
+def default_worker_id() -> str:
+    return f"{os.getpid()}.{threading.get_ident()}"
+
+
+# connection settings carried by a worker spec; the HTTP settings are optional
+CONNECTION_KEYS = (
+    "arango_url",
+    "arango_db",
+    "arango_username",
+    "arango_password",
+    "pool_size",
+    "request_timeout",
+    "retry_attempts",
+    "compression_threshold",
+)
+_HTTP_KEYS = CONNECTION_KEYS[4:]
+
+
+def connect(spec: Dict[str, Any]) -> StandardDatabase:
+    return create_database.get_arango_db(
+        spec["arango_db"],
+        spec["arango_url"],
+        spec["arango_username"],
+        spec["arango_password"],
+        "",
+        "",
+        new_arango_db=False,
+        **{k: spec[k] for k in _HTTP_KEYS if k in spec},
+    )
+
+
+def worker_checkpoint(db: StandardDatabase, name: str, poll_interval: float) -> None:
+    """
+    Honour stop/pause requests on the parent process from inside a worker.
+
+    A worker may be another OS process, so it cannot rely on the parent being suspended: it
+    waits while a pause is pending and terminates itself on a stop.
+    """
+    while True:
+        state = process_collection.get_interrupt_state(db, name)
+        if state["interrupt_request"] == "":
+            return
+        if state["interrupt_action"] == "stop":
+            psutil.Process(os.getpid()).terminate()
+            return
+        time.sleep(poll_interval)
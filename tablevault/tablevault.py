@@ -1,8 +1,9 @@
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 from arango.database import StandardDatabase
 from tablevault.types import InputItems
 from tablevault.utils.errors import ValidationError, NotFoundError
+from tablevault.utils.optional import import_optional
 
 from tablevault.database import (
     create_database,
@@ -13,9 +14,21 @@ from tablevault.database import (
     query_collection_simple,
     query_description,
     database_restart,
+    vector_cache,
+    lineage_closure,
+    snapshot,
+    change_feed,
+    columnar_export,
+    bulk_import,
+    query_record_data,
+    work_queue,
+    memo,
 )
 from tablevault.process.notebook import ProcessNotebook
 from tablevault.process.script import ProcessScript
+from tablevault.process.interrupt_watcher import InterruptWatcher
+from tablevault.process.telemetry import timed_methods
+from tablevault.process import worker
 
 import threading
 
@@ -30,6 +43,7 @@ def is_ipython() -> bool:
         return False
 
 
+@timed_methods
 class Vault:
     """
     Vault for tracking ML items and their lineage.
@@ -45,6 +59,7 @@ class Vault:
     """
     _instance: Optional["Vault"] = None
     _lock: threading.Lock = threading.Lock()
+    _init_lock: threading.Lock = threading.Lock()
     _allowed_key: Optional[Tuple[str, str, str, str]] = None
 
     def __new__(
@@ -63,6 +78,11 @@ class Vault:
         description_embedding_size: int = 1024,
         log_file_location: str = "~/.tablevault/logs/",
         is_experiment: bool = True,
+        interrupt_poll_interval: Optional[float] = 0.5,
+        pool_size: int = 32,
+        request_timeout: Optional[float] = 60,
+        retry_attempts: int = 3,
+        compression_threshold: Optional[int] = None,
     ) -> "Vault":
         key = (user_id, process_name, arango_db, arango_url)
         with cls._lock:
@@ -97,12 +117,21 @@ class Vault:
         description_embedding_size: int = 1024,
         log_file_location: str = "~/.tablevault/logs/",
         is_experiment: bool = True,
+        interrupt_poll_interval: Optional[float] = 0.5,
+        pool_size: int = 32,
+        request_timeout: Optional[float] = 60,
+        retry_attempts: int = 3,
+        compression_threshold: Optional[int] = None,
     ) -> None:
         """
         Initialize the Vault singleton.
 
         Note: Arango database must be active with matching sign-in information.
 
+        The vault is safe to share between threads: each call works on its own operation
+        timestamp and list lock, and ``process.current_index`` is only changed by the
+        recorded notebook/script, never by vault calls.
+
         Args:
             user_id: Unique identifier for the user.
             process_name: Name for this process.
@@ -117,31 +146,63 @@ class Vault:
             arango_root_password: Root password for database creation.
             description_embedding_size: Dimension of description embeddings.
             log_file_location: Directory for log files.
-            
+            is_experiment: Only record the code inside a triple-quoted star block when present.
+            interrupt_poll_interval: Seconds between background polls for stop/pause requests,
+                which bounds how late ``checkpoint_execution`` acts on them. None reads the
+                request on every checkpoint instead.
+            pool_size: HTTP connections kept open to the server; size it to the number of
+                threads that call the vault concurrently.
+            request_timeout: Seconds before a database request times out.
+            retry_attempts: Retries for requests failing on connection errors.
+            compression_threshold: Deflate-compress request bodies larger than this many
+                bytes (and ask for compressed responses). None disables compression.
         """
         self.name: str = process_name
         self.user_id: str = user_id
         self.is_experiment = is_experiment
-        if getattr(self, "_initialized", True):
-            return
-        self._initialized: bool = True
-        self.db: StandardDatabase = create_database.get_arango_db(
-            arango_db,
-            arango_url,
-            arango_username,
-            arango_password,
-            arango_root_username,
-            arango_root_password,
-            new_arango_db,
-        )
-        if new_arango_db:
-            create_database.create_tablevault_db(
-                self.db, log_file_location, description_embedding_size
+        with Vault._init_lock:
+            if getattr(self, "_initialized", True):
+                return
+            self._initialized: bool = True
+            self.db: StandardDatabase = create_database.get_arango_db(
+                arango_db,
+                arango_url,
+                arango_username,
+                arango_password,
+                arango_root_username,
+                arango_root_password,
+                new_arango_db,
+                pool_size=pool_size,
+                request_timeout=request_timeout,
+                retry_attempts=retry_attempts,
+                compression_threshold=compression_threshold,
             )
-        if is_ipython():
-            self.process = ProcessNotebook(self.db, self.name, self.user_id, parent_process_name, parent_process_index, is_experiment)
-        else:
-            self.process = ProcessScript(self.db, self.name, self.user_id, parent_process_name, parent_process_index, is_experiment)
+            if new_arango_db:
+                create_database.create_tablevault_db(
+                    self.db, log_file_location, description_embedding_size
+                )
+            else:
+                create_database.ensure_tablevault_db(self.db)
+            self._connection: Dict[str, Any] = {
+                "arango_url": arango_url,
+                "arango_db": arango_db,
+                "arango_username": arango_username,
+                "arango_password": arango_password,
+                "pool_size": pool_size,
+                "request_timeout": request_timeout,
+                "retry_attempts": retry_attempts,
+                "compression_threshold": compression_threshold,
+            }
+            self._vector_cache: Optional[vector_cache.VectorCache] = None
+            if is_ipython():
+                self.process = ProcessNotebook(self.db, self.name, self.user_id, parent_process_name, parent_process_index, is_experiment)
+            else:
+                self.process = ProcessScript(self.db, self.name, self.user_id, parent_process_name, parent_process_index, is_experiment)
+            self._interrupt_watcher: Optional[InterruptWatcher] = None
+            if interrupt_poll_interval is not None:
+                self._interrupt_watcher = InterruptWatcher(
+                    self.db, self.name, interrupt_poll_interval, self._quiesce_writes
+                )
 
     def get_current_operations(self) -> Dict[str, Any]:
         """Get all currently active operations."""
@@ -149,6 +210,53 @@ class Vault:
         doc = metadata.get("global")
         return doc["active_timestamps"]
 
+    def changes(
+        self,
+        since: int = 0,
+        collections: Optional[List[str]] = None,
+        follow: bool = False,
+        poll_interval: float = 1.0,
+        window: int = 1000,
+        batch_size: int = 1000,
+    ) -> change_feed.ChangeFeed:
+        """
+        Iterate over committed changes after a timestamp, in timestamp order.
+
+        Events are read through timestamp indexes in windows of ``window`` timestamps and only
+        up to ``get_current_timestamp``, so in-progress operations are never returned.
+
+        Args:
+            since: Exclusive lower timestamp bound (a previous ``checkpoint``).
+            collections: List types to include (e.g. ``["embedding_list"]``); all if None.
+            follow: Keep polling for new changes instead of stopping at the current state.
+            poll_interval: Seconds between polls when ``follow`` is set.
+            window: Number of timestamps read per query.
+            batch_size: Number of events fetched per round trip.
+
+        Returns:
+            An iterable ``ChangeFeed`` of event dicts with keys ``timestamp``, ``operation``
+            (``"create"``, ``"append"``, ``"description"`` or ``"delete"``), ``collection``,
+            ``name``, ``index``, ``start_position`` and ``end_position`` (plus
+            ``description`` for description events). Its ``checkpoint`` attribute is the
+            highest timestamp whose events have all been yielded; pass it back as ``since``
+            to resume.
+        """
+        return change_feed.ChangeFeed(
+            self.db, since, collections, follow, poll_interval, window, batch_size
+        )
+
+    def get_current_timestamp(self) -> int:
+        """
+        Get a snapshot timestamp for repeatable reads.
+
+        Every operation at or below the returned timestamp has finished, so passing it as
+        ``as_of`` to query methods gives the same results regardless of later writes.
+
+        Returns:
+            The snapshot timestamp.
+        """
+        return snapshot.current_timestamp(self.db)
+
     def _ensure_item_exists(self, item_name: str, *, operation: str) -> None:
         items = self.db.collection("items")
         if items.get(item_name) is None:
@@ -169,16 +277,32 @@ class Vault:
                 key=process_name,
             )
 
-    def vault_cleanup(self, interval: int = 60, selected_timestamps: Optional[List[int]] = None) -> None:
+    def vault_cleanup(
+        self,
+        interval: int = 60,
+        selected_timestamps: Optional[List[int]] = None,
+        parallelism: int = 8,
+        progress: Optional[Callable[[int, int], None]] = None,
+    ) -> Dict[str, Any]:
         """
         Clean up stale operations that have exceeded the interval.
 
+        Operations on the same item are undone in timestamp order; operations on different
+        items are undone concurrently.
+
         Args:
             interval: Time in seconds after which an operation is considered stale.
             selected_timestamps: If provided, only clean up these specific timestamps.
+            parallelism: Number of items whose stale operations are undone at once.
+            progress: Optional callback ``progress(done, total)`` called as items finish.
+
+        Returns:
+            Counts of ``stale``, ``restarted`` and ``failed`` operations, the number of item
+            ``groups``, counts ``by_type`` of operation, ``elapsed`` seconds and
+            ``ops_per_second``.
         """
-        database_restart.function_restart(
-            self.db, interval, self.name, selected_timestamps
+        return database_restart.function_restart(
+            self.db, interval, self.name, selected_timestamps, parallelism, progress
         )
 
     def delete_list(self, item_name: str) -> None:
@@ -278,16 +402,34 @@ class Vault:
             input_items,
         )
 
-    def create_embedding_list(self, item_name: str, ndim: int) -> None:
+    def create_embedding_list(
+        self,
+        item_name: str,
+        ndim: int,
+        storage: str = "float",
+        keep_full_precision: Optional[bool] = None,
+    ) -> None:
         """
         Create a new embedding list.
 
         Args:
             item_name: Unique name for the embedding list.
             ndim: Dimensionality of the embeddings in this list.
+            storage: ``"float"`` (full precision only), ``"int8"`` (per-vector scaled int8
+                codes) or ``"binary"`` (packed sign bits) used for candidate search.
+            keep_full_precision: Also store the full-precision vector for rescoring.
+                Defaults to False for ``"int8"`` (content queries return dequantized
+                values) and True otherwise; required for ``"binary"``. Keeping it stores
+                both representations, so the list takes more space than a ``"float"`` one.
         """
         item_collection.create_embedding_list(
-            self.db, item_name, self.name, self.process.current_index, ndim
+            self.db,
+            item_name,
+            self.name,
+            self.process.current_index,
+            ndim,
+            storage,
+            keep_full_precision,
         )
 
     def append_embedding(
@@ -328,16 +470,78 @@ class Vault:
             index_rebuild_count,
         )
 
-    def create_record_list(self, item_name: str, column_names: List[str]) -> None:
+    def append_embeddings(
+        self,
+        item_name: str,
+        embeddings: Any,
+        input_items: Optional[Union[InputItems, List[Optional[InputItems]]]] = None,
+        build_idx: bool = True,
+        index_rebuild_count: int = 10000,
+        chunk_size: int = 1000,
+        precision: Optional[int] = None,
+    ) -> int:
+        """
+        Append a batch of embedding vectors to an embedding list as one operation.
+
+        Args:
+            item_name: Name of the embedding list to append to.
+            embeddings: 2-D NumPy array (or list of vectors) with one row per embedding.
+            input_items: One dependency mapping applied to every row, or one mapping per row.
+            build_idx: Whether to rebuild the vector index.
+            index_rebuild_count: Threshold for triggering index rebuild.
+            chunk_size: Number of rows written per bulk import.
+            precision: Optional number of decimals to round values to before storing.
+
+        Returns:
+            Index of the first appended embedding.
+        """
+        return item_collection.append_embeddings(
+            self.db,
+            item_name,
+            embeddings,
+            self.name,
+            self.process.current_index,
+            input_items,
+            build_idx,
+            index_rebuild_count,
+            chunk_size,
+            precision,
+        )
+
+    def create_record_list(
+        self,
+        item_name: str,
+        column_names: List[str],
+        indexed_columns: Optional[List[str]] = None,
+        column_types: Optional[Dict[str, str]] = None,
+        text_columns: Optional[List[str]] = None,
+    ) -> None:
         """
         Create a new record list with specified column names.
 
+        Declaring ``column_types`` or ``text_columns`` makes the list typed: records are
+        validated against the schema (in batches on import) and each stored row holds only
+        its values, with full-text search limited to the ``text_columns``.
+
         Args:
             item_name: Unique name for the record list.
             column_names: List of column names for records in this list.
+            indexed_columns: Columns to back with a persistent ``[name, data.<column>]``
+                index for ``query_records`` filters.
+            column_types: Mapping of every column to ``"string"``, ``"int"``, ``"float"``,
+                ``"bool"`` or ``"json"`` (any value). None values are always allowed.
+            text_columns: Columns (``"string"`` or ``"json"``) indexed for ``record_text``
+                search in ``query_record_list``.
         """
         item_collection.create_record_list(
-            self.db, item_name, self.name, self.process.current_index, column_names
+            self.db,
+            item_name,
+            self.name,
+            self.process.current_index,
+            column_names,
+            indexed_columns,
+            column_types,
+            text_columns,
         )
 
     def append_record(self, item_name: str, record: Dict[str, Any], input_items: Optional[InputItems] = None, index: Optional[int] = None) -> None:
@@ -368,6 +572,151 @@ class Vault:
             input_items,
         )
 
+    def import_records(
+        self,
+        item_name: str,
+        source: str,
+        input_items: Optional[InputItems] = None,
+        format: Optional[str] = None,
+        chunk_size: int = 10000,
+        resume: bool = True,
+    ) -> int:
+        """
+        Bulk load records from a CSV, JSONL or Parquet file into a record list.
+
+        The file is streamed in chunks; each chunk is column-checked and written with one
+        bulk import per collection. The whole load is one operation. Progress is checkpointed
+        per chunk, so a failed or interrupted import keeps its written chunks and a later
+        call with the same ``source`` continues after them (run ``vault_cleanup`` first if
+        the previous process died mid-import).
+
+        Args:
+            item_name: Name of the record list to load into.
+            source: Path of the source file. Every row must have exactly the list's columns
+                (CSV values are loaded as strings, or parsed to the list's ``column_types``;
+                ``json`` columns are decoded from JSON text).
+            input_items: Mapping of dependency item key -> [start_position, end_position]
+                applied to every imported record.
+            format: ``"csv"``, ``"jsonl"`` or ``"parquet"``; inferred from the extension if None.
+                Parquet requires pyarrow.
+            chunk_size: Number of rows read and written per chunk.
+            resume: Continue a previous partial import of the same ``source``.
+
+        Returns:
+            Number of rows imported by this call.
+        """
+        self._ensure_item_exists(item_name, operation="import_records")
+        return bulk_import.import_records(
+            self.db,
+            item_name,
+            source,
+            self.name,
+            self.process.current_index,
+            input_items,
+            format,
+            chunk_size,
+            resume,
+        )
+
+    def import_documents(
+        self,
+        item_name: str,
+        source: str,
+        text_column: str = "text",
+        input_items: Optional[InputItems] = None,
+        format: Optional[str] = None,
+        chunk_size: int = 10000,
+        resume: bool = True,
+    ) -> int:
+        """
+        Bulk load documents from one column of a CSV, JSONL or Parquet file.
+
+        Loading, checkpointing and resuming work as in ``import_records``.
+
+        Args:
+            item_name: Name of the document list to load into.
+            source: Path of the source file.
+            text_column: Column holding the document text.
+            input_items: Mapping of dependency item key -> [start_position, end_position]
+                applied to every imported document.
+            format: ``"csv"``, ``"jsonl"`` or ``"parquet"``; inferred from the extension if None.
+            chunk_size: Number of rows read and written per chunk.
+            resume: Continue a previous partial import of the same ``source``.
+
+        Returns:
+            Number of documents imported by this call.
+        """
+        self._ensure_item_exists(item_name, operation="import_documents")
+        return bulk_import.import_documents(
+            self.db,
+            item_name,
+            source,
+            self.name,
+            self.process.current_index,
+            text_column,
+            input_items,
+            format,
+            chunk_size,
+            resume,
+        )
+
+    def reserve_items(
+        self, item_name: str, n_items: int, length: Optional[int] = None
+    ) -> item_collection.Reservation:
+        """
+        Reserve a block of the next indices and positions of a list for one writer.
+
+        Only the reservation takes the list lock, briefly; ``append_reserved`` then writes
+        into the block without it, so many writers (threads, processes or machines) can fill
+        their own blocks of one list at the same time. A block that is never filled leaves a
+        gap of missing indices.
+
+        Args:
+            item_name: Name of a file, document, embedding or record list.
+            n_items: Number of indices to reserve.
+            length: Total length of the block. Required for document lists (the summed text
+                length of the documents); other lists have length 1 per item.
+
+        Returns:
+            Reservation with the reserved ``index``/``n_items`` and
+            ``start_position``/``length``, and the next free slot ``next_index``/``next_position``.
+        """
+        self._ensure_item_exists(item_name, operation="reserve_items")
+        return item_collection.reserve_items(self.db, item_name, n_items, length)
+
+    def append_reserved(
+        self,
+        reservation: item_collection.Reservation,
+        values: List[Any],
+        input_items: Optional[Union[InputItems, List[Optional[InputItems]]]] = None,
+    ) -> int:
+        """
+        Write items into the next free slots of a reservation, without taking the list lock.
+
+        A reservation should be filled by one writer; it may be filled over several calls.
+
+        Args:
+            reservation: Result of ``reserve_items``.
+            values: File locations, document texts, embeddings or records, matching the
+                list type.
+            input_items: Mapping of dependency item key -> [start_position, end_position]
+                for all values, or one (optional) mapping per value.
+
+        Returns:
+            Index of the first written item.
+
+        Raises:
+            ValidationError: The values do not fit in the rest of the reservation.
+        """
+        return item_collection.append_reserved(
+            self.db,
+            reservation,
+            values,
+            self.name,
+            self.process.current_index,
+            input_items,
+        )
+
     def create_description(
         self, item_name: str, description: str, embedding: List[float], description_name: str = "BASE"
     ) -> None:
@@ -395,8 +744,21 @@ class Vault:
         Identify safe checkpoint in code where stop and pause requests can be executed.
 
         Using this avoids stopping during undesirable conditions (e.g. while still waiting for outgoing API calls).
+        With a background interrupt watcher (the default) this is a local check, cheap enough for
+        tight loops; requests take effect within ``interrupt_poll_interval`` seconds.
         """
-        process_collection.process_checkpoint(self.db, self.name)
+        if self._interrupt_watcher is not None:
+            self._interrupt_watcher.checkpoint()
+        else:
+            process_collection.process_checkpoint(
+                self.db, self.name, self._quiesce_writes
+            )
+
+    def _quiesce_writes(self) -> None:
+        # let queued cell records finish so no list lock is held while suspended
+        flush = getattr(self.process, "flush", None)
+        if flush is not None:
+            flush()
 
     def pause_execution(self, process_name: str) -> None:
         """
@@ -431,6 +793,157 @@ class Vault:
         """
         process_collection.process_resume_request(self.db, process_name, self.name)
 
+    def memoize(
+        self,
+        fn: Callable[..., Any],
+        inputs: Optional[InputItems] = None,
+        outputs: Optional[List[str]] = None,
+        args: Tuple[Any, ...] = (),
+        kwargs: Optional[Dict[str, Any]] = None,
+    ) -> Any:
+        """
+        Call ``fn(*args, **kwargs)`` unless the same code already ran on the same inputs.
+
+        A call is identified by the source of ``fn`` (not of the functions it calls), the
+        arguments, and the revisions of the items overlapping each ``inputs`` range, so
+        rewritten input items also miss. On a hit the recorded return value is returned
+        without calling ``fn``. The items ``fn`` appended to ``outputs`` are recorded too; a
+        hit whose outputs were since deleted or truncated is recomputed. Memoize per chunk of
+        input to reprocess only new or changed ranges. Arguments are keyed by value; arrays and
+        pandas objects by a hash of their contents.
+
+        Example:
+            >>> while (lease := vault.lease_work("embed_chunks")) is not None:
+            ...     vault.memoize(embed_range, inputs=lease.input_items,
+            ...                   outputs=["chunk_embeddings"],
+            ...                   args=(lease.start_index, lease.end_index))
+            ...     lease.complete()
+
+        Args:
+            fn: Function to call. Its return value must be JSON-serializable.
+            inputs: Mapping of input item list -> [start_position, end_position] read by ``fn``.
+            outputs: Item lists ``fn`` appends to. Other writers should not append to them
+                during the call, as appended ranges are recorded from the list sizes.
+            args: Positional arguments for ``fn``; part of the memo key.
+            kwargs: Keyword arguments for ``fn``; part of the memo key.
+
+        Returns:
+            The return value of ``fn``, computed now or recorded by an earlier call.
+        """
+        return memo.memoize(
+            self.db,
+            fn,
+            inputs,
+            outputs,
+            args,
+            kwargs or {},
+            self.name,
+            self.process.current_index,
+        )
+
+    def _worker_id(self) -> str:
+        return getattr(self, "worker_id", None) or worker.default_worker_id()
+
+    def create_work_queue(
+        self, queue_name: str, source_list: str, chunk_size: int = 100
+    ) -> None:
+        """
+        Create a work queue that hands out index ranges of an item list to workers.
+
+        Args:
+            queue_name: Unique name of the queue.
+            source_list: Item list to process. Items appended to it later are queued too.
+            chunk_size: Number of items per leased range.
+
+        Raises:
+            DuplicateItemError: A queue with this name already exists.
+        """
+        self._ensure_item_exists(source_list, operation="create_work_queue")
+        work_queue.create_work_queue(
+            self.db,
+            queue_name,
+            source_list,
+            self.name,
+            self.process.current_index,
+            chunk_size,
+        )
+
+    def lease_work(
+        self, queue_name: str, lease_seconds: float = 600
+    ) -> Optional[work_queue.WorkLease]:
+        """
+        Lease the next range of a work queue.
+
+        Expired leases, and leases held by processes on this host that have died, are
+        reassigned before new ranges are handed out.
+
+        Args:
+            queue_name: Name of the work queue.
+            lease_seconds: Seconds until the lease expires and may be reassigned; extend it
+                with ``lease.renew()``.
+
+        Returns:
+            A ``WorkLease`` with ``start_index``, ``end_index``, ``items`` (one
+            ``[index, start_position, end_position]`` per source item), ``input_items`` and
+            ``item_inputs(index)`` for lineage, and ``complete()``/``release()``/``renew()``;
+            None when every range is leased or done.
+        """
+        return work_queue.lease_work(
+            self.db,
+            queue_name,
+            self._worker_id(),
+            self.name,
+            self.process.current_index,
+            lease_seconds,
+        )
+
+    def iter_work(
+        self, queue_name: str, lease_seconds: float = 600
+    ) -> Iterator[work_queue.WorkLease]:
+        """
+        Lease and yield ranges of a work queue until none are left.
+
+        Each lease is completed when the loop body finishes and released (for immediate
+        reassignment) if the body raises.
+
+        Example:
+            >>> for lease in vault.iter_work("embed_chunks"):
+            ...     for index, _, _ in lease.items:
+            ...         text = vault.query_item_content("chunks", index=index)
+            ...         vault.append_embedding("chunk_embeddings", model(text),
+            ...             input_items=lease.item_inputs(index), index=index)
+
+        Args:
+            queue_name: Name of the work queue.
+            lease_seconds: Seconds until each lease expires.
+
+        Yields:
+            ``WorkLease`` objects (see ``lease_work``).
+        """
+        while True:
+            lease = self.lease_work(queue_name, lease_seconds)
+            if lease is None:
+                return
+            try:
+                yield lease
+            except BaseException:
+                lease.release()
+                raise
+            lease.complete()
+
+    def work_queue_status(self, queue_name: str) -> Dict[str, Any]:
+        """
+        Summarize the progress of a work queue.
+
+        Args:
+            queue_name: Name of the work queue.
+
+        Returns:
+            Dict with ``source``, ``n_items`` (current size of the source list), lease counts
+            ``done``, ``leased`` and ``expired``, ``done_items`` and ``unleased_items``.
+        """
+        return work_queue.work_queue_status(self.db, queue_name)
+
     def has_vector_index(self, ndim: int) -> bool:
         """
         Check if a vector index exists for embeddings of a given dimension.
@@ -448,6 +961,35 @@ class Vault:
                 return True
         return False
 
+    def cache_embedding_list(self, item_name: str, max_bytes: Optional[int] = None) -> None:
+        """
+        Mirror an embedding list into the local in-process vector cache.
+
+        Cached lists are synced incrementally by timestamp and can be searched locally with
+        ``query_embedding_list(..., use_cache=True)``. Requires numpy.
+
+        Args:
+            item_name: Name of the embedding list to cache.
+            max_bytes: Memory bound for the whole cache; least recently used lists are evicted
+                once it is exceeded (default 1 GiB).
+        """
+        self._ensure_item_exists(item_name, operation="cache_embedding_list")
+        if self._vector_cache is None:
+            self._vector_cache = vector_cache.VectorCache(self.db)
+        if max_bytes is not None:
+            self._vector_cache.max_bytes = max_bytes
+        self._vector_cache.add(item_name)
+
+    def uncache_embedding_list(self, item_name: str) -> None:
+        """
+        Drop an embedding list from the local vector cache.
+
+        Args:
+            item_name: Name of the cached embedding list.
+        """
+        if self._vector_cache is not None:
+            self._vector_cache.remove(item_name)
+
     def query_process_list(
         self,
         code_text: Optional[str] = None,
@@ -455,6 +997,7 @@ class Vault:
         description_embedding: Optional[List[float]] = None,
         description_text: Optional[str] = None,
         filtered: Optional[List[str]] = None,
+        as_of: Optional[int] = None,
     ) -> List[Any]:
         """
         Query process items. Can optionally filter by descriptions and parent process.
@@ -465,6 +1008,8 @@ class Vault:
             description_embedding: Embedding vector for similarity search.
             description_text: Text to search in descriptions.
             filtered: List of process names to restrict search to.
+            as_of: Only read operations committed at or before this timestamp
+                (see ``get_current_timestamp``).
 
         Returns:
             List of 5-element lists, one per matching process run:
@@ -486,6 +1031,7 @@ class Vault:
             description_embedding=description_embedding,
             description_text=description_text,
             filtered=filtered or [],  # list of file.name strings
+            as_of=as_of,
         )
 
     def query_embedding_list(
@@ -496,6 +1042,9 @@ class Vault:
         code_text: Optional[str] = None,
         filtered: Optional[List[str]] = None,
         use_approx: bool = False,
+        use_cache: bool = False,
+        rescore_k: int = 300,
+        as_of: Optional[int] = None,
     ) -> List[Any]:
         """
         Query embedding items. Can optionally filter by descriptions and parent process.
@@ -507,6 +1056,12 @@ class Vault:
             code_text: Text to search in process code.
             filtered: List of embedding names to restrict search to.
             use_approx: Use approximate (faster) similarity search.
+            use_cache: Answer from the local vector cache when every name in ``filtered`` is
+                cached and no description/code filters are given; otherwise query the server.
+            rescore_k: Number of quantized candidates per storage mode rescored at full
+                precision for ``int8``/``binary`` lists.
+            as_of: Only read operations committed at or before this timestamp
+                (see ``get_current_timestamp``).
 
         Returns:
             List of 5-element lists, one per matching embedding entry:
@@ -521,6 +1076,20 @@ class Vault:
               ``code_text`` filter, each as ``[process_name, process_index]``;
               empty list when no code-text filter was applied.
         """
+        if (
+            use_cache
+            and as_of is None
+            and self._vector_cache is not None
+            and embedding is not None
+            and filtered
+            and description_embedding is None
+            and not description_text
+            and not code_text
+            and all(name in self._vector_cache for name in filtered)
+        ):
+            return self._vector_cache.query(
+                embedding, filtered=filtered, use_approx=use_approx
+            )
         return query_collection_simple.query_embedding(
             self.db,
             embedding,
@@ -529,6 +1098,58 @@ class Vault:
             code_text,
             filtered=filtered or [],
             use_approx=use_approx,
+            rescore_k=rescore_k,
+            as_of=as_of,
+        )
+
+    def query_embedding_hybrid(
+        self,
+        embedding: List[float],
+        document_text: str,
+        filtered: Optional[List[str]] = None,
+        document_filtered: Optional[List[str]] = None,
+        link: str = "dependency",
+        fusion: str = "rrf",
+        k: int = 10,
+        use_approx: bool = False,
+        as_of: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Hybrid retrieval: fuse embedding similarity with BM25 over linked documents.
+
+        Vector hits and BM25 document hits are ranked separately and fused server-side in one
+        query. Document chunks map to embeddings either through ``dependency_edge`` (embeddings
+        whose input range overlaps the chunk) or through a shared index.
+
+        Args:
+            embedding: Query embedding vector.
+            document_text: Text to search in document content (BM25-ranked).
+            filtered: List of embedding names to restrict search to.
+            document_filtered: List of document names to restrict the text search to.
+            link: ``"dependency"`` (via ``dependency_edge``) or ``"index"`` (same index in the
+                ``filtered`` embedding lists).
+            fusion: ``"rrf"`` (reciprocal-rank fusion) or ``"weighted"`` (cosine score plus
+                max-normalized BM25 score).
+            k: Number of fused results to return.
+            use_approx: Use approximate (faster) similarity search for the vector side.
+            as_of: Only read operations committed at or before this timestamp
+                (see ``get_current_timestamp``).
+
+        Returns:
+            List of 4-element lists sorted by fused score:
+            ``[name, index, start_position, score]``
+        """
+        return query_collection_simple.query_embedding_hybrid(
+            self.db,
+            embedding,
+            document_text,
+            filtered=filtered or [],
+            document_filtered=document_filtered or [],
+            link=link,
+            fusion=fusion,
+            k=k,
+            use_approx=use_approx,
+            as_of=as_of,
         )
 
     def query_record_list(
@@ -538,16 +1159,20 @@ class Vault:
         description_text: Optional[str] = None,
         code_text: Optional[str] = None,
         filtered: Optional[List[str]] = None,
+        as_of: Optional[int] = None,
     ) -> List[Any]:
         """
         Query record items. Can optionally filter by descriptions and parent process.
 
         Args:
-            record_text: Text to search in record data (optional).
+            record_text: Text to search in record data (optional). For typed record lists
+                only the ``text_columns`` are searchable.
             description_embedding: Embedding for description similarity.
             description_text: Text to search in descriptions.
             code_text: Text to search in process code.
             filtered: List of record names to restrict search to.
+            as_of: Only read operations committed at or before this timestamp
+                (see ``get_current_timestamp``).
 
         Returns:
             List of 5-element lists, one per matching record entry:
@@ -569,6 +1194,106 @@ class Vault:
             description_text,
             code_text,
             filtered=filtered or [],
+            as_of=as_of,
+        )
+
+    def query_records(
+        self,
+        item_name: str,
+        where: Optional[Any] = None,
+        columns: Optional[List[str]] = None,
+        start_position: Optional[int] = None,
+        end_position: Optional[int] = None,
+        limit: Optional[int] = None,
+        as_of: Optional[int] = None,
+    ) -> List[List[Any]]:
+        """
+        Filter and project the records of one record list on the server.
+
+        Args:
+            item_name: Name of the record list to query.
+            where: Predicate on record columns: a condition ``(column, operator, value)``
+                with operator ``==``, ``!=``, ``<``, ``<=``, ``>``, ``>=``, ``in``,
+                ``not in`` or ``like``; a list of predicates that must all hold; or
+                ``{"and": [...]}``, ``{"or": [...]}``, ``{"not": predicate}``.
+            columns: Columns to return (all if None).
+            start_position: Start of position range.
+            end_position: End of position range.
+            limit: Maximum number of records to return.
+            as_of: Only read operations committed at or before this timestamp
+                (see ``get_current_timestamp``).
+
+        Returns:
+            List of ``[index, start_position, data]`` sorted by ``start_position``, where
+            ``data`` holds the selected columns.
+        """
+        self._ensure_item_exists(item_name, operation="query_records")
+        item_type = query_item_simple.query_item_type(self.db, item_name)
+        if item_type != "record_list":
+            raise ValidationError(
+                f"query_records needs a record list; '{item_name}' is a '{item_type}'.",
+                operation="query_records",
+                collection=item_type,
+                key=item_name,
+            )
+        return query_record_data.query_records(
+            self.db,
+            item_name,
+            where,
+            columns,
+            start_position,
+            end_position,
+            limit,
+            as_of,
+        )
+
+    def aggregate_records(
+        self,
+        item_name: str,
+        group_by: Optional[List[str]] = None,
+        metrics: Optional[Dict[str, Any]] = None,
+        where: Optional[Any] = None,
+        start_position: Optional[int] = None,
+        end_position: Optional[int] = None,
+        as_of: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Compute grouped statistics over a record list on the server.
+
+        Args:
+            item_name: Name of the record list to aggregate.
+            group_by: Columns to group by (one result row overall if empty).
+            metrics: Mapping of output name -> ``"count"`` or ``(function, column)`` with
+                function ``count``, ``count_distinct``, ``sum``, ``avg``, ``min``, ``max``,
+                ``stddev`` or ``variance``. Defaults to ``{"count": "count"}``.
+            where: Record predicate, as in ``query_records``.
+            start_position: Start of position range.
+            end_position: End of position range.
+            as_of: Only read operations committed at or before this timestamp
+                (see ``get_current_timestamp``).
+
+        Returns:
+            One dict per group with the ``group_by`` columns and the metric values, sorted by
+            the group values.
+        """
+        self._ensure_item_exists(item_name, operation="aggregate_records")
+        item_type = query_item_simple.query_item_type(self.db, item_name)
+        if item_type != "record_list":
+            raise ValidationError(
+                f"aggregate_records needs a record list; '{item_name}' is a '{item_type}'.",
+                operation="aggregate_records",
+                collection=item_type,
+                key=item_name,
+            )
+        return query_record_data.aggregate_records(
+            self.db,
+            item_name,
+            group_by,
+            metrics,
+            where,
+            start_position,
+            end_position,
+            as_of,
         )
 
     def query_document_list(
@@ -578,6 +1303,7 @@ class Vault:
         description_text: Optional[str] = None,
         code_text: Optional[str] = None,
         filtered: Optional[List[str]] = None,
+        as_of: Optional[int] = None,
     ) -> List[Any]:
         """
         Query document items. Can optionally filter by descriptions and parent process.
@@ -588,6 +1314,8 @@ class Vault:
             description_text: Text to search in descriptions.
             code_text: Text to search in process code.
             filtered: List of document names to restrict search to.
+            as_of: Only read operations committed at or before this timestamp
+                (see ``get_current_timestamp``).
 
         Returns:
             List of 5-element lists, one per matching document chunk:
@@ -609,6 +1337,7 @@ class Vault:
             description_text=description_text,
             code_text=code_text,
             filtered=filtered or [],
+            as_of=as_of,
         )
 
     def query_file_list(
@@ -617,6 +1346,7 @@ class Vault:
         description_text: Optional[str] = None,
         code_text: Optional[str] = None,
         filtered: Optional[List[str]] = None,
+        as_of: Optional[int] = None,
     ) -> List[Any]:
         """
         Query file items. Can optionally filter by descriptions and parent process.
@@ -626,6 +1356,8 @@ class Vault:
             description_text: Text to search in descriptions.
             code_text: Text to search in process code.
             filtered: List of file names to restrict search to.
+            as_of: Only read operations committed at or before this timestamp
+                (see ``get_current_timestamp``).
 
         Returns:
             List of 5-element lists, one per matching file entry:
@@ -646,9 +1378,18 @@ class Vault:
             description_text,
             code_text,
             filtered=filtered or [],
+            as_of=as_of,
         )
 
-    def query_item_content(self, item_name: str, index: Optional[int] = None, start_position: Optional[int] = None, end_position: Optional[int] = None) -> Any:
+    def query_item_content(
+        self,
+        item_name: str,
+        index: Optional[int] = None,
+        start_position: Optional[int] = None,
+        end_position: Optional[int] = None,
+        as_array: bool = False,
+        as_of: Optional[int] = None,
+    ) -> Any:
         """
         Query the content of an item list by index chunk or position range.
 
@@ -657,6 +1398,11 @@ class Vault:
             index: Specific index chunk to retrieve.
             start_position: Start of position range (if index not specified).
             end_position: End of position range (if index not specified).
+            as_array: Embedding lists only. Return a contiguous float32 NumPy array
+                (``(n, n_dim)`` for a range, ``(n_dim,)`` for an index) filled batch by batch
+                from the server cursor. Requires numpy.
+            as_of: Only read operations committed at or before this timestamp
+                (see ``get_current_timestamp``). An index written later returns ``None``.
 
         Returns:
             When ``index`` is given, a single item whose type depends on the list type:
@@ -673,12 +1419,142 @@ class Vault:
             ``start_position``.
         """
         self._ensure_item_exists(item_name, operation="query_item_content")
+        if as_array and index is not None:
+            if self.query_item_type(item_name) != "embedding_list":
+                raise ValidationError(
+                    f"as_array is only supported for embedding lists; '{item_name}' is not one.",
+                    operation="query_item_content",
+                    collection="embedding_list",
+                    key=item_name,
+                )
+            np = import_optional("numpy", "vector")
+            return np.asarray(
+                query_item_simple.query_item_index(self.db, item_name, index, as_of),
+                dtype=np.float32,
+            )
+        if as_array:
+            return query_item_simple.query_embedding_array(
+                self.db, item_name, start_position, end_position, as_of=as_of
+            )
         if index is not None:
             return query_item_simple.query_item_index(
-            self.db, item_name, index
+            self.db, item_name, index, as_of
         )
         return query_item_simple.query_item(
-            self.db, item_name, start_position, end_position
+            self.db, item_name, start_position, end_position, as_of
+        )
+
+    def stream_item_content(
+        self,
+        item_name: str,
+        start_position: Optional[int] = None,
+        end_position: Optional[int] = None,
+        batch_size: int = 10000,
+        as_array: bool = False,
+        as_of: Optional[int] = None,
+    ) -> Iterator[Any]:
+        """
+        Stream the content of an item list in batches from a server-side cursor.
+
+        Args:
+            item_name: Name of the item list to query.
+            start_position: Start of position range.
+            end_position: End of position range.
+            batch_size: Number of entries fetched per batch.
+            as_array: Embedding lists only. Yield each batch as a float32 NumPy array of
+                shape ``(batch, n_dim)``. Requires numpy.
+            as_of: Only read operations committed at or before this timestamp
+                (see ``get_current_timestamp``).
+
+        Returns:
+            Iterator over batches, sorted by ``start_position``. Each batch is a ``List`` of
+            the per-type items described in ``query_item_content`` (or an array if
+            ``as_array``).
+        """
+        self._ensure_item_exists(item_name, operation="stream_item_content")
+        return query_item_simple.stream_item(
+            self.db,
+            item_name,
+            start_position,
+            end_position,
+            batch_size,
+            as_array,
+            as_of=as_of,
+        )
+
+    def to_arrow(
+        self,
+        item_name: str,
+        start_position: Optional[int] = None,
+        end_position: Optional[int] = None,
+        batch_size: int = 10000,
+        as_of: Optional[int] = None,
+    ) -> Any:
+        """
+        Read a record, embedding, document or file list into a typed Arrow table.
+
+        Rows are streamed from a server-side cursor and converted to Arrow one batch at a
+        time. Requires pyarrow.
+
+        Args:
+            item_name: Name of the item list to read.
+            start_position: Start of position range.
+            end_position: End of position range.
+            batch_size: Number of entries fetched per batch.
+            as_of: Only read operations committed at or before this timestamp
+                (see ``get_current_timestamp``).
+
+        Returns:
+            ``pyarrow.Table`` with ``index``, ``start_position`` and ``end_position`` columns,
+            followed by one column per record column, a fixed-size float32 list
+            ``embedding`` column, or a string ``value`` column. Record columns use the
+            list's declared ``column_types`` (``json`` as JSON text); for untyped lists
+            they are inferred from every value in the exported range.
+        """
+        self._ensure_item_exists(item_name, operation="to_arrow")
+        return columnar_export.to_arrow(
+            self.db, item_name, start_position, end_position, batch_size, as_of
+        )
+
+    def export_list(
+        self,
+        item_name: str,
+        path: str,
+        format: str = "parquet",
+        start_position: Optional[int] = None,
+        end_position: Optional[int] = None,
+        batch_size: int = 10000,
+        as_of: Optional[int] = None,
+    ) -> int:
+        """
+        Write a record, embedding, document or file list to a Parquet or Arrow IPC file.
+
+        Batches are streamed from a server-side cursor straight to the writer, so memory use
+        is bounded by ``batch_size``. Columns are the same as ``to_arrow``. Requires pyarrow.
+
+        Args:
+            item_name: Name of the item list to export.
+            path: Output file path.
+            format: ``"parquet"`` or ``"arrow"`` (Arrow IPC file).
+            start_position: Start of position range.
+            end_position: End of position range.
+            batch_size: Number of entries fetched and written per batch.
+            as_of: Only read operations committed at or before this timestamp
+                (see ``get_current_timestamp``).
+
+        Returns:
+            Number of rows written.
+        """
+        self._ensure_item_exists(item_name, operation="export_list")
+        return columnar_export.export_list(
+            self.db,
+            item_name,
+            path,
+            format,
+            start_position,
+            end_position,
+            batch_size,
+            as_of,
         )
 
     def query_item_names(self, item_type: str) -> List[str]:
@@ -727,11 +1603,13 @@ class Vault:
 
             - **embedding_list**: ``n_dim`` (int) — dimensionality of stored embeddings.
             - **record_list**: ``column_names`` (List[str]) — ordered column names.
+              ``indexed_columns`` (List[str]), and for typed lists ``column_types``
+              (Dict[str, str]) and ``text_columns`` (List[str]).
         """
         self._ensure_item_exists(item_name, operation="query_item_list")
         return query_item_simple.query_item_list(self.db, item_name)
 
-    def query_item_parent(self, item_name: str, start_position: Optional[int] = None, end_position: Optional[int] = None) -> List[Any]:
+    def query_item_parent(self, item_name: str, start_position: Optional[int] = None, end_position: Optional[int] = None, as_of: Optional[int] = None) -> List[Any]:
         """
         Query input dependencies of an item list. Allows optional position filtering.
 
@@ -739,6 +1617,8 @@ class Vault:
             item_name: Name of the item list.
             start_position: Filter by start position.
             end_position: Filter by end position.
+            as_of: Only read operations committed at or before this timestamp
+                (see ``get_current_timestamp``).
 
         Returns:
             List of 6-element lists, one per dependency edge in the filtered range:
@@ -754,10 +1634,10 @@ class Vault:
         """
         self._ensure_item_exists(item_name, operation="query_item_parent")
         return query_item_simple.query_item_input(
-            self.db, item_name, start_position, end_position
+            self.db, item_name, start_position, end_position, as_of=as_of
         )
 
-    def query_item_child(self, item_name: str, start_position: Optional[int] = None, end_position: Optional[int] = None) -> List[Any]:
+    def query_item_child(self, item_name: str, start_position: Optional[int] = None, end_position: Optional[int] = None, as_of: Optional[int] = None) -> List[Any]:
         """
         Query items that depend on an item list. Allows optional position filtering.
 
@@ -765,6 +1645,8 @@ class Vault:
             item_name: Name of the item list.
             start_position: Filter by start position.
             end_position: Filter by end position.
+            as_of: Only read operations committed at or before this timestamp
+                (see ``get_current_timestamp``).
 
         Returns:
             List of 6-element lists, one per outgoing dependency edge in the filtered range:
@@ -780,7 +1662,186 @@ class Vault:
         """
         self._ensure_item_exists(item_name, operation="query_item_child")
         return query_item_simple.query_item_output(
-            self.db, item_name, start_position, end_position
+            self.db, item_name, start_position, end_position, as_of=as_of
+        )
+
+    def query_item_ancestors(
+        self,
+        item_name: str,
+        depth: int = 10,
+        start_position: Optional[int] = None,
+        end_position: Optional[int] = None,
+        collections: Optional[List[str]] = None,
+        batch_size: int = 1000,
+        as_of: Optional[int] = None,
+    ) -> Iterator[List[Any]]:
+        """
+        Walk input dependencies transitively, breadth first, one server-side query per hop.
+
+        Each hop keeps only entries whose positions overlap the range that reached them,
+        starting from ``[start_position, end_position)``. Every entry is expanded once and
+        every dependency edge reported once, at the first hop that reaches it. Rows of each
+        hop are streamed from the server.
+
+        Args:
+            item_name: Name of the item list.
+            depth: Maximum number of dependency hops.
+            start_position: Start of the position range on ``item_name``.
+            end_position: End of the position range on ``item_name``.
+            collections: Only return dependencies in these collections
+                (e.g. ``["file_list"]``); traversal still passes through others.
+            batch_size: Number of rows fetched per round trip.
+            as_of: Only read operations committed at or before this timestamp
+                (see ``get_current_timestamp``).
+
+        Returns:
+            Iterator of 8-element lists, one per dependency edge reached:
+            ``[hop, item_name, item_start, item_end, dep_collection, dep_name, dep_start, dep_end]``
+
+            - ``hop`` (int): Fewest dependency hops from ``item_name`` that reach this edge
+              (1 = direct input).
+            - ``item_name`` (str): List holding the entry that has this dependency.
+            - ``item_start`` (int): Start position of that entry.
+            - ``item_end`` (int): End position of that entry.
+            - ``dep_collection`` (str): Collection type of the input dependency.
+            - ``dep_name`` (str): Name of the input dependency item list.
+            - ``dep_start`` (int): Start position within the dependency list.
+            - ``dep_end`` (int): End position within the dependency list.
+        """
+        self._ensure_item_exists(item_name, operation="query_item_ancestors")
+        return query_item_simple.query_item_ancestors(
+            self.db,
+            item_name,
+            depth,
+            start_position,
+            end_position,
+            collections,
+            batch_size,
+            as_of=as_of,
+        )
+
+    def query_item_descendants(
+        self,
+        item_name: str,
+        depth: int = 10,
+        start_position: Optional[int] = None,
+        end_position: Optional[int] = None,
+        collections: Optional[List[str]] = None,
+        batch_size: int = 1000,
+        as_of: Optional[int] = None,
+    ) -> Iterator[List[Any]]:
+        """
+        Walk dependent items transitively, breadth first, one server-side query per hop.
+
+        Each hop keeps only entries whose dependency ranges overlap the range that reached
+        them, starting from ``[start_position, end_position)``. Every entry is expanded once
+        and every dependency edge reported once, at the first hop that reaches it. Rows of
+        each hop are streamed from the server.
+
+        Args:
+            item_name: Name of the item list.
+            depth: Maximum number of dependency hops.
+            start_position: Start of the position range on ``item_name``.
+            end_position: End of the position range on ``item_name``.
+            collections: Only return dependents in these collections
+                (e.g. ``["embedding_list"]``); traversal still passes through others.
+            batch_size: Number of rows fetched per round trip.
+            as_of: Only read operations committed at or before this timestamp
+                (see ``get_current_timestamp``).
+
+        Returns:
+            Iterator of 8-element lists, one per dependent entry reached:
+            ``[hop, item_name, dep_start, dep_end, child_collection, child_name, child_start, child_end]``
+
+            - ``hop`` (int): Fewest dependency hops from ``item_name`` that reach this edge
+              (1 = direct child).
+            - ``item_name`` (str): List the dependency edge starts from.
+            - ``dep_start`` (int): Start position of the dependency edge on that list.
+            - ``dep_end`` (int): End position of the dependency edge on that list.
+            - ``child_collection`` (str): Collection type of the dependent item list.
+            - ``child_name`` (str): Name of the dependent item list.
+            - ``child_start`` (int): Start position of the dependent entry.
+            - ``child_end`` (int): End position of the dependent entry.
+        """
+        self._ensure_item_exists(item_name, operation="query_item_descendants")
+        return query_item_simple.query_item_descendants(
+            self.db,
+            item_name,
+            depth,
+            start_position,
+            end_position,
+            collections,
+            batch_size,
+            as_of=as_of,
+        )
+
+    def query_item_upstream(
+        self,
+        item_name: str,
+        start_position: Optional[int] = None,
+        end_position: Optional[int] = None,
+        collections: Optional[List[str]] = None,
+        as_of: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Look up every transitive input of a position range from the materialized lineage index.
+
+        The index is maintained when items are appended with ``input_items``, so this is an
+        indexed read rather than a graph walk.
+
+        Args:
+            item_name: Name of the item list.
+            start_position: Start of the position range on ``item_name``.
+            end_position: End of the position range on ``item_name``.
+            collections: Only return ancestors in these collections (e.g. ``["file_list"]``).
+            as_of: Only read operations committed at or before this timestamp
+                (see ``get_current_timestamp``).
+
+        Returns:
+            List of 4-element lists, one per ancestor list:
+            ``[ancestor_collection, ancestor_name, intervals, depth]``
+
+            - ``ancestor_collection`` (str): Collection type of the ancestor list.
+            - ``ancestor_name`` (str): Name of the ancestor list.
+            - ``intervals`` (List[[int, int]]): Merged ``[start, end]`` ranges on the ancestor.
+            - ``depth`` (int): Fewest dependency hops to reach the ancestor.
+        """
+        self._ensure_item_exists(item_name, operation="query_item_upstream")
+        return lineage_closure.query_upstream(
+            self.db, item_name, start_position, end_position, collections, as_of=as_of
+        )
+
+    def query_item_downstream(
+        self,
+        item_name: str,
+        start_position: Optional[int] = None,
+        end_position: Optional[int] = None,
+        collections: Optional[List[str]] = None,
+        as_of: Optional[int] = None,
+    ) -> List[Any]:
+        """
+        Look up every transitive dependent of a position range from the materialized lineage index.
+
+        Args:
+            item_name: Name of the item list.
+            start_position: Start of the position range on ``item_name``.
+            end_position: End of the position range on ``item_name``.
+            collections: Only return dependents in these collections (e.g. ``["embedding_list"]``).
+            as_of: Only read operations committed at or before this timestamp
+                (see ``get_current_timestamp``).
+
+        Returns:
+            List of 4-element lists, one per dependent list:
+            ``[collection, name, intervals, depth]``
+
+            - ``collection`` (str): Collection type of the dependent list.
+            - ``name`` (str): Name of the dependent list.
+            - ``intervals`` (List[[int, int]]): Merged ``[start, end]`` ranges on the dependent.
+            - ``depth`` (int): Fewest dependency hops to reach the dependent.
+        """
+        self._ensure_item_exists(item_name, operation="query_item_downstream")
+        return lineage_closure.query_downstream(
+            self.db, item_name, start_position, end_position, collections, as_of=as_of
         )
 
     def query_item_description(self, item_name: str) -> List[str]:
@@ -829,11 +1890,13 @@ class Vault:
 
         Returns:
             List of dicts, one per process that wrote entries in the filtered range:
-            ``{"process_id": str, "index": int}``
+            ``{"process_id": str, "index": int, "worker_ids": List[str]}``
 
             - ``process_id`` (str): ArangoDB document ID of the process
               (e.g. ``"process_list/my_process"``).
             - ``index`` (int): Run index at which the entries were written.
+            - ``worker_ids`` (List[str]): Workers (see ``worker_spec``) that wrote the
+              entries; empty when they were written by the process itself.
         """
         self._ensure_item_exists(item_name, operation="query_item_process")
         return query_item_simple.query_item_process(
@@ -907,3 +1970,123 @@ class Vault:
         """
         self._ensure_process_exists(process_name, operation="query_process_item")
         return query_item_simple.query_process_item(self.db, process_name)
+
+    def process_profile(
+        self,
+        process_name: str,
+        sort_by: str = "wall_time",
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank the recorded steps (notebook cells or script runs) of a process by resource use.
+
+        Args:
+            process_name: Name of the process list.
+            sort_by: Telemetry field to rank by, highest first. One of ``wall_time``,
+                ``cpu_time``, ``max_rss``, ``read_bytes``, ``write_bytes``, ``vault_calls``,
+                ``vault_call_time``.
+            limit: Maximum number of steps to return.
+
+        Returns:
+            List of dicts, one per completed step with telemetry:
+
+            - ``index``, ``status``, ``error``, ``start_position``, ``end_position``: The step.
+            - ``wall_time`` (float): Elapsed seconds.
+            - ``cpu_user``, ``cpu_system``, ``cpu_time`` (float): CPU seconds of the Python
+              process during the step.
+            - ``rss`` (int): Resident memory at the end of the step, in bytes.
+            - ``max_rss`` (int): Peak resident memory of the Python process during the
+              step, in bytes (sampled outside Linux, so short spikes may be missed).
+            - ``read_bytes``, ``write_bytes``, ``read_count``, ``write_count`` (int): I/O
+              during the step; absent on platforms without I/O counters.
+            - ``vault_calls`` (int), ``vault_call_time`` (float): Vault methods called during
+              the step and the seconds spent in them.
+        """
+        self._ensure_process_exists(process_name, operation="process_profile")
+        return query_item_simple.query_process_profile(
+            self.db, process_name, sort_by=sort_by, limit=limit
+        )
+
+    def worker_spec(self) -> Dict[str, Any]:
+        """
+        Describe this process so that workers can write on its behalf.
+
+        The spec is a plain, picklable dict: pass it to threads or ``multiprocessing`` workers
+        and open a ``VaultWorker`` from it there. Worker writes are attributed to this process
+        at its current step (the running cell or script).
+
+        Returns:
+            Dict with the connection settings, ``process_name`` and ``process_index``.
+        """
+        return {
+            **self._connection,
+            "process_name": self.name,
+            "process_index": self.process.current_index,
+            "user_id": self.user_id,
+        }
+
+
+@worker.attributed_methods
+class VaultWorker(Vault):
+    """
+    Vault handle for a worker thread or process, bound to a parent process.
+
+    Unlike ``Vault`` this is not a singleton and does not record code: any number of workers
+    can be open at once, each with its own database connection, and their writes are recorded
+    under the parent process step and this worker's id (see ``query_item_process``).
+
+    Example:
+        >>> spec = vault.worker_spec()
+        >>> def embed(chunk):
+        ...     w = VaultWorker(spec)
+        ...     w.append_embeddings("embeddings", model(chunk))
+        >>> with multiprocessing.Pool() as pool:
+        ...     pool.map(embed, chunks)
+    """
+
+    def __new__(cls, *args: Any, **kwargs: Any) -> "VaultWorker":
+        return object.__new__(cls)
+
+    def __init__(
+        self,
+        spec: Dict[str, Any],
+        worker_id: Optional[str] = None,
+        interrupt_poll_interval: float = 0.5,
+    ) -> None:
+        """
+        Open a worker handle.
+
+        Args:
+            spec: Result of ``Vault.worker_spec()`` in the parent process.
+            worker_id: Identifier recorded with this worker's writes. Defaults to
+                ``"<pid>.<thread id>"``.
+            interrupt_poll_interval: Seconds between polls while the parent is paused.
+        """
+        self.name: str = spec["process_name"]
+        self.user_id: str = spec["user_id"]
+        self.worker_id: str = worker_id or worker.default_worker_id()
+        self.is_experiment = False
+        self._initialized = True
+        self._connection = {k: spec[k] for k in worker.CONNECTION_KEYS if k in spec}
+        self.db: StandardDatabase = worker.connect(spec)
+        self._vector_cache = None
+        self.process = worker.WorkerProcess(spec["process_index"])
+        self._interrupt_watcher = None
+        self._interrupt_poll_interval = interrupt_poll_interval
+
+    def checkpoint_execution(self) -> None:
+        """
+        Honour stop and pause requests on the parent process.
+
+        A pause blocks this worker until the parent is resumed; a stop terminates the worker.
+        """
+        worker.worker_checkpoint(self.db, self.name, self._interrupt_poll_interval)
+
+    def worker_spec(self) -> Dict[str, Any]:
+        """Spec of the parent process; workers opened from it are siblings of this one."""
+        return {
+            **self._connection,
+            "process_name": self.name,
+            "process_index": self.process.current_index,
+            "user_id": self.user_id,
+        }
@@ -0,0 +1,12 @@
+import importlib
+from typing import Any
+
+
+def import_optional(module: str, extra: str) -> Any:
+    """Import an optional dependency, pointing at the matching extra when missing."""
+    try:
+        return importlib.import_module(module)
+    except ImportError as exc:
+        raise ImportError(
+            f"This feature requires '{module}'. Install it with `pip install tablevault[{extra}]`."
+        ) from exc
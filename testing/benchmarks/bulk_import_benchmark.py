@@ -0,0 +1,46 @@
+# Rows/s for import_records versus per-row append_record.
+# Requires a running ArangoDB (see testing/docker/docker-compose.yml).
+
+import csv
+import os
+import tempfile
+import time
+
+from tablevault import Vault
+
+N_ROWS = 200000
+N_APPEND = 2000
+COLUMNS = ["id", "source", "status", "score"]
+
+
+def write_csv(path):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(COLUMNS)
+        for i in range(N_ROWS):
+            writer.writerow([i, f"src_{i % 17}", "ok" if i % 5 else "failed", i / N_ROWS])
+
+
+def main():
+    vault = Vault("bench", "bulk_import_benchmark")
+    path = os.path.join(tempfile.mkdtemp(), "records.csv")
+    write_csv(path)
+
+    vault.create_record_list("bench_append", COLUMNS)
+    t = time.perf_counter()
+    for i in range(N_APPEND):
+        vault.append_record(
+            "bench_append", {"id": i, "source": "s", "status": "ok", "score": 0.5}
+        )
+    elapsed = time.perf_counter() - t
+    print(f"append_record : {N_APPEND / elapsed:10.0f} rows/s")
+
+    vault.create_record_list("bench_import", COLUMNS)
+    t = time.perf_counter()
+    n_rows = vault.import_records("bench_import", path)
+    elapsed = time.perf_counter() - t
+    print(f"import_records: {n_rows / elapsed:10.0f} rows/s ({n_rows} rows)")
+
+
+if __name__ == "__main__":
+    main()
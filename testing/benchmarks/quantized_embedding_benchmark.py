@@ -0,0 +1,77 @@
+# Compares float / int8 / binary embedding storage: recall@k against exact
+# COSINE_SIMILARITY, query latency, and stored size per list, each relative to the
+# indexed float list.
+# Requires a running ArangoDB (see testing/docker/docker-compose.yml) and numpy.
+
+import time
+
+import numpy as np
+
+from tablevault import Vault
+
+N_ITEMS = 20000
+N_DIM = 256
+N_QUERIES = 50
+K = 10
+RESCORE_K = 300
+
+LAYOUTS = {
+    "bench_float": ("float", True),
+    "bench_int8": ("int8", True),
+    "bench_int8_only": ("int8", False),
+    "bench_binary": ("binary", True),
+}
+
+
+def recall_at_k(expected, actual):
+    exp = {r[1] for r in expected}
+    act = {r[1] for r in actual}
+    return len(exp & act) / max(len(exp), 1)
+
+
+def stored_bytes(vault, name):
+    # JSON size of the list's documents; RocksDB compresses on disk, so this is an
+    # upper bound that tracks the relative difference between layouts.
+    aql = "RETURN SUM(FOR e IN embedding FILTER e.name == @name RETURN LENGTH(TO_STRING(e)))"
+    return next(vault.db.aql.execute(aql, bind_vars={"name": name}))
+
+
+def main():
+    vault = Vault("bench", "quantized_embedding_benchmark")
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal((N_ITEMS, N_DIM)).astype(np.float32)
+    for name, (storage, keep_full_precision) in LAYOUTS.items():
+        vault.create_embedding_list(
+            name, N_DIM, storage=storage, keep_full_precision=keep_full_precision
+        )
+        # float and int8 lists build their vector indexes as they grow
+        vault.append_embeddings(name, data)
+
+    queries = rng.standard_normal((N_QUERIES, N_DIM)).astype(np.float32)
+    baseline = None
+    for name in LAYOUTS:
+        timings = []
+        recalls = []
+        for q in queries:
+            exact = vault.query_embedding_list(q.tolist(), filtered=["bench_float"])[:K]
+            t = time.perf_counter()
+            result = vault.query_embedding_list(
+                q.tolist(), filtered=[name], rescore_k=RESCORE_K
+            )[:K]
+            timings.append(time.perf_counter() - t)
+            recalls.append(recall_at_k(exact, result))
+        size = stored_bytes(vault, name)
+        latency = float(np.median(timings))
+        if baseline is None:
+            baseline = (latency, size)  # bench_float
+        print(
+            f"{name:>16}: median {1000 * latency:8.3f} ms ({latency / baseline[0]:5.2f}x), "
+            f"recall@{K} {np.mean(recalls):.3f}, "
+            f"{size / 2**20:8.1f} MiB ({size / baseline[1]:5.2f}x)"
+        )
+    stats = vault.db.collection("embedding").statistics()
+    print(f"embedding collection on disk: {stats.get('documents_size', 0) / 2**20:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+# Rows/s into one shared record list: locked appends versus reserved blocks, by writer count.
+# Requires a running ArangoDB (see testing/docker/docker-compose.yml).
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tablevault import Vault
+
+WRITER_COUNTS = [1, 8, 32]
+BATCHES = 20  # per writer
+BATCH_SIZE = 50
+COLUMNS = ["writer", "i"]
+
+
+def locked(vault, name, writer):
+    for b in range(BATCHES):
+        for i in range(BATCH_SIZE):
+            vault.append_record(name, {"writer": writer, "i": b * BATCH_SIZE + i})
+
+
+def reserved(vault, name, writer):
+    for b in range(BATCHES):
+        res = vault.reserve_items(name, BATCH_SIZE)
+        vault.append_reserved(
+            res, [{"writer": writer, "i": b * BATCH_SIZE + i} for i in range(BATCH_SIZE)]
+        )
+
+
+def run(vault, mode, fn, n_writers):
+    name = f"bench_{mode}_{n_writers}"
+    vault.create_record_list(name, COLUMNS)
+    with ThreadPoolExecutor(max_workers=n_writers) as pool:
+        t = time.perf_counter()
+        list(pool.map(lambda w: fn(vault, name, w), range(n_writers)))
+        elapsed = time.perf_counter() - t
+    n_rows = n_writers * BATCHES * BATCH_SIZE
+    print(f"{mode:8s} {n_writers:3d} writers: {n_rows / elapsed:10.0f} rows/s")
+
+
+def main():
+    vault = Vault("bench", "reserved_append_benchmark", pool_size=max(WRITER_COUNTS))
+    for n_writers in WRITER_COUNTS:
+        run(vault, "locked", locked, n_writers)
+        run(vault, "reserved", reserved, n_writers)
+
+
+if __name__ == "__main__":
+    main()
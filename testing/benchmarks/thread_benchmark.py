@@ -0,0 +1,51 @@
+# Appends/s and queries/s from one shared Vault at 1, 8 and 32 threads.
+# Requires a running ArangoDB (see testing/docker/docker-compose.yml).
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from tablevault import Vault
+
+THREAD_COUNTS = [1, 8, 32]
+N_APPENDS = 50  # per thread
+N_QUERIES = 200  # per thread
+
+
+def run(vault, n_threads):
+    names = [f"bench_t{n_threads}_{i}" for i in range(n_threads)]
+    for name in names:
+        vault.create_document_list(name)
+
+    def append(name):
+        for i in range(N_APPENDS):
+            vault.append_document(name, f"chunk {i} of {name}")
+
+    def query(name):
+        for i in range(N_QUERIES):
+            vault.query_item_content(name, index=i % N_APPENDS)
+
+    with ThreadPoolExecutor(max_workers=n_threads) as pool:
+        t = time.perf_counter()
+        list(pool.map(append, names))
+        append_elapsed = time.perf_counter() - t
+
+        t = time.perf_counter()
+        list(pool.map(query, names))
+        query_elapsed = time.perf_counter() - t
+
+    n_appends = n_threads * N_APPENDS
+    n_queries = n_threads * N_QUERIES
+    print(
+        f"{n_threads:3d} threads: {n_appends / append_elapsed:8.0f} appends/s  "
+        f"{n_queries / query_elapsed:8.0f} queries/s"
+    )
+
+
+def main():
+    vault = Vault("bench", "thread_benchmark", pool_size=max(THREAD_COUNTS))
+    for n_threads in THREAD_COUNTS:
+        run(vault, n_threads)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+# Compares the local vector cache against server-side COSINE_SIMILARITY.
+# Requires a running ArangoDB (see testing/docker/docker-compose.yml) and numpy.
+
+import time
+
+import numpy as np
+
+from tablevault import Vault
+
+N_ITEMS = 20000
+N_DIM = 256
+N_QUERIES = 50
+K = 10
+
+
+def recall_at_k(expected, actual):
+    exp = {(r[0], r[1]) for r in expected}
+    act = {(r[0], r[1]) for r in actual}
+    return len(exp & act) / max(len(exp), 1)
+
+
+def main():
+    vault = Vault("bench", "vector_cache_benchmark")
+    vault.create_embedding_list("bench_embeddings", N_DIM)
+    rng = np.random.default_rng(0)
+    data = rng.standard_normal((N_ITEMS, N_DIM)).astype(np.float32)
+    for row in data:
+        vault.append_embedding("bench_embeddings", row.tolist(), build_idx=False)
+
+    start = time.perf_counter()
+    vault.cache_embedding_list("bench_embeddings")
+    print(f"initial sync: {time.perf_counter() - start:.2f}s")
+
+    queries = rng.standard_normal((N_QUERIES, N_DIM)).astype(np.float32)
+    timings = {"server": [], "cache_exact": [], "cache_ivf": []}
+    recalls = {"cache_exact": [], "cache_ivf": []}
+    for q in queries:
+        t = time.perf_counter()
+        server = vault.query_embedding_list(q.tolist(), filtered=["bench_embeddings"])[:K]
+        timings["server"].append(time.perf_counter() - t)
+        for label, approx in (("cache_exact", False), ("cache_ivf", True)):
+            t = time.perf_counter()
+            local = vault.query_embedding_list(
+                q.tolist(), filtered=["bench_embeddings"], use_approx=approx, use_cache=True
+            )[:K]
+            timings[label].append(time.perf_counter() - t)
+            recalls[label].append(recall_at_k(server, local))
+
+    for label, values in timings.items():
+        print(f"{label:>12}: median {1000 * np.median(values):.3f} ms")
+    for label, values in recalls.items():
+        print(f"{label:>12}: recall@{K} vs COSINE_SIMILARITY {np.mean(values):.3f}")
+
+
+if __name__ == "__main__":
+    main()
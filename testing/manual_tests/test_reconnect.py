@@ -0,0 +1,66 @@
+# Reopening an existing vault (new_arango_db=False) must upgrade it in place.
+# Requires a running ArangoDB (see testing/docker/docker-compose.yml); skipped otherwise.
+
+import pytest
+from arango.exceptions import ArangoError
+
+from tablevault.database import create_database
+
+DB_NAME = "tablevault_reconnect_test"
+CONNECTION = {
+    "arango_url": "http://localhost:8529",
+    "arango_username": "tablevault_user",
+    "arango_password": "tablevault_password",
+    "arango_root_username": "root",
+    "arango_root_password": "passwd",
+}
+
+
+def _connect(new_arango_db):
+    return create_database.get_arango_db(
+        DB_NAME,
+        CONNECTION["arango_url"],
+        CONNECTION["arango_username"],
+        CONNECTION["arango_password"],
+        CONNECTION["arango_root_username"],
+        CONNECTION["arango_root_password"],
+        new_arango_db=new_arango_db,
+        retry_attempts=0,
+        request_timeout=5,
+    )
+
+
+@pytest.fixture
+def fresh_db():
+    try:
+        db = _connect(True)
+    except (ArangoError, OSError) as e:
+        pytest.skip(f"ArangoDB not reachable: {e}")
+    create_database.create_tablevault_db(db, "reconnect_test.log", 16)
+    return db
+
+
+def test_reconnect_upgrades_existing_vault(fresh_db):
+    # simulate a vault created before code_blob and lineage_closure existed
+    fresh_db.delete_collection("code_blob")
+    fresh_db.delete_collection("lineage_closure")
+    fresh_db.collection("process").configure(
+        schema={
+            "rule": {"properties": {"text": {"type": "string"}}, "required": ["text"]},
+            "level": "strict",
+        }
+    )
+    new_timestamp = fresh_db.collection("metadata").get("global")["new_timestamp"]
+
+    db = _connect(False)
+    create_database.ensure_tablevault_db(db)
+    create_database.ensure_tablevault_db(db)  # a second reconnect is a no-op
+
+    assert db.has_collection("code_blob")
+    assert db.has_collection("lineage_closure")
+    index_names = {i["name"] for i in db.collection("lineage_closure").indexes()}
+    assert {"lineage_closure_name_idx", "lineage_closure_ancestor_idx"} <= index_names
+    schema = db.collection("process").properties()["schema"]
+    assert "code_hash" in schema["rule"]["properties"]
+    assert "code_blob" in db.view("process_view")["links"]
+    assert db.collection("metadata").get("global")["new_timestamp"] == new_timestamp